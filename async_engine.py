@@ -0,0 +1,232 @@
+# async_engine.py
+
+import asyncio
+
+from binance import AsyncClient
+from binance.client import Client
+
+from config import (
+    API_KEY, API_SECRET, UPDATE_INTERVAL, MAX_CONCURRENT_SYMBOLS,
+    SEQUENCE_LENGTH
+)
+from instrumentation import instrument_client, span
+from metrics import order_fills
+from strategy import buy_signal, sell_signal
+
+
+class SymbolState:
+    """Sembol bazında pozisyon durumu"""
+
+    def __init__(self, symbol, quote_balance):
+        self.symbol = symbol
+        self.quote_balance = quote_balance  # Bu sembole ayrılan USDT
+        self.quantity = 0.                  # Elde tutulan net coin miktarı
+        self.last_error = None
+
+    @property
+    def in_position(self):
+        return self.quantity > 0
+
+
+class AsyncTradingEngine:
+    """Strateji kuralını birden fazla sembol için eşzamanlı işleten motor
+
+    Tüm REST çağrıları tek bir AsyncClient (tek aiohttp oturumu) üzerinden
+    yapılır; istemci botun RestGateway'ine sarılır, böylece ağırlık
+    bütçesi, 429 duraklaması ve 418 banı senkron istemciyle ortaktır.
+    Aynı anda en fazla max_concurrency sembol değerlendirilir.
+    Her turda tüm sembollerin LSTM tahmini tek bir predict_batch çağrısıyla
+    thread havuzunda yapılır.
+    """
+
+    def __init__(self, bot, symbols, interval='1h',
+                 max_concurrency=MAX_CONCURRENT_SYMBOLS):
+        self.bot = bot
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self.is_running = False
+        self.client = None
+
+        # Bakiyeyi semboller arasında eşit paylaştır
+        allocation = bot.current_balance / len(symbols) if symbols else 0
+        self.states = {
+            symbol: SymbolState(symbol, allocation) for symbol in symbols
+        }
+
+    async def run(self):
+        """Motoru çalıştır (stop çağrılana kadar)"""
+        self.is_running = True
+        self.client = self.bot.client.wrap_async(instrument_client(
+            await AsyncClient.create(API_KEY, API_SECRET)
+        ))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            while self.is_running:
+                with span('round'):
+                    await self.run_round(semaphore)
+                await asyncio.sleep(UPDATE_INTERVAL)
+        finally:
+            await self.client.close_connection()
+            self.client = None
+
+    def stop(self):
+        """Motoru durdur"""
+        self.is_running = False
+
+    async def _bounded(self, semaphore, state, coro):
+        async with semaphore:
+            try:
+                result = await coro
+                state.last_error = None
+                return result
+            except Exception as e:
+                state.last_error = str(e)
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None, self.bot.handle_error,
+                    f"Error evaluating {state.symbol}: {str(e)}"
+                )
+                return None
+
+    async def run_round(self, semaphore):
+        """Tüm semboller için veri çek, toplu tahmin yap ve karar ver"""
+        states = list(self.states.values())
+        snapshots = await asyncio.gather(*[
+            self._bounded(semaphore, state, self.fetch_snapshot(state.symbol))
+            for state in states
+        ])
+
+        ready = {
+            state.symbol: snapshot
+            for state, snapshot in zip(states, snapshots)
+            if snapshot is not None and len(snapshot[0]) >= SEQUENCE_LENGTH
+        }
+        if not ready:
+            return
+
+        loop = asyncio.get_running_loop()
+        with span('predict'):
+            predictions = await loop.run_in_executor(
+                None, self.bot.predict_prices,
+                {symbol: df for symbol, (df, _) in ready.items()},
+                self.interval
+            )
+
+        await asyncio.gather(*[
+            self._bounded(
+                semaphore, self.states[symbol],
+                self.evaluate_symbol(self.states[symbol], *ready[symbol],
+                                     predicted)
+            )
+            for symbol, predicted in predictions.items()
+        ])
+
+    async def fetch_dataframe(self, symbol):
+        """Eksik mumları çekip indikatörlü DataFrame döndür"""
+        store = self.bot.kline_store
+        if not self.bot.market_data.is_streaming(symbol, self.interval):
+            params = store.request_params(symbol, self.interval)
+            klines = await self.client.get_klines(**params)
+            store.merge(symbol, self.interval, klines,
+                        reset='startTime' not in params)
+        return store.get_dataframe(symbol, self.interval, refresh=False)
+
+    async def fetch_price(self, symbol):
+        """Anlık fiyat (önce bellekteki akış, yoksa REST)"""
+        price = self.bot.market_data.get_price(symbol)
+        if price is None:
+            ticker = await self.client.get_symbol_ticker(symbol=symbol)
+            price = float(ticker['price'])
+        return price
+
+    async def fetch_snapshot(self, symbol):
+        """Sembolün mumlarını ve anlık fiyatını eşzamanlı getir"""
+        return await asyncio.gather(
+            self.fetch_dataframe(symbol), self.fetch_price(symbol)
+        )
+
+    async def evaluate_symbol(self, state, df, current_price,
+                              predicted_price):
+        """Tek bir sembol için trading kuralını uygula"""
+        symbol = state.symbol
+        self.bot.performance.mark(symbol, current_price)
+
+        last_row = df.iloc[-1]
+        rsi = last_row['RSI']
+        macd = last_row['MACD']
+        signal = last_row['Signal']
+
+        if not state.in_position and state.quote_balance > 0:
+            if buy_signal(rsi, macd, signal, predicted_price, current_price):
+                filters = await self.get_filters(symbol)
+                try:
+                    quantity = filters.order_quantity(state.quote_balance,
+                                                      current_price)
+                except ValueError:
+                    # Ayrılan bakiye minQty/MIN_NOTIONAL'a yetmiyor; sinyal
+                    # sürdükçe her turda hata bildirmek yerine emri atla
+                    return None
+                return await self.execute_trade(state, 'BUY', quantity)
+        elif state.in_position:
+            if sell_signal(rsi, macd, signal, predicted_price, current_price):
+                # Net miktar LOT_SIZE adımına aşağı yuvarlanır, artık kalan
+                # küsurat satılamaz
+                filters = await self.get_filters(symbol)
+                if filters.round_quantity(state.quantity) > 0:
+                    return await self.execute_trade(
+                        state, 'SELL', filters.format_quantity(state.quantity)
+                    )
+        return None
+
+    async def get_filters(self, symbol):
+        """Sembol kuralları (gerekirse exchangeInfo'yu yenileyerek)"""
+        exchange_info = self.bot.exchange_info
+        if exchange_info.needs_refresh():
+            exchange_info.update(await self.client.get_exchange_info())
+        return exchange_info.get(symbol, refresh=False)
+
+    @staticmethod
+    def net_quantity(symbol, side, order, quantity):
+        """Emirde gerçekleşen miktar (alımda coin cinsinden komisyon düşülür)"""
+        executed = float(order.get('executedQty', quantity))
+        if side == 'BUY':
+            base_asset = symbol[:-len('USDT')]
+            executed -= sum(commission for _, _, commission, asset
+                            in order_fills(order) if asset == base_asset)
+        return executed
+
+    async def execute_trade(self, state, side, quantity):
+        """Market emri gönder ve sembol durumunu güncelle"""
+        with span('order', side=side):
+            order = await self.client.create_order(
+                symbol=state.symbol,
+                side=side,
+                type=Client.ORDER_TYPE_MARKET,
+                quantity=quantity
+            )
+
+        executed = float(order.get('executedQty', quantity))
+        cost = float(order.get('cummulativeQuoteQty', 0)) or (
+            executed * float(order['fills'][0]['price'])
+        )
+        if side == 'BUY':
+            state.quantity += self.net_quantity(state.symbol, side, order,
+                                                quantity)
+            state.quote_balance -= cost
+        else:
+            state.quantity = max(state.quantity - executed, 0.)
+            # Adımdan küçük artık pozisyon sayılmaz, tekrar alıma izin ver
+            filters = self.bot.exchange_info.get(state.symbol, refresh=False)
+            if not filters.round_quantity(state.quantity):
+                state.quantity = 0.
+            state.quote_balance += cost
+        self.bot.current_balance = sum(
+            s.quote_balance for s in self.states.values()
+        )
+
+        # Kayıt, durum dosyası ve bildirimler bloklayıcı, thread'de çalıştır
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, self.bot.record_trade, state.symbol, side, quantity, order
+        )
+        return order
@@ -0,0 +1,337 @@
+# backtest.py
+
+import argparse
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import (
+    INITIAL_BALANCE, RSI_OVERSOLD, RSI_OVERBOUGHT, FEATURES,
+    BACKTEST_FEE_RATE, BACKTEST_SLIPPAGE
+)
+from history_store import HistoryStore
+from metrics import PerformanceTracker
+from model_registry import ModelRegistry
+from numpy_model import NumpyPricePredictor
+from strategy import buy_signal, sell_signal
+from trade_ledger import TradeLedger
+from utils import calculate_technical_indicators
+
+
+def model_predictions(model, df, chunk_size=8192):
+    """Her mum için, o muma kadarki pencereden yapılan tahmini hesapla
+
+    predicted[i], canlı döngüde i. mum kapandığında elde edilecek tahmindir;
+    ilk sequence_length - 1 mum için NaN döner. NumpyPricePredictor (veya
+    aynı forward/scaler arayüzüne sahip bir model) beklenir.
+    """
+    scaled = df[FEATURES].values * model.scaler_scale + model.scaler_min
+    windows = sliding_window_view(scaled, model.sequence_length, axis=0)
+    windows = windows.transpose(0, 2, 1)  # (N-SEQ+1, SEQ, 5), kopyasız
+
+    predicted = np.full(len(df), np.nan)
+    offset = model.sequence_length - 1
+    for start in range(0, len(windows), chunk_size):
+        batch = windows[start:start + chunk_size]
+        valid = ~np.isnan(batch).any(axis=(1, 2))
+        if valid.any():
+            raw = model.forward(batch[valid])[:, 0]
+            out = np.full(len(batch), np.nan)
+            out[valid] = (raw - model.scaler_min[0]) / model.scaler_scale[0]
+            predicted[offset + start:offset + start + len(batch)] = out
+    return predicted
+
+
+def position_changes(buy, sell):
+    """Alım/satım sinyallerinden pozisyona giriş ve çıkış mumlarını bul
+
+    Canlı döngüdeki gibi pozisyon yokken sadece alım, pozisyondayken
+    sadece satım sinyali dikkate alınır. Son sinyal ileri taşınarak her
+    mumdaki durum döngüsüz hesaplanır. Tüm alımların gerçekleştiği
+    varsayılır; gerçekleşmeyen alımdan sonrası için çağıran, diziyi o
+    mumdan sonrasıyla yeniden çağırır.
+    """
+    events = np.where(buy, 1, np.where(sell, -1, 0))
+
+    # Her mum için kendisine kadarki son sıfır olmayan olayın indeksi
+    index = np.zeros(len(events), dtype=np.int64)
+    last_event = np.flatnonzero(events)
+    index[last_event] = last_event
+    np.maximum.accumulate(index, out=index)
+    state = events[index]
+
+    in_position = state == 1
+    previous = np.concatenate(([False], in_position[:-1]))
+    entries = np.flatnonzero(in_position & ~previous)
+    exits = np.flatnonzero(~in_position & previous)
+    return entries, exits
+
+
+class Backtester:
+    """Strateji kuralını kayıtlı mumlar üzerinde vektörel olarak çalıştırır
+
+    İndikatörler canlı depodaki ile aynı tanımla hesaplanır,
+    kararlar strategy.py'deki aynı fonksiyonlarla tüm mumlar için tek
+    seferde hesaplanır. Sadece gerçekleşen işlemler sırayla işlenir:
+    emir i. mumun kapanışında, kayma (slippage) eklenmiş fiyattan
+    gerçekleşir, ücret USDT olarak düşülür, miktar lot kurallarına göre
+    yuvarlanır. Sonuç botun işlem kayıtları (TradeLedger) ve metrikleri
+    (PerformanceTracker) ile aynı formattadır.
+    """
+
+    def __init__(self, df, symbol, predicted=None, filters=None,
+                 fee_rate=BACKTEST_FEE_RATE, slippage=BACKTEST_SLIPPAGE,
+                 initial_balance=INITIAL_BALANCE):
+        self.symbol = symbol
+        self.filters = filters  # exchange_info.SymbolFilters (None: yuvarlama yok)
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.initial_balance = initial_balance
+
+        self.timestamps = df.index.values.astype('datetime64[ms]')
+        self.close = df['close'].values.astype(float)
+
+        # Tek sembolün uzun geçmişinde pandas'ın rolling/ewm (C) yolu,
+        # zaman adımı döngüsü olan calculate_indicator_matrix'ten hızlı
+        indicators = calculate_technical_indicators(
+            pd.DataFrame({'close': self.close})
+        )
+        self.rsi = indicators['RSI'].values
+        self.macd = indicators['MACD'].values
+        self.signal = indicators['Signal'].values
+
+        # Tahmin yoksa LSTM koşulu devre dışı (sadece RSI/MACD kuralı)
+        self.predicted = (None if predicted is None
+                          else np.asarray(predicted, dtype=float))
+
+    def signals(self, oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT):
+        """Tüm mumlar için alım/satım sinyal dizileri"""
+        predicted = self.predicted
+        with np.errstate(invalid='ignore'):
+            buy = buy_signal(
+                self.rsi, self.macd, self.signal,
+                np.inf if predicted is None else predicted, self.close,
+                oversold
+            )
+            sell = sell_signal(
+                self.rsi, self.macd, self.signal,
+                -np.inf if predicted is None else predicted, self.close,
+                overbought
+            )
+        return buy, sell
+
+    def _quantity(self, side, amount, price, held):
+        """Lot kurallarına uygun emir miktarı (gerçekleşemezse 0)"""
+        if side == 'BUY':
+            if self.filters is None:
+                return amount / price
+            try:
+                return float(self.filters.order_quantity(amount, price))
+            except ValueError:
+                return 0.  # MIN_NOTIONAL altı
+        if self.filters is None:
+            return held
+        return float(self.filters.round_quantity(held))
+
+    def _events(self, buy, sell, start):
+        """start mumundan itibaren (pozisyonsuz başlayarak) sıralı olaylar"""
+        entries, exits = position_changes(buy[start:], sell[start:])
+        return sorted(
+            [(i + start, 'BUY') for i in entries]
+            + [(i + start, 'SELL') for i in exits]
+        )
+
+    def _next_entry(self, buy_rows, after, amount):
+        """after'dan sonra alım emrinin gerçekleşebildiği ilk alım sinyali"""
+        for i in buy_rows[np.searchsorted(buy_rows, after, side='right'):]:
+            price = self.close[i] * (1 + self.slippage)
+            if self._quantity('BUY', amount, price, 0.) > 0:
+                return i
+        return None
+
+    def run(self, oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT):
+        """Backtest'i çalıştır: {'trades', 'metrics', 'equity'} döndür"""
+        buy, sell = self.signals(oversold, overbought)
+        buy_rows = np.flatnonzero(buy)
+
+        tracker = PerformanceTracker(self.initial_balance)
+        trades = []
+        balance = self.initial_balance
+        held = 0.
+        cash = np.full(len(self.close), np.nan)
+        quantity = np.full(len(self.close), np.nan)
+        cash[0], quantity[0] = balance, 0.
+
+        events = self._events(buy, sell, 0)
+        position = 0
+        while position < len(events):
+            i, side = events[position]
+            position += 1
+            if (side == 'BUY') == (held > 0):
+                continue  # Satış lot kuralına takıldıysa pozisyon sürer
+            direction = 1 if side == 'BUY' else -1
+            price = self.close[i] * (1 + direction * self.slippage)
+            # Alımda ücret de bakiyeden karşılanacak şekilde tutarı ayarla
+            amount = balance / (1 + self.fee_rate)
+            size = self._quantity(side, amount, price, held)
+            if size <= 0 and side == 'BUY':
+                # Canlı bot pozisyona girmedi ve sonraki alım sinyalinde
+                # tekrar dener: gerçekleşebilen ilk alımdan olayları
+                # yeniden hesapla (bakiye pozisyonsuzken değişmez)
+                entry = self._next_entry(buy_rows, i, amount)
+                events = ([] if entry is None
+                          else self._events(buy, sell, entry))
+                position = 0
+                continue
+            if size <= 0:
+                continue
+
+            value = size * price
+            fee = value * self.fee_rate
+            if side == 'BUY':
+                balance -= value + fee
+                held += size
+            else:
+                balance += value - fee
+                held -= size
+
+            timestamp = self.timestamps[i].item()
+            trades.append({
+                'timestamp': timestamp,
+                'symbol': self.symbol,
+                'side': side,
+                'quantity': size,
+                'price': price
+            })
+            tracker.on_order(self.symbol, side, [(size, price, fee, 'USDT')])
+            cash[i], quantity[i] = balance, held
+
+        # Her mumdaki özsermaye: son işlemden kalan nakit + coin değeri
+        cash = pd.Series(cash).ffill().values
+        quantity = pd.Series(quantity).ffill().values
+        equity = cash + quantity * self.close
+        peak = np.maximum.accumulate(equity)
+        drawdown = peak - equity
+
+        if held:
+            tracker.mark(self.symbol, self.close[-1])
+        metrics = tracker.snapshot()
+        metrics.update({
+            'total_trades': len(trades),
+            'current_balance': balance,
+            'equity': equity[-1],
+            'drawdown': drawdown[-1],
+            'max_drawdown': drawdown.max(),
+            'max_drawdown_pct': (drawdown / peak).max() * 100,
+            'oversold': oversold,
+            'overbought': overbought
+        })
+        return {
+            'trades': TradeLedger.from_records(trades),
+            'metrics': metrics,
+            'equity': equity
+        }
+
+    def sweep(self, oversold_values, overbought_values, max_workers=None):
+        """RSI eşiklerinin tüm kombinasyonlarını süreç havuzunda dene
+
+        Metrikleri toplam kara göre azalan sırada döndürür.
+        """
+        grid = list(itertools.product(oversold_values, overbought_values))
+        # Mum verisi her sürece bir kez gönderilir, görevler sadece eşik taşır
+        with ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker, initargs=(self,)) as executor:
+            results = list(executor.map(_run_worker, grid,
+                                        chunksize=max(len(grid) // 64, 1)))
+        return sorted(results, key=lambda m: m['total_profit'], reverse=True)
+
+
+_worker_backtester = None
+
+
+def _init_worker(backtester):
+    global _worker_backtester
+    _worker_backtester = backtester
+
+
+def _run_worker(thresholds):
+    return _worker_backtester.run(*thresholds)['metrics']
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Strateji kuralını kayıtlı mumlar üzerinde test et'
+    )
+    parser.add_argument('csv', nargs='?',
+                        help='timestamp ve close sütunlu mum dosyası')
+    parser.add_argument('--symbol', default='BACKTEST')
+    parser.add_argument('--store', action='store_true',
+                        help='Mumları CSV yerine HistoryStore\'dan oku')
+    parser.add_argument('--interval', default='1h')
+    parser.add_argument('--start', default=None, help='YYYY-MM-DD')
+    parser.add_argument('--end', default=None, help='YYYY-MM-DD')
+    parser.add_argument('--oversold', type=float, nargs='+',
+                        default=[RSI_OVERSOLD])
+    parser.add_argument('--overbought', type=float, nargs='+',
+                        default=[RSI_OVERBOUGHT])
+    parser.add_argument('--model', default=None,
+                        help="LSTM kuralı için export_numpy .npz dosyası veya "
+                             "'registry' (ModelRegistry'deki son sürüm)")
+    parser.add_argument('--fee', type=float, default=BACKTEST_FEE_RATE)
+    parser.add_argument('--slippage', type=float, default=BACKTEST_SLIPPAGE)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.store:
+        df = HistoryStore().load_frame(args.symbol, args.interval,
+                                       args.start, args.end)
+    elif args.csv:
+        df = pd.read_csv(args.csv, index_col='timestamp', parse_dates=True)
+    else:
+        parser.error('csv or --store is required')
+
+    predicted = None
+    if args.model:
+        if args.model == 'registry':
+            model = ModelRegistry(backend='numpy').get(args.symbol,
+                                                       args.interval)
+            if model is None:
+                parser.error(f'no registered model for {args.symbol} '
+                             f'{args.interval}')
+        else:
+            model = NumpyPricePredictor.load(args.model)
+        if not set(FEATURES) <= set(df.columns):
+            df = calculate_technical_indicators(df)
+        predicted = model_predictions(model, df)
+
+    backtester = Backtester(df, args.symbol, predicted=predicted,
+                            fee_rate=args.fee, slippage=args.slippage)
+
+    start = datetime.now()
+    if len(args.oversold) == 1 and len(args.overbought) == 1:
+        results = [backtester.run(args.oversold[0],
+                                  args.overbought[0])['metrics']]
+    else:
+        results = backtester.sweep(args.oversold, args.overbought,
+                                   args.workers)
+
+    print(f"{'oversold':>8} {'overbought':>10} {'profit':>10} "
+          f"{'trades':>7} {'win %':>6} {'max dd %':>8}")
+    for m in results:
+        print(f"{m['oversold']:>8.1f} {m['overbought']:>10.1f} "
+              f"{m['total_profit']:>10.2f} {m['total_trades']:>7} "
+              f"{m['win_rate']:>6.1f} {m['max_drawdown_pct']:>8.2f}")
+    print(f"{len(df)} candles, {len(results)} runs in "
+          f"{(datetime.now() - start).total_seconds():.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# benchmarks/bench_backtest.py
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import Backtester
+from exchange_info import SymbolFilters
+
+LOT_FILTERS = [
+    {'filterType': 'LOT_SIZE', 'minQty': '1', 'maxQty': '90000000',
+     'stepSize': '1'},
+    {'filterType': 'NOTIONAL', 'minNotional': '5'},
+]
+
+
+def synthetic_candles(n=365 * 24 * 60, seed=0):
+    """Bir yıllık 1 dakikalık sentetik mum verisi"""
+    rng = np.random.default_rng(seed)
+    close = 0.5 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    index = pd.date_range('2023-01-01', periods=n, freq='min')
+    predicted = close * (1 + rng.normal(0, 0.001, n))
+    return pd.DataFrame({'close': close}, index=index), predicted
+
+
+def main():
+    df, predicted = synthetic_candles()
+    filters = SymbolFilters('BENCHUSDT', LOT_FILTERS)
+
+    start = time.perf_counter()
+    backtester = Backtester(df, 'BENCHUSDT', predicted=predicted,
+                            filters=filters)
+    prepared = time.perf_counter() - start
+
+    start = time.perf_counter()
+    metrics = backtester.run()['metrics']
+    single = time.perf_counter() - start
+    print(f"{len(df)} candles: indicators {prepared:.2f}s, "
+          f"run {single:.2f}s, {metrics['total_trades']} trades")
+
+    oversold = range(20, 45, 5)
+    overbought = range(55, 80, 5)
+    start = time.perf_counter()
+    results = backtester.sweep(oversold, overbought)
+    elapsed = time.perf_counter() - start
+    print(f"sweep: {len(results)} runs in {elapsed:.2f}s "
+          f"({os.cpu_count()} cores)")
+    best = results[0]
+    print(f"best: oversold={best['oversold']} overbought={best['overbought']} "
+          f"profit={best['total_profit']:.2f} trades={best['total_trades']}")
+
+
+if __name__ == '__main__':
+    main()
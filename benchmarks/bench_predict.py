@@ -0,0 +1,66 @@
+# benchmarks/bench_predict.py
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import SEQUENCE_LENGTH, FEATURES
+from models import PricePredictionModel
+from numpy_model import NumpyPricePredictor
+from utils import calculate_technical_indicators
+
+
+def synthetic_frame(n=500, seed=0):
+    """Rastgele yürüyüşle sentetik mum verisi üret"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    df = pd.DataFrame({
+        'close': close,
+        'volume': rng.uniform(1e3, 1e5, n)
+    })
+    return calculate_technical_indicators(df).dropna()
+
+
+def time_per_call(fn, repeat):
+    fn()  # Isınma (izleme/derleme maliyeti ölçüme girmesin)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(symbol_counts=(1, 10, 50, 200), repeat=5):
+    model = PricePredictionModel()
+    frames = [synthetic_frame(seed=i) for i in range(max(symbol_counts))]
+    model.scaler.fit(pd.concat(frames)[FEATURES].values)
+    
+    weights_path = os.path.join(os.path.dirname(__file__), 'bench_weights.npz')
+    model.export_numpy(weights_path)
+    numpy_model = NumpyPricePredictor.load(weights_path)
+    os.remove(weights_path)
+
+    def keras_predict(dfs):
+        # Eski yol: sembol başına ayrı Keras predict çağrısı
+        for df in dfs:
+            X = model.scaler.transform(df[FEATURES].values[-SEQUENCE_LENGTH:])
+            model.model.predict(X.reshape((1, SEQUENCE_LENGTH, 5)), verbose=0)
+
+    print(f"{'symbols':>8} {'keras/sym (ms)':>15} {'batch/sym (ms)':>15} "
+          f"{'numpy/sym (ms)':>15} {'speedup':>8}")
+    for count in symbol_counts:
+        dfs = frames[:count]
+        old = time_per_call(lambda: keras_predict(dfs), repeat) / count
+        new = time_per_call(lambda: model.predict_batch(dfs), repeat) / count
+        np_time = time_per_call(
+            lambda: numpy_model.predict_batch(dfs), repeat) / count
+        print(f"{count:>8} {old * 1e3:>15.3f} {new * 1e3:>15.3f} "
+              f"{np_time * 1e3:>15.3f} {old / new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/bench_state.py
+
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from state_manager import StateManager, TIME_FORMAT
+
+
+class FakeBot:
+    def __init__(self, history):
+        self.current_balance = 30.
+        self.current_coin = 'DOGEUSDT'
+        self.trading_history = history
+
+
+def synthetic_history(n):
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            'timestamp': start + timedelta(minutes=i),
+            'symbol': 'DOGEUSDT',
+            'side': 'BUY' if i % 2 == 0 else 'SELL',
+            'quantity': 100. + i,
+            'price': 0.1 + i * 1e-6
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_save(filename, bot):
+    # Eski yol: her kayıtta tüm geçmiş indent=4 ile yeniden yazılır
+    state = {
+        'current_balance': bot.current_balance,
+        'current_coin': bot.current_coin,
+        'trading_history': [
+            {
+                'timestamp': trade['timestamp'].strftime(TIME_FORMAT),
+                'symbol': trade['symbol'],
+                'side': trade['side'],
+                'quantity': trade['quantity'],
+                'price': trade['price']
+            }
+            for trade in bot.trading_history
+        ],
+        'last_update': datetime.now().strftime(TIME_FORMAT)
+    }
+    with open(filename, 'w') as f:
+        json.dump(state, f, indent=4)
+
+
+def legacy_load(filename):
+    with open(filename, 'r') as f:
+        state = json.load(f)
+    for trade in state['trading_history']:
+        trade['timestamp'] = datetime.strptime(trade['timestamp'], TIME_FORMAT)
+    return state
+
+
+def time_per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(history_sizes=(100, 1000, 10000, 50000), repeat=20):
+    print(f"{'history':>8} {'legacy save (ms)':>17} {'journal save (ms)':>18} "
+          f"{'legacy load (ms)':>17} {'journal load (ms)':>18}")
+    for size in history_sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bot = FakeBot(synthetic_history(size))
+            trade = synthetic_history(1)[0]
+
+            legacy_path = os.path.join(tmp, 'legacy.json')
+            old_save = time_per_call(lambda: legacy_save(legacy_path, bot),
+                                     repeat)
+            old_load = time_per_call(lambda: legacy_load(legacy_path), repeat)
+
+            # Snapshot bir kez alınır, sonrası sadece günlüğe ekleme
+            manager = StateManager(os.path.join(tmp, 'state.json'),
+                                   snapshot_interval=10 ** 9)
+            manager.checkpoint(bot)
+
+            def journal_save():
+                manager.append_trade(trade)
+                manager.save_state(bot)
+
+            new_save = time_per_call(journal_save, repeat)
+            manager.close()
+            new_load = time_per_call(
+                lambda: StateManager(os.path.join(tmp, 'state.json'))
+                .load_state(), repeat)
+
+            print(f"{size:>8} {old_save * 1e3:>17.3f} {new_save * 1e3:>18.3f} "
+                  f"{old_load * 1e3:>17.3f} {new_load * 1e3:>18.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,536 @@
+# benchmarks/suite.py
+"""Botun sıcak yolları için tekrarlanabilir benchmark paketi
+
+    python benchmarks/suite.py run                  # hızlı ölçek
+    python benchmarks/suite.py run --scale full -k state
+    python benchmarks/suite.py compare results/a.json results/b.json
+    python benchmarks/suite.py list
+
+Tüm veriler sabit tohumla sentetik üretilir. Sonuçlar commit, sürüm ve
+makine bilgisiyle birlikte JSON olarak benchmarks/results/ altına yazılır;
+compare iki çalıştırmanın medyan sürelerini karşılaştırır ve eşiği aşan
+yavaşlama varsa 1 ile çıkar.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import FEATURES, SEQUENCE_LENGTH
+from kline_store import KlineStore, KLINE_COLUMNS, parse_klines
+from metrics import PerformanceTracker
+from numpy_model import NumpyPricePredictor
+from simulated_exchange import SimulatedClient, synthetic_klines
+from state_manager import StateManager
+from strategy import buy_signal
+from trade_ledger import TradeLedger
+from utils import (
+    calculate_technical_indicators, calculate_profit, calculate_win_rate
+)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'results')
+
+SCALES = {
+    'quick': {'candles': (500, 10_000), 'trades': (10, 1_000),
+              'symbols': (1, 10)},
+    'full': {'candles': (500, 10_000, 100_000, 1_000_000),
+             'trades': (10, 1_000, 10_000, 100_000),
+             'symbols': (1, 10, 100, 1_000)},
+}
+
+# Ölçümlerin yazdığı durum dosyaları çıkışta silinir
+_scratch = tempfile.TemporaryDirectory(prefix='bot-bench-')
+
+CASES = []
+
+
+class Skip(Exception):
+    """Opsiyonel bağımlılığı olmayan ölçüm atlanır"""
+
+
+def case(name, size, limit=None):
+    """Ölçüm kaydı: setup(n) ölçülecek fonksiyonu döndürür
+
+    size 'candles', 'trades' veya 'symbols' ölçeğini seçer, limit o ölçümün
+    çıkılmayacak üst sınırıdır (bellek/süre nedeniyle).
+    """
+    def register(setup):
+        CASES.append((name, size, limit, setup))
+        return setup
+    return register
+
+
+# --- Sentetik veri ---
+
+def candle_frame(n, seed=0):
+    """n mumluk indikatörsüz DataFrame (timestamp indeksli)"""
+    rows = synthetic_klines('BENCHUSDT', '1m', 1_700_000_000_000 // 60_000
+                            * 60_000, n, seed=seed)
+    df = pd.DataFrame(rows[:, 1:], columns=KLINE_COLUMNS[1:])
+    df.index = pd.to_datetime(rows[:, 0].astype('int64'), unit='ms')
+    df.index.name = 'timestamp'
+    return df
+
+
+def raw_klines(n):
+    """get_klines cevabı formatında n mum"""
+    return SimulatedClient._format_klines(
+        synthetic_klines('BENCHUSDT', '1m', 1_700_000_000_000 // 60_000
+                         * 60_000, n)
+    )
+
+
+def trade_records(n, symbols=20, seed=0):
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    prices = 0.5 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return [
+        {
+            'timestamp': start + timedelta(minutes=i),
+            'symbol': f"C{(i // 2) % symbols}USDT",
+            'side': 'BUY' if i % 2 == 0 else 'SELL',
+            'quantity': 100.,
+            'price': float(prices[i])
+        }
+        for i in range(n)
+    ]
+
+
+def random_predictor(frame, seed=0):
+    """Eğitimli model gerektirmeyen, mimarisi aynı rastgele ağırlıklı model
+
+    Scaler frame'in min/max değerlerine göre kurulur (MinMaxScaler gibi).
+    """
+    rng = np.random.default_rng(seed)
+    values = frame[FEATURES].values
+    low, high = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+    scale = 1. / np.where(high > low, high - low, 1.)
+
+    def weight(*shape):
+        return rng.normal(0, 0.1, shape)
+
+    return NumpyPricePredictor({
+        'lstm1_kernel': weight(len(FEATURES), 200),
+        'lstm1_recurrent_kernel': weight(50, 200),
+        'lstm1_bias': weight(200),
+        'lstm2_kernel': weight(50, 200),
+        'lstm2_recurrent_kernel': weight(50, 200),
+        'lstm2_bias': weight(200),
+        'dense1_kernel': weight(50, 25),
+        'dense1_bias': weight(25),
+        'dense2_kernel': weight(25, 1),
+        'dense2_bias': weight(1),
+        'scaler_min': -low * scale,
+        'scaler_scale': scale,
+        'sequence_length': SEQUENCE_LENGTH
+    })
+
+
+class FakeBot:
+    """StateManager ve GUI'nin botta okuduğu alanlar"""
+
+    def __init__(self, trades):
+        self.current_balance = 30.
+        self.current_coin = 'BENCHUSDT'
+        self.trading_history = TradeLedger.from_records(trades)
+        self.performance = PerformanceTracker()
+        self.on_trade_callback = None
+        self.on_error_callback = None
+        self.is_running = False
+
+    def get_performance_metrics(self):
+        metrics = self.performance.snapshot()
+        metrics.update({'total_trades': len(self.trading_history),
+                        'current_balance': self.current_balance})
+        return metrics
+
+    def get_viable_coins(self):
+        return []
+
+
+# --- Ölçümler ---
+
+@case('indicators', 'candles')
+def bench_indicators(n):
+    df = candle_frame(n)
+    return lambda: calculate_technical_indicators(df)
+
+
+@case('klines_to_frame', 'candles', limit=100_000)
+def bench_klines_to_frame(n):
+    # get_historical_data'nın REST cevabını DataFrame'e çevirdiği yol
+    klines = raw_klines(n)
+
+    def run():
+        data = parse_klines(klines)
+        df = pd.DataFrame(data[:, 1:], columns=KLINE_COLUMNS[1:])
+        df.index = pd.to_datetime(data[:, 0].astype('int64'), unit='ms')
+        return df
+    return run
+
+
+@case('loop_tick', 'candles', limit=500)
+def bench_loop_tick(n):
+    # trading_loop'un bir turu: eksik mum, indikatörler, tahmin, sinyal
+    client = SimulatedClient.synthetic(['BENCHUSDT'], count=20_000)
+    store = KlineStore(client, capacity=n)
+    model = random_predictor(store.get_dataframe('BENCHUSDT', '1m'))
+
+    def run():
+        # Simülasyon saatine göre sadece eksik mum istenir (fetch_dataframe)
+        client.clock.advance(60_000)
+        params = store.request_params('BENCHUSDT', '1m',
+                                      client.clock.now_ms())
+        store.merge('BENCHUSDT', '1m', client.get_klines(**params),
+                    reset='startTime' not in params)
+        df = store.get_dataframe('BENCHUSDT', '1m', refresh=False)
+        predicted = model.predict(df)
+        price = float(client.get_symbol_ticker(symbol='BENCHUSDT')['price'])
+        last = df.iloc[-1]
+        return buy_signal(last['RSI'], last['MACD'], last['Signal'],
+                          predicted, price)
+    return run
+
+
+@case('prepare_data', 'candles')
+def bench_prepare_data(n):
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    try:
+        from models import PricePredictionModel
+        from sklearn.preprocessing import MinMaxScaler
+    except ImportError as e:
+        raise Skip(str(e))
+    # Keras ağı kurulmaz, prepare_data sadece scaler kullanır
+    model = PricePredictionModel.__new__(PricePredictionModel)
+    model.scaler = MinMaxScaler()
+    df = calculate_technical_indicators(candle_frame(n)).dropna()
+    return lambda: model.prepare_data(df)
+
+
+@case('predict_batch', 'symbols')
+def bench_predict(n):
+    # Aynı turda n sembolün tahmini tek çağrıda
+    frame = calculate_technical_indicators(candle_frame(500)).dropna()
+    model = random_predictor(frame)
+    frames = [frame] * n
+    return lambda: model.predict_batch(frames)
+
+
+@case('state_save', 'trades')
+def bench_state_save(n):
+    # record_trade'in yaptığı: işlemi ve durumu günlüğe ekle
+    directory = tempfile.mkdtemp(dir=_scratch.name)
+    bot = FakeBot(trade_records(n))
+    manager = StateManager(os.path.join(directory, 'state.json'),
+                           snapshot_interval=10 ** 9)
+    manager.checkpoint(bot)
+    trade = trade_records(1)[0]
+
+    def run():
+        manager.append_trade(trade)
+        manager.save_state(bot)
+    return run
+
+
+@case('state_checkpoint', 'trades')
+def bench_state_checkpoint(n):
+    directory = tempfile.mkdtemp(dir=_scratch.name)
+    bot = FakeBot(trade_records(n))
+    manager = StateManager(os.path.join(directory, 'state.json'))
+    return lambda: manager.checkpoint(bot)
+
+
+@case('state_load', 'trades')
+def bench_state_load(n):
+    directory = tempfile.mkdtemp(dir=_scratch.name)
+    path = os.path.join(directory, 'state.json')
+    bot = FakeBot(trade_records(n))
+    manager = StateManager(path)
+    manager.checkpoint(bot)
+    for trade in trade_records(100):
+        manager.append_trade(trade)
+    manager.close()
+    return lambda: StateManager(path).load_state()
+
+
+@case('calculate_profit', 'trades')
+def bench_calculate_profit(n):
+    trades = trade_records(n)
+    return lambda: (calculate_profit(trades), calculate_win_rate(trades))
+
+
+@case('performance_replay', 'trades')
+def bench_performance_replay(n):
+    # load_saved_state'te metriklerin geçmişten kurulması
+    ledger = TradeLedger.from_records(trade_records(n))
+
+    def run():
+        tracker = PerformanceTracker()
+        for symbol, side, quantity, price, fee in ledger.iterfills():
+            tracker.on_fill(symbol, side, quantity, price, fee)
+        return tracker.snapshot()
+    return run
+
+
+_app = None
+
+
+def _gui(trades):
+    """Offscreen Qt ile sahte botlu ana pencere"""
+    global _app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PyQt6.QtWidgets import QApplication, QMainWindow
+        from gui import TradingBotGUI
+        from data_worker import MarketDataWorker
+    except ImportError as e:
+        raise Skip(str(e))
+    _app = QApplication.instance() or QApplication([])
+
+    class BenchWindow(TradingBotGUI):
+        def __init__(self, bot):
+            QMainWindow.__init__(self)
+            self.bot = bot
+            self.worker = MarketDataWorker(bot)  # Başlatılmaz, ağ yok
+            self.init_ui()
+
+    window = BenchWindow(FakeBot(trades))
+    window.show()
+    _app.processEvents()
+    return window
+
+
+@case('update_chart', 'candles', limit=100_000)
+def bench_update_chart(n):
+    # Pencere kayarken yeni bir mum gelmesi (artımlı yol)
+    window = _gui([])
+    frame = calculate_technical_indicators(candle_frame(n + 1000))
+    offset = [0]
+
+    def run():
+        start = offset[0] % 1000
+        window.update_chart(frame.iloc[start:start + n])
+        _app.processEvents()
+        offset[0] += 1
+    return run
+
+
+@case('update_chart_tick', 'candles', limit=100_000)
+def bench_update_chart_tick(n):
+    # Canlı mumun kapanışının değişmesi (sadece son nokta yazılır)
+    window = _gui([])
+    frame = calculate_technical_indicators(candle_frame(n))
+    close = frame.columns.get_loc('close')
+    window.update_chart(frame)
+    tick = [0]
+
+    def run():
+        tick[0] += 1
+        frame.iat[-1, close] += 0.01 if tick[0] % 2 else -0.01
+        window.update_chart(frame)
+        _app.processEvents()
+    return run
+
+
+@case('update_chart_full', 'candles', limit=100_000)
+def bench_update_chart_full(n):
+    # Coin değişince grafiğin baştan çizilmesi
+    window = _gui([])
+    frame = calculate_technical_indicators(candle_frame(n))
+
+    def run():
+        window._plotted.clear()
+        window.update_chart(frame)
+        _app.processEvents()
+    return run
+
+
+@case('update_history_table', 'trades')
+def bench_update_history_table(n):
+    # n işlemlik geçmişe tek işlem eklenip tablonun güncellenmesi
+    window = _gui(trade_records(n))
+    trade = trade_records(1)[0]
+
+    def run():
+        window.bot.trading_history.append(trade)
+        window.update_history_table()
+        _app.processEvents()
+    return run
+
+
+# --- Çalıştırıcı ---
+
+def measure(fn, repeat=5, min_time=0.05):
+    """Çağrı başına süreleri (saniye) döndür
+
+    Önce bir ısınma çağrısı yapılır, sonra her tekrarın en az min_time
+    sürmesi için döngü sayısı ikiye katlanarak ayarlanır.
+    """
+    fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return times, number
+
+
+def environment():
+    """Sonuçların karşılaştırılabilirliği için makine ve sürüm bilgisi"""
+    def git(*args):
+        try:
+            return subprocess.run(
+                ['git', *args], cwd=ROOT, capture_output=True, text=True,
+                timeout=10
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ''
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def run(pattern='*', scale='quick', repeat=5, output=None):
+    results = {}
+    for name, size, limit, setup in CASES:
+        for n in SCALES[scale][size]:
+            if limit is not None and n > limit:
+                continue
+            key = f"{name}[{size}={n}]"
+            if not fnmatch.fnmatch(key, f"*{pattern}*"):
+                continue
+            try:
+                fn = setup(n)
+            except Skip as e:
+                results[key] = {'skipped': str(e)}
+                print(f"{key:<45} skipped ({e})")
+                continue
+            times, number = measure(fn, repeat)
+            results[key] = {
+                'median': statistics.median(times),
+                'min': min(times),
+                'max': max(times),
+                'loops': number,
+                'repeat': repeat
+            }
+            print(f"{key:<45} {statistics.median(times) * 1e3:>12.3f} ms "
+                  f"(min {min(times) * 1e3:.3f}, {number} loops)", flush=True)
+
+    report = {'environment': environment(), 'scale': scale,
+              'results': results}
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        env = report['environment']
+        output = os.path.join(
+            RESULTS_DIR,
+            f"{datetime.now():%Y%m%d-%H%M%S}-{env['commit'] or 'nogit'}.json"
+        )
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {output}")
+    return report
+
+
+def compare(base_path, new_path, threshold=0.10):
+    """İki sonucu karşılaştır, eşiği aşan yavaşlama sayısını döndür"""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    for label, report in (('base', base), ('new', new)):
+        env = report['environment']
+        print(f"{label}: {env['commit']}{'+' if env['dirty'] else ''} "
+              f"{env['timestamp']} python {env['python']} "
+              f"numpy {env['numpy']} ({env['machine']}, "
+              f"{env['cpu_count']} cpu)")
+
+    regressions = 0
+    print(f"{'benchmark':<45} {'base (ms)':>12} {'new (ms)':>12} {'change':>8}")
+    for key in sorted(set(base['results']) | set(new['results'])):
+        old = base['results'].get(key, {}).get('median')
+        current = new['results'].get(key, {}).get('median')
+        if old is None or current is None:
+            print(f"{key:<45} {'-' if old is None else f'{old * 1e3:.3f}':>12} "
+                  f"{'-' if current is None else f'{current * 1e3:.3f}':>12}")
+            continue
+        change = current / old - 1
+        flag = ''
+        if change > threshold:
+            flag = '  SLOWER'
+            regressions += 1
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{key:<45} {old * 1e3:>12.3f} {current * 1e3:>12.3f} "
+              f"{change:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bot benchmark paketi')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Ölçümleri çalıştır')
+    run_parser.add_argument('-k', '--pattern', default='*',
+                            help='Ölçüm adı filtresi (ör. state, update_*)')
+    run_parser.add_argument('--scale', choices=SCALES, default='quick')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--output', default=None)
+
+    compare_parser = subparsers.add_parser(
+        'compare', help='İki sonuç dosyasını karşılaştır')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help='Yavaşlama sayılacak oran (0.10 = %%10)')
+
+    subparsers.add_parser('list', help='Ölçümleri listele')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        run(args.pattern, args.scale, args.repeat, args.output)
+    elif args.command == 'compare':
+        sys.exit(1 if compare(args.base, args.new, args.threshold) else 0)
+    else:
+        for name, size, limit, _ in CASES:
+            sizes = [n for n in SCALES['full'][size]
+                     if limit is None or n <= limit]
+            print(f"{name:<25} {size}: {', '.join(map(str, sizes))}")
+
+
+if __name__ == '__main__':
+    main()
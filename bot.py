@@ -8,102 +8,191 @@ import time
 import telegram
 from datetime import datetime
 import threading
+import asyncio
 
 from config import *
-from models import PricePredictionModel
 from utils import *
 # bot.py
 
 from state_manager import StateManager
+from metrics import PerformanceTracker, order_costs, order_fills
+from trade_ledger import TradeLedger
+from kline_store import KlineStore
+from history_store import HistoryStore
+from exchange_info import ExchangeInfoCache
+from notifier import NotificationDispatcher, repeat_message
+from market_data import MarketDataFeed
+from screener import Screener
+from strategy import buy_signal, sell_signal
+from async_engine import AsyncTradingEngine
+from model_registry import ModelRegistry
+from retrain_scheduler import RetrainScheduler
+from instrumentation import instrumentation, instrument_client, span
+from gateway import RestGateway
 
 class CryptoTradingBot:
     def __init__(self):
         # ... (mevcut init kodları) ...
         
+        # REST çağrılarının süresi, durum kodu ve kullanılan ağırlık
+        # (INSTRUMENTATION_ENABLED kapalıysa istemci değiştirilmez)
+        instrument_client(self.client)
+        
+        # Tüm REST istekleri geçitten geçer: ağırlık bütçesi, öncelik sırası
+        # (emirler grafikten önce), aynı isteklerin birleştirilmesi, 429/418
+        self.client = RestGateway(self.client)
+        
+        # Mum verileri için yerel önbellek (bot ve GUI ortak kullanır);
+        # history_store.py ile indirilmiş geçmiş varsa oradan doldurulur
+        self.history_store = HistoryStore()
+        self.kline_store = KlineStore(self.client, history=self.history_store)
+        
+        # Telegram ve GUI bildirimleri arka planda, trading thread'ini
+        # bekletmeden gönderilir
+        self.notifier = NotificationDispatcher(
+            self._deliver_telegram, name='telegram-notifier'
+        )
+        self.callback_dispatcher = NotificationDispatcher(
+            self._deliver_callback, rate=None, name='gui-callbacks',
+            summarize=lambda p, count: (p[0], repeat_message(p[1], count))
+        )
+        
+        # Sembol kuralları (LOT_SIZE, MIN_NOTIONAL, PRICE_FILTER) önbelleği
+        self.exchange_info = ExchangeInfoCache(self.client)
+        
+        # WebSocket fiyat/mum beslemesi
+        self.market_data = MarketDataFeed(self.kline_store)
+        
+        # Coin tarayıcı: tüm piyasa mini-ticker akışıyla güncel tutulur,
+        # akış yokken get_ticker en fazla SCREENER_TTL'de bir çağrılır
+        self.screener = Screener(self.client)
+        self.market_data.subscribe_market_tickers(self.screener.on_mini_tickers)
+        
+        # Çoklu sembol motoru (start_multi_symbol ile başlatılır)
+        self.engine = None
+        
+        # Sembol bazında kayıtlı modeller (ilk kullanımda diskten yüklenir,
+        # numpy backend'inde TensorFlow hiç yüklenmez)
+        self.model_registry = ModelRegistry()
+        
+        # Modelleri ayrı süreçlerde arka planda yeniden eğiten planlayıcı
+        self.retrain_scheduler = RetrainScheduler(
+            self.model_registry, on_error=self.handle_error
+        )
+        
         # State manager'ı ekle
         self.state_manager = StateManager()
         self.load_saved_state()
         
+    def get_prediction_model(self, symbol, interval='1h', df=None):
+        """Sembolün modelini getir, gerekiyorsa arka planda eğitimi başlat"""
+        if df is not None:
+            self.retrain_scheduler.maybe_retrain(symbol, interval, df)
+        
+        # İlk eğitim bitene kadar None döner, döngü eğitimi beklemez
+        return self.model_registry.get(symbol, interval)
+        
+    def predict_prices(self, frames, interval='1h'):
+        """{sembol: df} için tahminleri modele göre gruplayıp toplu yap"""
+        groups = {}
+        for symbol, df in frames.items():
+            model = self.get_prediction_model(symbol, interval, df)
+            if model is not None:
+                groups.setdefault(id(model), (model, []))[1].append(symbol)
+        
+        predictions = {}
+        for model, symbols in groups.values():
+            values = model.predict_batch([frames[s] for s in symbols])
+            predictions.update(zip(symbols, values))
+        
+        for symbol, predicted in predictions.items():
+            self.retrain_scheduler.observe(
+                symbol, interval, frames[symbol], predicted
+            )
+        return predictions
+        
+    def use_client(self, client, stream_url=None):
+        """Borsa istemcisini değiştir (ör. simulated_exchange.SimulatedClient)
+
+        Canlı Binance akışı yeni istemciyle çelişen fiyat ve mumlar
+        getireceği için besleme değiştirilir: stream_url verilirse (ör.
+        ReplayServer.url) oraya bağlanır, verilmezse hiç bağlanmaz ve tüm
+        okumalar yeni istemciden yapılır.
+        """
+        self.client = RestGateway(instrument_client(client))
+        self.kline_store.client = self.client
+        self.exchange_info.client = self.client
+        self.screener.client = self.client
+        self.exchange_info.invalidate()
+        
+        running = self.market_data.is_running
+        self.market_data.stop()
+        self.market_data = MarketDataFeed(self.kline_store, url=stream_url)
+        self.market_data.subscribe_market_tickers(self.screener.on_mini_tickers)
+        if running:
+            self.market_data.start()
+        
     def load_saved_state(self):
         """Kaydedilmiş durumu yükle"""
         state = self.state_manager.load_state()
         self.current_balance = state['current_balance']
         self.current_coin = state['current_coin']
-        self.trading_history = state['trading_history']
+        self.trading_history = TradeLedger.from_records(
+            state['trading_history']
+        )
+        
+        # Metrikler kayıtlı geçmişten bir kez kurulur, sonra her fill ile
+        # artımlı güncellenir; kayıtlı ücret ve net miktar canlıdaki gibi
+        # uygulanır
+        self.performance = PerformanceTracker()
+        for symbol, side, quantity, price, fee in self.trading_history.iterfills():
+            self.performance.on_fill(symbol, side, quantity, price, fee)
         
     def save_current_state(self):
         """Mevcut durumu kaydet"""
         self.state_manager.save_state(self)
         
-    def execute_trade(self, symbol, side, quantity):
-        """Alım/satım işlemi gerçekleştir"""
-        try:
-            order = self.client.create_order(
-                symbol=symbol,
-                side=side,
-                type=Client.ORDER_TYPE_MARKET,
-                quantity=quantity
-            )
-            
-            trade_info = {
-                'timestamp': datetime.now(),
-                'symbol': symbol,
-                'side': side,
-                'quantity': quantity,
-                'price': float(order['fills'][0]['price'])
-            }
-            
-            self.trading_history.append(trade_info)
-            self.save_current_state()  # Her işlemden sonra kaydet
-            
-            self.send_telegram_notification(
-                f"{side} {quantity} {symbol} at {trade_info['price']}"
-            )
-            
-            if self.on_trade_callback:
-                self.on_trade_callback(trade_info)
-            
-            return order
-            
-        except BinanceAPIException as e:
-            self.handle_error(f"Error executing trade: {str(e)}")
-            return None
-
     def start(self):
         """Bot'u başlat"""
         self.is_running = True
+        self.notifier.start()
+        self.callback_dispatcher.start()
+        instrumentation.start_exporters()
+        self.market_data.start()
         threading.Thread(target=self.trading_loop).start()
 
+    def start_multi_symbol(self, symbols, interval='1h'):
+        """Birden fazla sembolü asyncio motoru ile eşzamanlı işle"""
+        self.is_running = True
+        self.notifier.start()
+        self.callback_dispatcher.start()
+        instrumentation.start_exporters()
+        self.market_data.start()
+        self.engine = AsyncTradingEngine(self, symbols, interval)
+        threading.Thread(
+            target=asyncio.run, args=(self.engine.run(),)
+        ).start()
+
     def stop(self):
         """Bot'u durdur"""
         self.is_running = False
+        if self.engine is not None:
+            self.engine.stop()
+        self.market_data.stop()
+        self.retrain_scheduler.shutdown()
+        self.state_manager.checkpoint(self)
+        instrumentation.stop_exporters()
+        
+        # Kuyruktaki bildirimleri gönderip thread'leri durdur (start ile
+        # yeniden başlatılır)
+        self.callback_dispatcher.stop()
+        self.notifier.stop()
 
     def get_viable_coins(self):
-    """1 dolar altı ve en yüksek hacimli 10 coini getir"""
-    try:
-        tickers = self.client.get_ticker()
-        viable_coins = []
-        
-        for ticker in tickers:
-            if ticker['symbol'].endswith('USDT'):
-                price = float(ticker['lastPrice'])
-                volume = float(ticker['volume']) * price
-                
-                if price < 1.0:  # 1 dolar altı coinler
-                    viable_coins.append({
-                        'symbol': ticker['symbol'],
-                        'price': price,
-                        'volume': volume
-                    })
-        
-        # Hacme göre sırala ve ilk 10'u al
-        viable_coins.sort(key=lambda x: x['volume'], reverse=True)
-        return viable_coins[:10]
+        """MAX_COIN_PRICE altı, MINIMUM_VOLUME üstü en yüksek hacimli coinler"""
+        try:
+            return self.screener.get_viable_coins()
         
-    except BinanceAPIException as e:
-        self.handle_error(f"Error getting viable coins: {str(e)}")
-        return []
-            
         except BinanceAPIException as e:
             self.handle_error(f"Error getting viable coins: {str(e)}")
             return []
@@ -111,25 +200,14 @@ class CryptoTradingBot:
     def get_historical_data(self, symbol, interval='1h', limit=500):
         """Geçmiş fiyat verilerini getir"""
         try:
-            klines = self.client.get_klines(
-                symbol=symbol,
-                interval=interval,
-                limit=limit
-            )
+            # Akış açıksa depo zaten güncel, REST'e gitme
+            self.market_data.subscribe(symbol, interval)
+            streaming = self.market_data.is_streaming(symbol, interval)
             
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
-            
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            return calculate_technical_indicators(df)
+            # İndikatörler depoda artımlı olarak hesaplanıyor
+            return self.kline_store.get_dataframe(
+                symbol, interval, limit, refresh=not streaming
+            )
             
         except BinanceAPIException as e:
             self.handle_error(f"Error getting historical data: {str(e)}")
@@ -138,50 +216,79 @@ class CryptoTradingBot:
     def execute_trade(self, symbol, side, quantity):
         """Alım/satım işlemi gerçekleştir"""
         try:
-            order = self.client.create_order(
-                symbol=symbol,
-                side=side,
-                type=Client.ORDER_TYPE_MARKET,
-                quantity=quantity
-            )
-            
-            trade_info = {
-                'timestamp': datetime.now(),
-                'symbol': symbol,
-                'side': side,
-                'quantity': quantity,
-                'price': float(order['fills'][0]['price'])
-            }
-            
-            self.trading_history.append(trade_info)
-            self.send_telegram_notification(
-                f"{side} {quantity} {symbol} at {trade_info['price']}"
-            )
-            
-            if self.on_trade_callback:
-                self.on_trade_callback(trade_info)
+            with span('order', side=side):
+                order = self.client.create_order(
+                    symbol=symbol,
+                    side=side,
+                    type=Client.ORDER_TYPE_MARKET,
+                    quantity=quantity
+                )
             
+            with span('record_trade'):
+                self.record_trade(symbol, side, quantity, order)
             return order
             
         except BinanceAPIException as e:
             self.handle_error(f"Error executing trade: {str(e)}")
             return None
 
+    def record_trade(self, symbol, side, quantity, order):
+        """Gerçekleşen emri geçmişe işle ve bildirimleri gönder"""
+        # Emir birden fazla fill ile gerçekleşebilir: miktar toplam,
+        # fiyat miktar ağırlıklı ortalama
+        fills = order_fills(order)
+        executed = sum(qty for qty, _, _, _ in fills) or float(quantity)
+        price = sum(qty * fill_price for qty, fill_price, _, _ in fills) / executed
+        fee, net_quantity = order_costs(symbol, side, fills)
+        
+        trade_info = {
+            'timestamp': datetime.now(),
+            'symbol': symbol,
+            'side': side,
+            'quantity': executed,
+            'price': price,
+            'fee': fee,
+            'net_quantity': net_quantity or executed
+        }
+        self.performance.on_order(symbol, side, fills)
+        
+        # Her işlemden sonra sadece yeni kayıt günlüğe eklenir; geçmişe
+        # ekleme aynı kilit altında yapılır ki checkpoint işlemi iki kez
+        # kaydetmesin
+        self.state_manager.append_trade(trade_info, self.trading_history)
+        self.save_current_state()
+        
+        self.send_telegram_notification(
+            f"{side} {executed} {symbol} at {trade_info['price']}"
+        )
+        
+        self.callback_dispatcher.notify(('trade', trade_info))
+        
+        return trade_info
+
     def trading_loop(self):
         """Ana trading döngüsü"""
         while self.is_running:
             try:
                 if self.current_coin:
+                    started = time.perf_counter()
                     # Mevcut coin için verileri al
-                    df = self.get_historical_data(self.current_coin)
+                    with span('klines'):
+                        df = self.get_historical_data(self.current_coin)
                     if df is None:
                         continue
                     
-                    # Fiyat tahmini yap
-                    predicted_price = self.prediction_model.predict(df)
-                    current_price = float(self.client.get_symbol_ticker(
-                        symbol=self.current_coin
-                    )['price'])
+                    # Fiyat tahmini yap (model henüz eğitiliyorsa bu turu atla)
+                    with span('predict'):
+                        predicted_price = self.predict_prices(
+                            {self.current_coin: df}
+                        ).get(self.current_coin)
+                    if predicted_price is None:
+                        time.sleep(UPDATE_INTERVAL)
+                        continue
+                    with span('ticker'):
+                        current_price = self.get_current_price(self.current_coin)
+                    self.performance.mark(self.current_coin, current_price)
                     
                     # Trading sinyallerini kontrol et
                     last_row = df.iloc[-1]
@@ -191,21 +298,37 @@ class CryptoTradingBot:
                     
                     # Trading kararları
                     if self.current_balance > 0:  # Alım için
-                        if (rsi < 30 and macd > signal and 
-                            predicted_price > current_price):
-                            quantity = self.calculate_quantity(
-                                self.current_coin,
-                                self.current_balance
-                            )
-                            self.execute_trade(self.current_coin, 'BUY', quantity)
+                        if buy_signal(rsi, macd, signal,
+                                      predicted_price, current_price):
+                            with span('quantity'):
+                                quantity = self.calculate_quantity(
+                                    self.current_coin,
+                                    self.current_balance
+                                )
+                            if quantity:
+                                self.execute_trade(self.current_coin, 'BUY', quantity)
                     else:  # Satım için
-                        if (rsi > 70 and macd < signal and 
-                            predicted_price < current_price):
-                            balance = self.get_coin_balance(self.current_coin)
-                            if balance > 0:
-                                self.execute_trade(self.current_coin, 'SELL', balance)
-                
-                time.sleep(UPDATE_INTERVAL)
+                        if sell_signal(rsi, macd, signal,
+                                       predicted_price, current_price):
+                            with span('balance'):
+                                balance = self.get_coin_balance(self.current_coin)
+                            # Serbest bakiye LOT_SIZE adımına aşağı yuvarlanır
+                            filters = self.exchange_info.get(self.current_coin)
+                            if filters.round_quantity(balance) > 0:
+                                self.execute_trade(
+                                    self.current_coin, 'SELL',
+                                    filters.format_quantity(balance)
+                                )
+                    
+                    # Veriden karara (emir dahil) tam bir turun süresi
+                    instrumentation.observe('loop', time.perf_counter() - started)
+                    
+                    # Yeni mum kapanana kadar (en fazla UPDATE_INTERVAL) bekle
+                    self.market_data.wait_for_candle(
+                        self.current_coin, UPDATE_INTERVAL
+                    )
+                else:
+                    time.sleep(UPDATE_INTERVAL)
                 
             except Exception as e:
                 self.handle_error(f"Error in trading loop: {str(e)}")
@@ -214,33 +337,20 @@ class CryptoTradingBot:
     def calculate_quantity(self, symbol, amount):
         """İşlem miktarını hesapla"""
         try:
-            info = self.client.get_symbol_info(symbol)
-            price = float(self.client.get_symbol_ticker(symbol=symbol)['price'])
-            
-            # Lot size kurallarını al
-            lot_size_filter = next(filter(
-                lambda x: x['filterType'] == 'LOT_SIZE',
-                info['filters']
-            ))
-            
-            min_qty = float(lot_size_filter['minQty'])
-            step_size = float(lot_size_filter['stepSize'])
-            
-            # Miktarı hesapla
-            quantity = (amount / price)
-            
-            # Step size'a göre yuvarla
-            quantity = (quantity // step_size) * step_size
-            
-            if quantity < min_qty:
-                return min_qty
-                
-            return quantity
+            price = self.get_current_price(symbol)
+            return self.exchange_info.order_quantity(symbol, amount, price)
             
         except Exception as e:
             self.handle_error(f"Error calculating quantity: {str(e)}")
             return None
 
+    def get_current_price(self, symbol):
+        """Anlık fiyatı getir (önce bellekteki akış, yoksa REST)"""
+        price = self.market_data.get_price(symbol)
+        if price is None:
+            price = float(self.client.get_symbol_ticker(symbol=symbol)['price'])
+        return price
+
     def get_coin_balance(self, symbol):
         """Coin bakiyesini getir"""
         try:
@@ -251,29 +361,39 @@ class CryptoTradingBot:
             self.handle_error(f"Error getting balance: {str(e)}")
             return 0
 
-    def send_telegram_notification(self, message):
-        """Telegram bildirimi gönder"""
-        try:
+    def send_telegram_notification(self, message, kind='info'):
+        """Telegram bildirimini kuyruğa al (beklemeden döner)"""
+        self.notifier.notify(message, kind)
+
+    def _deliver_telegram(self, message):
+        """Telegram bildirimi gönder (bildirim thread'inde çalışır)"""
+        with span('telegram'):
             self.telegram_bot.send_message(
                 chat_id=TELEGRAM_CHAT_ID,
                 text=message
             )
-        except Exception as e:
-            print(f"Telegram notification error: {str(e)}")
+
+    def _deliver_callback(self, event):
+        """GUI callback'ini çağır (bildirim thread'inde çalışır)"""
+        kind, payload = event
+        callback = (self.on_trade_callback if kind == 'trade'
+                    else self.on_error_callback)
+        if callback:
+            callback(payload)
 
     def handle_error(self, error_message):
         """Hata yönetimi"""
         print(f"Error: {error_message}")
-        self.send_telegram_notification(f"❌ Error: {error_message}")
-        
-        if self.on_error_callback:
-            self.on_error_callback(error_message)
+        self.send_telegram_notification(
+            f"❌ Error: {error_message}", kind='error'
+        )
+        self.callback_dispatcher.notify(('error', error_message), kind='error')
 
     def get_performance_metrics(self):
-        """Performans metriklerini hesapla"""
-        return {
-            'total_profit': calculate_profit(self.trading_history),
-            'win_rate': calculate_win_rate(self.trading_history),
+        """Performans metriklerini getir (geçmiş yeniden taranmaz)"""
+        metrics = self.performance.snapshot()
+        metrics.update({
             'total_trades': len(self.trading_history),
             'current_balance': self.current_balance
-        }
\ No newline at end of file
+        })
+        return metrics
\ No newline at end of file
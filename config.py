@@ -8,13 +8,65 @@ API_SECRET = "."
 TELEGRAM_TOKEN = "."
 TELEGRAM_CHAT_ID = "."
 
+# REST Geçidi (Rate Limit)
+GATEWAY_WEIGHT_LIMIT = 6000  # Dakikalık istek ağırlığı bütçesi (X-MBX-USED-WEIGHT-1M)
+GATEWAY_POOL_SIZE = 10  # Aynı anda açık tutulacak keep-alive bağlantı sayısı
+GATEWAY_MAX_RETRIES = 3  # 429 (Too Many Requests) sonrası tekrar deneme sayısı
+
+# Bildirim Ayarları
+NOTIFY_QUEUE_SIZE = 100  # Bekleyen en fazla bildirim sayısı
+NOTIFY_RATE_LIMIT = 1.0  # Saniyede gönderilecek bildirim sayısı
+NOTIFY_BURST = 5  # Hız sınırına takılmadan art arda gönderilebilecek bildirim
+NOTIFY_COALESCE_WINDOW = 60  # Aynı hatanın tekrar gönderilmeyeceği süre (saniye)
+
 # Trading Parametreleri
 INITIAL_BALANCE = 30  # USDT
 MINIMUM_VOLUME = 1000000  # Minimum günlük işlem hacmi
 MAX_COIN_PRICE = 1.0  # Maximum coin fiyatı
+SCREENER_TOP_K = 10  # Listelenecek en yüksek hacimli coin sayısı
+SCREENER_TTL = 60  # Ticker tablosunun akış yokken yenilenme aralığı (saniye)
 UPDATE_INTERVAL = 60  # Güncelleme aralığı (saniye)
+KLINE_CACHE_SIZE = 500  # Sembol/periyot başına saklanan mum sayısı
+RSI_OVERSOLD = 30  # Alım için RSI eşiği
+RSI_OVERBOUGHT = 70  # Satım için RSI eşiği
+MAX_CONCURRENT_SYMBOLS = 10  # Aynı anda değerlendirilen sembol sayısı
+EXCHANGE_INFO_TTL = 3600  # Sembol kurallarının (exchangeInfo) yenilenme aralığı (saniye)
+BACKTEST_FEE_RATE = 0.001  # Backtest işlem ücreti (işlem tutarına oran)
+BACKTEST_SLIPPAGE = 0.0005  # Backtest'te piyasa emrinin fiyattan kayma oranı
+
+# Geçmiş Veri Deposu
+HISTORY_DIR = 'history'  # İndirilen mum geçmişinin (sembol/periyot/ay) klasörü
+
+# Durum Kaydı
+STATE_SNAPSHOT_INTERVAL = 1000  # Bu kadar günlük kaydından sonra tam snapshot alınır
+STATE_FSYNC = False  # Her günlük kaydından sonra diske zorla yaz (yavaş, daha güvenli)
+
+# WebSocket Piyasa Verisi
+BINANCE_WS_URL = "wss://stream.binance.com:9443"
+PRICE_MAX_AGE = 10  # Bellekteki fiyatın geçerli sayılacağı süre (saniye)
+
+# Ölçüm (Instrumentation)
+INSTRUMENTATION_ENABLED = False  # Aşama süreleri ve REST sayaçlarını topla
+METRICS_HOST = '127.0.0.1'  # /metrics'in dinleyeceği adres (bakiye/işlem bilgisi içerir)
+METRICS_PORT = 9108  # Prometheus /metrics HTTP portu (None: kapalı)
+METRICS_FILE = 'metrics.jsonl'  # Periyodik JSON çıktısı (None: kapalı)
+METRICS_FILE_INTERVAL = 60  # JSON çıktısının yazılma aralığı (saniye)
+METRICS_FILE_MAX_BYTES = 10 * 1024 * 1024  # Bu boyutta dosya döndürülür
+METRICS_FILE_BACKUPS = 5  # Tutulacak eski JSON dosyası sayısı
+
+# Arayüz Ayarları
+CHART_POINTS_PER_PIXEL = 1  # Grafikte piksel başına çizilecek en fazla nokta
+GUI_REFRESH_INTERVAL = 5000  # Grafik/metrik verisinin yenilenme aralığı (ms)
 
 # Neural Network Parametreleri
 SEQUENCE_LENGTH = 60  # Tahmin için kullanılacak veri noktası sayısı
+FEATURES = ['close', 'volume', 'RSI', 'MACD', 'Signal']  # Model girdileri (ilk sütun tahmin edilir)
 EPOCHS = 50
 BATCH_SIZE = 32
+
+# Canlı Tahmin Ayarları
+INFERENCE_BACKEND = 'numpy'  # 'numpy' (TensorFlow'suz) veya 'keras'
+MODEL_REGISTRY_DIR = 'model_registry'  # Sürümlü model deposu klasörü
+MODEL_MAX_AGE = 24 * 3600  # Bu süreden eski modeller yeniden eğitilir (saniye)
+RETRAIN_WORKERS = None  # Eğitim süreç sayısı (None: tüm çekirdekler)
+RETRAIN_DRIFT_THRESHOLD = 0.02  # Ortalama tahmin hatası bu oranı aşarsa yeniden eğit
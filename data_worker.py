@@ -0,0 +1,109 @@
+# data_worker.py
+
+import threading
+
+from PyQt6.QtCore import (
+    QObject, QThread, QTimer, Qt, pyqtSignal, pyqtSlot
+)
+
+from config import GUI_REFRESH_INTERVAL
+from gateway import PRIORITY_CHART, request_priority
+
+
+class MarketDataWorker(QObject):
+    """GUI için tüm ağ erişimini ayrı bir QThread'de yapan veri katmanı
+
+    Mum verisi, metrikler ve coin listesi worker thread'inde hazırlanır ve
+    GUI'ye tipli sinyallerle iletilir. Anlık görüntüler birleştirilir: GUI
+    bir öncekini çizmeden yeni görüntü gelirse sadece en sonuncusu çizilir.
+    Bot'un işlem/hata callback'leri de aynı sinyaller üzerinden GUI
+    thread'ine taşınır.
+    """
+
+    snapshot_ready = pyqtSignal()     # take_snapshot ile alınacak yeni görüntü var
+    coins_ready = pyqtSignal(list)    # [{'symbol', 'price', 'volume'}, ...]
+    trade_executed = pyqtSignal(object)  # trade_info dict'i (datetime korunur)
+    error_occurred = pyqtSignal(str)
+
+    # GUI thread'inden worker thread'ine istekler (kuyruklu bağlantı)
+    refresh_requested = pyqtSignal()
+    coins_requested = pyqtSignal()
+
+    def __init__(self, bot, interval=GUI_REFRESH_INTERVAL):
+        super().__init__()
+        self.bot = bot
+        self.interval = interval
+        self._latest = None
+        self._lock = threading.Lock()
+
+        self.refresh_requested.connect(self.refresh)
+        self.coins_requested.connect(self.load_coins)
+
+        # Bot callback'leri bildirim thread'inde çalışır, sinyal GUI'ye taşır
+        bot.on_trade_callback = self.trade_executed.emit
+        bot.on_error_callback = self.error_occurred.emit
+
+        self._thread = QThread()
+        self._thread.setObjectName('gui-data-worker')
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self._start_timer)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Thread'i durdur ve bitmesini bekle"""
+        self._thread.quit()
+        self._thread.wait()
+
+    @pyqtSlot()
+    def _start_timer(self):
+        # Timer worker thread'inde oluşturulmalı ki zamanlaması orada çalışsın
+        self._timer = QTimer()
+        self._timer.timeout.connect(self.refresh)
+        self._thread.finished.connect(self._timer.stop,
+                                      Qt.ConnectionType.DirectConnection)
+        self._timer.start(self.interval)
+        self.refresh()
+
+    @pyqtSlot()
+    def refresh(self):
+        """Seçili coinin mumlarını ve metrikleri hazırlayıp yayınla"""
+        try:
+            symbol = self.bot.current_coin
+            frame = None
+            if symbol:
+                # Grafik istekleri bütçe daralınca bot isteklerine yol verir
+                with request_priority(PRIORITY_CHART):
+                    frame = self.bot.get_historical_data(symbol)
+            snapshot = {
+                'symbol': symbol,
+                'frame': frame,
+                'metrics': self.bot.get_performance_metrics()
+            }
+        except Exception as e:
+            self.error_occurred.emit(f"Error refreshing data: {str(e)}")
+            return
+
+        with self._lock:
+            pending = self._latest is not None
+            self._latest = snapshot
+        # Önceki görüntü henüz alınmadıysa tekrar sinyal gönderme
+        if not pending:
+            self.snapshot_ready.emit()
+
+    def take_snapshot(self):
+        """En son görüntüyü al (yoksa None)"""
+        with self._lock:
+            snapshot, self._latest = self._latest, None
+        return snapshot
+
+    @pyqtSlot()
+    def load_coins(self):
+        """Uygun coin listesini getir"""
+        try:
+            with request_priority(PRIORITY_CHART):
+                coins = self.bot.get_viable_coins()
+            self.coins_ready.emit(coins)
+        except Exception as e:
+            self.error_occurred.emit(f"Error loading coins: {str(e)}")
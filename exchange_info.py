@@ -0,0 +1,136 @@
+# exchange_info.py
+
+import threading
+import time
+from decimal import Decimal, ROUND_DOWN
+
+from config import EXCHANGE_INFO_TTL
+
+
+def _decimal(value):
+    return Decimal(str(value))
+
+
+class SymbolFilters:
+    """Bir sembolün LOT_SIZE, MIN_NOTIONAL ve PRICE_FILTER kuralları
+
+    Değerler exchangeInfo yüklenirken bir kez Decimal'e çevrilir, emir
+    yolunda sadece hazır değerlerle hesap yapılır.
+    """
+
+    __slots__ = (
+        'symbol', 'min_qty', 'max_qty', 'step_size', 'min_notional',
+        'min_price', 'max_price', 'tick_size'
+    )
+
+    def __init__(self, symbol, filters):
+        self.symbol = symbol
+        by_type = {f['filterType']: f for f in filters}
+
+        lot_size = by_type.get('LOT_SIZE', {})
+        self.min_qty = _decimal(lot_size.get('minQty', 0))
+        self.max_qty = _decimal(lot_size.get('maxQty', 0))
+        self.step_size = _decimal(lot_size.get('stepSize', 0))
+
+        # Binance eski MIN_NOTIONAL filtresini NOTIONAL ile değiştirdi
+        notional = by_type.get('MIN_NOTIONAL') or by_type.get('NOTIONAL', {})
+        self.min_notional = _decimal(notional.get('minNotional', 0))
+
+        price_filter = by_type.get('PRICE_FILTER', {})
+        self.min_price = _decimal(price_filter.get('minPrice', 0))
+        self.max_price = _decimal(price_filter.get('maxPrice', 0))
+        self.tick_size = _decimal(price_filter.get('tickSize', 0))
+
+    @staticmethod
+    def _floor_to_step(value, step):
+        if not step:
+            return value
+        return (value / step).to_integral_value(ROUND_DOWN) * step
+
+    def round_quantity(self, quantity):
+        """Miktarı step size'a göre aşağı yuvarla"""
+        return self._floor_to_step(_decimal(quantity), self.step_size)
+
+    def format_quantity(self, quantity):
+        """Miktarı step size'a yuvarlayıp emir için string'e çevir
+
+        Bilimsel gösterim kullanılmaz: Binance '1e-05' gibi değerleri
+        reddeder.
+        """
+        return format(self.round_quantity(quantity), 'f')
+
+    def round_price(self, price):
+        """Fiyatı tick size'a göre aşağı yuvarla"""
+        return self._floor_to_step(_decimal(price), self.tick_size)
+
+    def order_quantity(self, amount, price):
+        """USDT tutarını kurallara uygun emir miktarına (string) çevir
+
+        Tutar minQty'ye veya MIN_NOTIONAL'a yetmiyorsa ValueError; miktar
+        hiçbir zaman tutarın alabileceğinden büyük olmaz.
+        """
+        price = _decimal(price)
+        quantity = self._floor_to_step(_decimal(amount) / price,
+                                       self.step_size)
+
+        if quantity <= 0 or quantity < self.min_qty:
+            raise ValueError(
+                f"{self.symbol} amount {amount} buys {quantity}, below "
+                f"LOT_SIZE minQty {self.min_qty}"
+            )
+        if self.max_qty and quantity > self.max_qty:
+            quantity = self.max_qty
+
+        if quantity * price < self.min_notional:
+            raise ValueError(
+                f"{self.symbol} order value {quantity * price} is below "
+                f"MIN_NOTIONAL {self.min_notional}"
+            )
+        return format(quantity, 'f')
+
+
+class ExchangeInfoCache:
+    """exchangeInfo'yu bir kez yükleyip TTL ile yenileyen sembol kuralı önbelleği"""
+
+    def __init__(self, client, ttl=EXCHANGE_INFO_TTL):
+        self.client = client
+        self.ttl = ttl
+        self._filters = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def needs_refresh(self):
+        return (self._loaded_at is None
+                or time.monotonic() - self._loaded_at > self.ttl)
+
+    def invalidate(self):
+        """Kuralları bir sonraki kullanımda yeniden yüklet"""
+        with self._lock:
+            self._loaded_at = None
+
+    def update(self, exchange_info):
+        """get_exchange_info cevabından tüm sembollerin kurallarını kur"""
+        filters = {
+            info['symbol']: SymbolFilters(info['symbol'], info['filters'])
+            for info in exchange_info['symbols']
+        }
+        with self._lock:
+            self._filters = filters
+            self._loaded_at = time.monotonic()
+
+    def refresh(self):
+        """exchangeInfo'yu REST üzerinden yeniden yükle"""
+        self.update(self.client.get_exchange_info())
+
+    def get(self, symbol, refresh=True):
+        """Sembolün kurallarını getir (gerekiyorsa önce yenile)"""
+        if refresh and self.needs_refresh():
+            self.refresh()
+        try:
+            return self._filters[symbol]
+        except KeyError:
+            raise KeyError(f"Unknown symbol: {symbol}")
+
+    def order_quantity(self, symbol, amount, price, refresh=True):
+        """Tutarı sembolün kurallarına göre emir miktarına çevir"""
+        return self.get(symbol, refresh).order_quantity(amount, price)
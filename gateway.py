@@ -0,0 +1,429 @@
+# gateway.py
+
+import asyncio
+import functools
+import heapq
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from binance.exceptions import BinanceAPIException
+from requests.adapters import HTTPAdapter
+
+from config import GATEWAY_MAX_RETRIES, GATEWAY_POOL_SIZE, GATEWAY_WEIGHT_LIMIT
+
+# Öncelikler: küçük sayı önce çalışır
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_MARKET_DATA = 2
+PRIORITY_CHART = 3
+PRIORITY_BACKGROUND = 4
+
+# Önceliğin kullanabileceği dakikalık bütçe oranı; kalan pay daha
+# öncelikli isteklere (emirler) ayrılmış olur
+PRIORITY_SHARES = {
+    PRIORITY_ORDER: 1.0,
+    PRIORITY_ACCOUNT: 0.9,
+    PRIORITY_MARKET_DATA: 0.8,
+    PRIORITY_CHART: 0.6,
+    PRIORITY_BACKGROUND: 0.5,
+}
+
+BAN_BACKOFF = 120  # 418 cevabında Retry-After yoksa bekleme (saniye)
+
+
+def _kline_weight(params):
+    limit = int(params.get('limit', 500))
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+# Yönetilen Client metotları: (varsayılan öncelik, ağırlık, birleştirilir mi)
+ENDPOINTS = {
+    'create_order': (PRIORITY_ORDER, 1, False),
+    'get_account': (PRIORITY_ACCOUNT, 20, True),
+    'get_asset_balance': (PRIORITY_ACCOUNT, 20, True),
+    'get_exchange_info': (PRIORITY_ACCOUNT, 20, True),
+    'get_symbol_info': (PRIORITY_ACCOUNT, 20, True),
+    'get_klines': (PRIORITY_MARKET_DATA, _kline_weight, True),
+    'get_ticker': (PRIORITY_MARKET_DATA,
+                   lambda params: 2 if 'symbol' in params else 80, True),
+    'get_symbol_ticker': (PRIORITY_MARKET_DATA,
+                          lambda params: 2 if 'symbol' in params else 4, True),
+    'get_server_time': (PRIORITY_MARKET_DATA, 1, True),
+    'ping': (PRIORITY_MARKET_DATA, 1, True),
+}
+
+_local = threading.local()
+
+
+@contextmanager
+def request_priority(priority):
+    """Bu thread'deki isteklerin önceliğini geçici olarak değiştir
+
+    Örn. GUI worker'ı grafik verisini PRIORITY_CHART ile çeker. Emirler
+    her zaman PRIORITY_ORDER ile çalışır.
+    """
+    previous = getattr(_local, 'priority', None)
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def _freeze(params):
+    return tuple(sorted((key, repr(value)) for key, value in params.items()))
+
+
+class _Call:
+    """Geçitteki bir isteğin önceliği, sıra bileti ve sonucu
+
+    Birleştirilen isteklerde tüm bekleyenler aynı _Call'ı paylaşır; daha
+    öncelikli biri katılınca bilet sıradayken yükseltilir.
+    """
+
+    __slots__ = ('priority', 'ticket', 'future')
+
+    def __init__(self, priority, future=None):
+        self.priority = priority
+        self.ticket = None  # Sıradayken [öncelik, sıra]
+        self.future = future
+
+
+def _resolve(name, params):
+    """Çağrının (öncelik, ağırlık, birleştirilir mi) değerleri"""
+    default, weight, coalesce = ENDPOINTS[name]
+    priority = getattr(_local, 'priority', None)
+    if priority is None or default == PRIORITY_ORDER:
+        priority = default
+    if callable(weight):
+        weight = weight(params)
+    return priority, weight, coalesce
+
+
+class RestGateway:
+    """Client önünde rate limit, bağlantı havuzu ve istek birleştirme katmanı
+
+    Client gibi kullanılır: ENDPOINTS'teki metotlar geçitten geçer, diğer
+    her şey doğrudan client'a iletilir.
+
+    - Aynı anda gelen aynı istekler (metot + parametreler) tek bir REST
+      çağrısını paylaşır; sonuç nesnesi tüm bekleyenlere aynen döner.
+      Sırada bekleyen isteğe daha öncelikli biri katılırsa istek o
+      önceliğe yükseltilir.
+    - Dakikalık kullanılan ağırlık yerel tahmin ve X-MBX-USED-WEIGHT-1M
+      başlığıyla izlenir. Her öncelik bütçenin PRIORITY_SHARES kadarını
+      kullanabilir; bütçe dolunca istekler öncelik sırasıyla bir sonraki
+      dakikayı bekler.
+    - Aynı anda en fazla pool_size istek çalışır; client'ın requests
+      oturumu aynı boyutta keep-alive havuzuyla kurulur.
+    - 429'da tüm geçit Retry-After (yoksa üstel artan süre) kadar durur
+      ve istek max_retries kez tekrarlanır. 418'de (IP banı) ban bitene
+      kadar tüm istekler beklemeden hata verir.
+    """
+
+    def __init__(self, client, weight_limit=GATEWAY_WEIGHT_LIMIT,
+                 pool_size=GATEWAY_POOL_SIZE, max_retries=GATEWAY_MAX_RETRIES):
+        self.client = client
+        self.weight_limit = weight_limit
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.stats = {
+            'requests': 0, 'coalesced': 0, 'promoted': 0, 'throttled': 0,
+            'retries': 0, 'rate_limited': 0, 'banned': 0, 'used_weight': 0
+        }
+
+        self._cond = threading.Condition()
+        self._waiting = []  # [öncelik, sıra] biletlerinin heap'i
+        self._seq = itertools.count()
+        self._active = 0
+        self._reserved = 0  # Çalışan isteklerin ağırlığı
+        self._minute = None
+        self._used = 0
+        self._paused_until = 0.0
+        self._banned_until = 0.0
+
+        self._calls = {}  # (metot, parametreler) -> _Call
+        self._calls_lock = threading.Lock()
+        self._responses = threading.local()
+
+        session = getattr(client, 'session', None)
+        if session is not None:
+            adapter = HTTPAdapter(pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.hooks['response'].append(self._on_response)
+
+    def __getattr__(self, name):
+        client = self.__dict__.get('client')
+        if client is None:
+            raise AttributeError(name)
+        if name in ENDPOINTS:
+            return functools.partial(self.request, name)
+        return getattr(client, name)
+
+    def wrap_async(self, client):
+        """AsyncClient'ı bu geçidin bütçesini paylaşan bir geçide sar"""
+        return AsyncRestGateway(client, self)
+
+    @property
+    def used_weight(self):
+        with self._cond:
+            self._roll(time.time())
+            return self._used
+
+    # --- İstek ---
+
+    def request(self, name, **params):
+        """Yönetilen bir Client metodunu geçit üzerinden çağır"""
+        priority, weight, coalesce = _resolve(name, params)
+        if not coalesce:
+            return self._call(name, params, _Call(priority), weight)
+
+        key = (name, _freeze(params))
+        with self._calls_lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(priority, Future())
+            else:
+                self.stats['coalesced'] += 1
+        if not leader:
+            self._promote(call, priority)
+            return call.future.result()
+
+        try:
+            result = self._call(name, params, call, weight)
+        except Exception as e:
+            with self._calls_lock:
+                del self._calls[key]
+            call.future.set_exception(e)
+            raise
+        with self._calls_lock:
+            del self._calls[key]
+        call.future.set_result(result)
+        return result
+
+    def _call(self, name, params, call, weight):
+        method = getattr(self.client, name)
+        for attempt in itertools.count():
+            self._acquire(call, weight)
+            self._responses.last = None
+            try:
+                return method(**params)
+            except BinanceAPIException as e:
+                if e.status_code not in (418, 429):
+                    raise
+                self._rate_limited(e.status_code, e.response, attempt)
+                if e.status_code == 418 or attempt >= self.max_retries:
+                    raise
+                self.stats['retries'] += 1
+            finally:
+                self._release(weight, self._responses.last)
+
+    def _on_response(self, response, *args, **kwargs):
+        # requests oturum kancası: cevabı isteği yapan thread'e bırak
+        self._responses.last = response
+
+    # --- Bütçe ---
+
+    def _roll(self, now):
+        minute = int(now // 60)
+        if minute != self._minute:
+            self._minute = minute
+            self._used = 0
+
+    def _check_ban(self, now):
+        if self._banned_until > now:
+            until = time.strftime('%H:%M:%S', time.localtime(self._banned_until))
+            raise BinanceAPIException(None, 418, json.dumps({
+                'code': -1003, 'msg': f'IP banned until {until}'
+            }))
+
+    def _admission_delay(self, ticket, weight, now):
+        """0: hemen çalış, sayı: bu kadar bekle, None: bildirim bekle"""
+        if self._paused_until > now:
+            return self._paused_until - now
+        if self._waiting[0] is not ticket or self._active >= self.pool_size:
+            return None
+        self._roll(now)
+        used = self._used + self._reserved
+        budget = self.weight_limit * PRIORITY_SHARES[ticket[0]]
+        # Bütçeden ağır tek istek boş bir dakikada yine de çalışabilir
+        if used and used + weight > budget:
+            return 60 - now % 60
+        return 0
+
+    def _acquire(self, call, weight):
+        throttled = False
+        with self._cond:
+            ticket = call.ticket = [call.priority, next(self._seq)]
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.time()
+                    self._check_ban(now)
+                    delay = self._admission_delay(ticket, weight, now)
+                    if delay == 0:
+                        break
+                    throttled = throttled or delay is not None
+                    self._cond.wait(delay)
+            finally:
+                call.ticket = None
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+            self._active += 1
+            self._reserved += weight
+            self.stats['requests'] += 1
+            if throttled:
+                self.stats['throttled'] += 1
+
+    def _promote(self, call, priority):
+        """Birleştirilen isteği katılanın önceliğine yükselt"""
+        with self._cond:
+            if priority >= call.priority:
+                return
+            call.priority = priority
+            self.stats['promoted'] += 1
+            if call.ticket is not None:
+                call.ticket[0] = priority
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def _release(self, weight, response):
+        reported = None
+        if response is not None:
+            header = response.headers.get('X-MBX-USED-WEIGHT-1M')
+            if header:
+                reported = int(header)
+        with self._cond:
+            self._active -= 1
+            self._reserved -= weight
+            self._roll(time.time())
+            self._used += weight
+            if reported is not None:
+                self._used = max(self._used, reported)
+            self.stats['used_weight'] = self._used
+            self._cond.notify_all()
+
+    def _rate_limited(self, status, response, attempt):
+        retry_after = None
+        if response is not None and response.headers.get('Retry-After'):
+            retry_after = float(response.headers['Retry-After'])
+        now = time.time()
+        with self._cond:
+            if status == 418:
+                self._banned_until = max(
+                    self._banned_until, now + (retry_after or BAN_BACKOFF)
+                )
+                self.stats['banned'] += 1
+            else:
+                if retry_after is None:
+                    retry_after = min(2 ** attempt, 60)
+                self._paused_until = max(self._paused_until, now + retry_after)
+                self.stats['rate_limited'] += 1
+            self._cond.notify_all()
+
+
+class AsyncRestGateway:
+    """AsyncClient için RestGateway eşi
+
+    Ağırlık bütçesi, öncelik sırası, 429 duraklaması ve 418 banı sarılan
+    RestGateway ile ortaktır: senkron bot ve async motor aynı IP
+    limitini birlikte kullanır. Sıra beklemesi event loop'u bloklamamak
+    için thread havuzunda yapılır; aynı istekler asyncio Future'ı
+    üzerinden birleştirilir.
+    """
+
+    def __init__(self, client, gateway):
+        self.client = client
+        self.gateway = gateway
+        self._calls = {}  # (metot, parametreler) -> _Call
+
+    def __getattr__(self, name):
+        client = self.__dict__.get('client')
+        if client is None:
+            raise AttributeError(name)
+        if name in ENDPOINTS:
+            return functools.partial(self.request, name)
+        return getattr(client, name)
+
+    async def request(self, name, **params):
+        """Yönetilen bir AsyncClient metodunu geçit üzerinden çağır"""
+        priority, weight, coalesce = _resolve(name, params)
+        if not coalesce:
+            return await self._call(name, params, _Call(priority), weight)
+
+        gateway = self.gateway
+        key = (name, _freeze(params))
+        call = self._calls.get(key)
+        if call is not None:
+            with gateway._calls_lock:
+                gateway.stats['coalesced'] += 1
+            gateway._promote(call, priority)
+            return await asyncio.shield(call.future)
+
+        call = self._calls[key] = _Call(
+            priority, asyncio.get_running_loop().create_future()
+        )
+        try:
+            result = await self._call(name, params, call, weight)
+        except asyncio.CancelledError:
+            del self._calls[key]
+            call.future.cancel()
+            raise
+        except Exception as e:
+            del self._calls[key]
+            call.future.set_exception(e)
+            call.future.exception()  # Bekleyen yoksa uyarı basılmasın
+            raise
+        del self._calls[key]
+        call.future.set_result(result)
+        return result
+
+    async def _call(self, name, params, call, weight):
+        gateway = self.gateway
+        method = getattr(self.client, name)
+        for attempt in itertools.count():
+            await self._acquire(call, weight)
+            response = None
+            try:
+                result = await method(**params)
+                # Eşzamanlı isteklerde başka bir isteğin cevabı olabilir;
+                # kullanılan ağırlık için yine geçerli bir alt sınırdır
+                response = getattr(self.client, 'response', None)
+                return result
+            except BinanceAPIException as e:
+                response = e.response
+                if e.status_code not in (418, 429):
+                    raise
+                gateway._rate_limited(e.status_code, e.response, attempt)
+                if e.status_code == 418 or attempt >= gateway.max_retries:
+                    raise
+                gateway.stats['retries'] += 1
+            finally:
+                gateway._release(weight, response)
+
+    async def _acquire(self, call, weight):
+        loop = asyncio.get_running_loop()
+        admitted = loop.run_in_executor(None, self.gateway._acquire,
+                                        call, weight)
+        try:
+            await asyncio.shield(admitted)
+        except asyncio.CancelledError:
+            # Bekleme thread'de sürer; yer alınırsa hemen geri ver
+            def release(future):
+                if not future.cancelled() and future.exception() is None:
+                    self.gateway._release(weight, None)
+            admitted.add_done_callback(release)
+            raise
@@ -6,27 +6,29 @@ from PyQt6.QtGui import *
 from PyQt6.QtCharts import *
 import sys
 import threading
+import numpy as np
 
 from bot import CryptoTradingBot
 from config import *
+from utils import bucket_downsample
+from trade_table import TradeTableModel, TradeSortFilterProxyModel
+from data_worker import MarketDataWorker
 
 class TradingBotGUI(QMainWindow):
-    def closeEvent(self, event):
-        """Program kapatıldığında"""
-        self.bot.save_current_state()  # Durumu kaydet
-        self.bot.stop()
-        event.accept()
-
-
     def __init__(self):
         super().__init__()
         self.bot = CryptoTradingBot()
-        self.bot.on_trade_callback = self.handle_trade
-        self.bot.on_error_callback = self.handle_error
+        
+        # Ağ erişimi worker thread'inde, GUI sadece sinyallerle gelen
+        # veriyi çizer
+        self.worker = MarketDataWorker(self.bot)
+        self.worker.snapshot_ready.connect(self.render_snapshot)
+        self.worker.coins_ready.connect(self.populate_coin_list)
+        self.worker.trade_executed.connect(self.update_ui)
+        self.worker.error_occurred.connect(self.show_error)
         
         self.init_ui()
-        self.update_signal.connect(self.update_ui)
-        self.error_signal.connect(self.show_error)
+        self.worker.start()
 
     def init_ui(self):
         """Ana arayüzü oluştur"""
@@ -56,8 +58,7 @@ class TradingBotGUI(QMainWindow):
         layout.addLayout(top_panel)
 
         # Grafik
-        self.chart_view = QChartView()
-        self.chart_view.setMinimumHeight(400)
+        self.init_chart()
         layout.addWidget(self.chart_view)
 
         # Alt panel
@@ -84,72 +85,152 @@ class TradingBotGUI(QMainWindow):
         history_group = QGroupBox('Trade History')
         history_layout = QVBoxLayout()
         
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(5)
-        self.history_table.setHorizontalHeaderLabels([
-            'Time', 'Symbol', 'Side', 'Quantity', 'Price'
-        ])
+        self.history_filter = QLineEdit()
+        self.history_filter.setPlaceholderText('Filter by symbol...')
+        
+        # Tablo defteri doğrudan okur, sıralama/filtre proxy üzerinden
+        self.trade_model = TradeTableModel(self.bot.trading_history, self)
+        self.history_proxy = TradeSortFilterProxyModel(self)
+        self.history_proxy.setSourceModel(self.trade_model)
+        self.history_filter.textChanged.connect(
+            self.history_proxy.setFilterFixedString
+        )
+        
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_proxy)
+        self.history_table.setSortingEnabled(True)
+        self.history_table.sortByColumn(0, Qt.SortOrder.DescendingOrder)
+        self.history_table.verticalHeader().setVisible(False)
+        self.history_table.horizontalHeader().setStretchLastSection(True)
         
+        history_layout.addWidget(self.history_filter)
         history_layout.addWidget(self.history_table)
         history_group.setLayout(history_layout)
         bottom_panel.addWidget(history_group)
 
         layout.addLayout(bottom_panel)
 
-        # Timer
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_data)
-        self.update_timer.start(5000)
-
-    def update_chart(self, df):
-        """Grafikleri güncelle"""
-        chart = QChart()
+    def init_chart(self):
+        """Grafiği, serileri ve eksenleri bir kez oluştur"""
+        self.chart = QChart()
+        self.chart_view = QChartView(self.chart)
+        self.chart_view.setMinimumHeight(400)
         
-        # Fiyat serisi
-        price_series = QLineSeries()
-        price_series.setName("Price")
+        self.price_series = QLineSeries()
+        self.price_series.setName("Price")
+        self.rsi_series = QLineSeries()
+        self.rsi_series.setName("RSI")
+        self.macd_series = QLineSeries()
+        self.macd_series.setName("MACD")
         
-        # RSI serisi
-        rsi_series = QLineSeries()
-        rsi_series.setName("RSI")
+        self.axis_x = QDateTimeAxis()
+        self.axis_x.setFormat("HH:mm:ss")
+        self.chart.addAxis(self.axis_x, Qt.AlignmentFlag.AlignBottom)
         
-        # MACD serisi
-        macd_series = QLineSeries()
-        macd_series.setName("MACD")
+        # Fiyat solda, RSI (0-100) ve MACD sağda kendi eksenlerinde
+        self.price_axis = QValueAxis()
+        self.rsi_axis = QValueAxis()
+        self.rsi_axis.setRange(0, 100)
+        self.macd_axis = QValueAxis()
+        self.chart.addAxis(self.price_axis, Qt.AlignmentFlag.AlignLeft)
+        self.chart.addAxis(self.rsi_axis, Qt.AlignmentFlag.AlignRight)
+        self.chart.addAxis(self.macd_axis, Qt.AlignmentFlag.AlignRight)
         
-        # Verileri ekle
-        for index, row in df.iterrows():
-            ms = int(index.timestamp() * 1000)
-            price_series.append(ms, row['close'])
-            rsi_series.append(ms, row['RSI'])
-            macd_series.append(ms, row['MACD'])
+        for series, axis_y in ((self.price_series, self.price_axis),
+                               (self.rsi_series, self.rsi_axis),
+                               (self.macd_series, self.macd_axis)):
+            self.chart.addSeries(series)
+            series.attachAxis(self.axis_x)
+            series.attachAxis(axis_y)
         
-        chart.addSeries(price_series)
-        chart.addSeries(rsi_series)
-        chart.addSeries(macd_series)
+        self._chart_symbol = None
+        self._plotted = {}  # seri -> (çizilen x, çizilen y)
+
+    def _sync_series(self, series, x, y):
+        """Seriyi yeni noktalarla eşitle (mümkünse sadece değişen kısım)
+
+        QtCharts her değişiklik çağrısında serinin geometrisini baştan
+        hesaplar; bu yüzden tek çağrıyla yapılabilen değişiklikler (canlı
+        mumun düzeltilmesi, yeni mum, baştan düşen mumlar) artımlı yazılır,
+        birden fazla çağrı gerekecekse seri tek replace ile yenilenir.
+        """
+        old = self._plotted.get(series)
+        self._plotted[series] = (x, y)
         
-        # Eksenleri ayarla
-        axis_x = QDateTimeAxis()
-        axis_x.setFormat("HH:mm:ss")
-        chart.addAxis(axis_x, Qt.AlignmentFlag.AlignBottom)
+        if old is not None and len(x):
+            old_x, old_y = old
+            dropped = int(old_x.searchsorted(x[0]))
+            count = min(len(old_x) - dropped, len(x))
+            same_x = old_x[dropped:dropped + count] == x[:count]
+            kept = count if same_x.all() else int(same_x.argmin())
+            changed = np.flatnonzero(old_y[dropped:dropped + kept] != y[:kept])
+            stale = len(old_x) - dropped - kept
+            edits = ((dropped > 0) + len(changed) + (stale > 0)
+                     + (kept < len(x)))
+            if kept and edits == 1:
+                if dropped:
+                    series.removePoints(0, dropped)
+                elif len(changed):
+                    i = int(changed[0])
+                    series.replace(i, QPointF(x[i], y[i]))
+                elif stale:
+                    series.removePoints(kept, stale)
+                else:
+                    series.append([
+                        QPointF(a, b) for a, b in
+                        zip(x[kept:].tolist(), y[kept:].tolist())
+                    ])
+                return
+            if not edits:
+                return
+        
+        series.replace([QPointF(a, b) for a, b in zip(x.tolist(), y.tolist())])
+
+    def _plot(self, series, x, y, budget):
+        """NaN'ları at, gerekirse küçült ve seriye yaz
+
+        Kovalar zamana sabit olduğu için yeni tick veya mum sadece serinin
+        sonunu, pencerenin kayması sadece başını değiştirir.
+        """
+        valid = ~np.isnan(y)
+        x, y = x[valid], y[valid]
+        if len(x) > budget:
+            keep = bucket_downsample(x, y, budget)
+            x, y = x[keep], y[keep]
+        self._sync_series(series, x, y)
+        return y
+
+    def update_chart(self, df):
+        """Grafikleri güncelle (sadece yeni/değişen mumlar çizilir)"""
+        if df is None or df.empty:
+            return
+        if self._chart_symbol != self.bot.current_coin:
+            self._chart_symbol = self.bot.current_coin
+            self._plotted.clear()
         
-        axis_y = QValueAxis()
-        chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
+        x = df.index.values.astype('datetime64[ms]').astype(np.int64)
+        x = x.astype(float)
+        budget = max(int(self.chart_view.width() * CHART_POINTS_PER_PIXEL), 100)
         
-        price_series.attachAxis(axis_x)
-        price_series.attachAxis(axis_y)
-        rsi_series.attachAxis(axis_x)
-        rsi_series.attachAxis(axis_y)
-        macd_series.attachAxis(axis_x)
-        macd_series.attachAxis(axis_y)
+        price = self._plot(self.price_series, x, df['close'].values, budget)
+        self._plot(self.rsi_series, x, df['RSI'].values, budget)
+        macd = self._plot(self.macd_series, x, df['MACD'].values, budget)
         
-        self.chart_view.setChart(chart)
+        self.axis_x.setRange(QDateTime.fromMSecsSinceEpoch(int(x[0])),
+                             QDateTime.fromMSecsSinceEpoch(int(x[-1])))
+        if len(price):
+            self.price_axis.setRange(price.min(), price.max())
+        if len(macd):
+            self.macd_axis.setRange(macd.min(), macd.max())
 
 
     def update_coin_list(self):
+        """Coin listesini worker'dan iste (sonuç coins_ready ile gelir)"""
+        self.worker.coins_requested.emit()
+
+    def populate_coin_list(self, viable_coins):
         """Coin listesini güncelle"""
         self.coin_combo.clear()
-        viable_coins = self.bot.get_viable_coins()
         for coin in viable_coins:
             self.coin_combo.addItem(coin['symbol'])
 
@@ -163,19 +244,13 @@ class TradingBotGUI(QMainWindow):
             self.toggle_button.setText('Stop Bot')
 
     def update_history_table(self):
-        """İşlem geçmişini güncelle"""
-        self.history_table.setRowCount(len(self.bot.trading_history))
-        
-        for i, trade in enumerate(self.bot.trading_history):
-            self.history_table.setItem(i, 0, QTableWidgetItem(str(trade['timestamp'])))
-            self.history_table.setItem(i, 1, QTableWidgetItem(trade['symbol']))
-            self.history_table.setItem(i, 2, QTableWidgetItem(trade['side']))
-            self.history_table.setItem(i, 3, QTableWidgetItem(str(trade['quantity'])))
-            self.history_table.setItem(i, 4, QTableWidgetItem(str(trade['price'])))
+        """İşlem geçmişini güncelle (sadece yeni işlemler eklenir)"""
+        self.trade_model.refresh()
 
-    def update_metrics(self):
+    def update_metrics(self, metrics=None):
         """Performans metriklerini güncelle"""
-        metrics = self.bot.get_performance_metrics()
+        if metrics is None:
+            metrics = self.bot.get_performance_metrics()
         
         self.balance_label.setText(f"Balance: {metrics['current_balance']:.2f} USDT")
         self.profit_label.setText(f"Total Profit: {metrics['total_profit']:.2f} USDT")
@@ -183,23 +258,22 @@ class TradingBotGUI(QMainWindow):
         self.win_rate_label.setText(f"Win Rate: {metrics['win_rate']:.1f}%")
 
     def update_data(self):
-        """Tüm verileri güncelle"""
-        if self.bot.current_coin:
-            df = self.bot.get_historical_data(self.bot.current_coin)
-            if df is not None:
-                self.update_chart(df)
+        """Worker'dan yeni veri iste (GUI thread'i beklemez)"""
+        self.worker.refresh_requested.emit()
+
+    def render_snapshot(self):
+        """Worker'ın hazırladığı en son görüntüyü çiz"""
+        snapshot = self.worker.take_snapshot()
+        if snapshot is None:
+            return  # Bu sinyalin görüntüsü zaten daha önce çizildi
         
-        self.update_metrics()
+        # Coin bu arada değiştiyse eski coinin mumlarını çizme
+        if (snapshot['frame'] is not None
+                and snapshot['symbol'] == self.bot.current_coin):
+            self.update_chart(snapshot['frame'])
+        self.update_metrics(snapshot['metrics'])
         self.update_history_table()
 
-    def handle_trade(self, trade_info):
-        """Yeni işlem gerçekleştiğinde"""
-        self.update_signal.emit(trade_info)
-
-    def handle_error(self, error_message):
-        """Hata durumunda"""
-        self.error_signal.emit(error_message)
-
     def show_error(self, message):
         """Hata mesajını göster"""
         QMessageBox.critical(self, 'Error', message)
@@ -211,11 +285,14 @@ class TradingBotGUI(QMainWindow):
 
     def closeEvent(self, event):
         """Program kapatıldığında"""
+        self.worker.stop()
+        self.bot.save_current_state()  # Durumu kaydet
         self.bot.stop()
         event.accept()
 
     def update_ui(self, trade_info):
         """UI güncellemelerini yap"""
+        self.update_history_table()
         self.update_data()
         QMessageBox.information(
             self,
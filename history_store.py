@@ -0,0 +1,294 @@
+# history_store.py
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config import HISTORY_DIR, API_KEY, API_SECRET
+from kline_store import (
+    KLINE_COLUMNS, MAX_KLINE_LIMIT, interval_to_ms, parse_klines
+)
+from utils import calculate_technical_indicators
+
+# Diskteki kayıt formatı: mum başına 88 byte, sütunlar KLINE_COLUMNS sırasıyla
+KLINE_DTYPE = np.dtype([
+    (name, '<i8' if name in ('timestamp', 'close_time', 'trades') else '<f8')
+    for name in KLINE_COLUMNS
+])
+
+
+def to_records(rows):
+    """parse_klines float matrisini tipli kayıt dizisine çevir"""
+    records = np.empty(len(rows), dtype=KLINE_DTYPE)
+    for i, name in enumerate(KLINE_COLUMNS):
+        records[name] = rows[:, i]
+    return records
+
+
+def to_matrix(records):
+    """Kayıt dizisini KlineStore'un float matrisine çevir"""
+    return np.column_stack(
+        [records[name] for name in KLINE_COLUMNS]
+    ).astype(float)
+
+
+def month_of(timestamp_ms):
+    return str(np.datetime64(int(timestamp_ms), 'ms').astype('datetime64[M]'))
+
+
+class HistoryStore:
+    """Mum geçmişini sembol/periyot/ay bölümlü ikili dosyalarda tutar
+
+        <root>/<symbol>/<interval>/2024-01.bin
+
+    Her dosya KLINE_DTYPE kayıtlarının ardışık dizisidir; sadece sona
+    eklenir ve np.memmap ile kopyasız okunur. Yarım yazılmış son kayıt
+    (indirme sırasında çökme) bir sonraki eklemede kesilip atılır.
+    """
+
+    def __init__(self, root=HISTORY_DIR):
+        self.root = root
+
+    def _dir(self, symbol, interval):
+        return os.path.join(self.root, symbol, interval)
+
+    def _path(self, symbol, interval, month):
+        return os.path.join(self._dir(symbol, interval), f"{month}.bin")
+
+    def months(self, symbol, interval):
+        """Kayıtlı ayları sıralı döndür"""
+        directory = self._dir(symbol, interval)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            name[:-4] for name in os.listdir(directory) if name.endswith('.bin')
+        )
+
+    def _open(self, symbol, interval, month):
+        path = self._path(symbol, interval, month)
+        count = os.path.getsize(path) // KLINE_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        return np.memmap(path, dtype=KLINE_DTYPE, mode='r', shape=(count,))
+
+    def last_timestamp(self, symbol, interval):
+        """Son kayıtlı mumun açılış zamanı (yoksa None)"""
+        for month in reversed(self.months(symbol, interval)):
+            records = self._open(symbol, interval, month)
+            if len(records):
+                return int(records['timestamp'][-1])
+        return None
+
+    def append(self, symbol, interval, records):
+        """Kayıtları ilgili ay dosyalarının sonuna ekle, eklenen sayıyı döndür"""
+        last = self.last_timestamp(symbol, interval)
+        if last is not None:
+            records = records[records['timestamp'] > last]
+        if not len(records):
+            return 0
+
+        os.makedirs(self._dir(symbol, interval), exist_ok=True)
+        months = records['timestamp'].astype('datetime64[ms]').astype(
+            'datetime64[M]')
+        bounds = np.flatnonzero(months[1:] != months[:-1]) + 1
+        for part in np.split(records, bounds):
+            path = self._path(symbol, interval, month_of(part['timestamp'][0]))
+            with open(path, 'ab') as f:
+                size = f.tell()
+                if size % KLINE_DTYPE.itemsize:
+                    f.truncate(size - size % KLINE_DTYPE.itemsize)
+                f.write(part.tobytes())
+        return len(records)
+
+    def partitions(self, symbol, interval, start=None, end=None):
+        """[start, end) aralığındaki kayıtları ay ay kopyasız görünüm olarak ver"""
+        start_ms = None if start is None else _to_ms(start)
+        end_ms = None if end is None else _to_ms(end)
+        for month in self.months(symbol, interval):
+            records = self._open(symbol, interval, month)
+            if not len(records):
+                continue
+            timestamps = records['timestamp']
+            lo = 0 if start_ms is None else timestamps.searchsorted(start_ms)
+            hi = (len(records) if end_ms is None
+                  else timestamps.searchsorted(end_ms))
+            if lo < hi:
+                yield records[lo:hi]
+
+    def read(self, symbol, interval, start=None, end=None):
+        """Aralığın kayıtları (tek aya düşüyorsa kopyasız memmap görünümü)"""
+        parts = list(self.partitions(symbol, interval, start, end))
+        if not parts:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def tail(self, symbol, interval, count):
+        """Son count mumu KlineStore matrisi olarak döndür
+
+        Ay dosyalarının memmap görünümleri doğrudan sonuç matrisine yazılır;
+        araya birleştirilmiş kayıt dizisi kopyası girmez.
+        """
+        parts = []
+        needed = count
+        for month in reversed(self.months(symbol, interval)):
+            records = self._open(symbol, interval, month)
+            parts.append(records[max(len(records) - needed, 0):])
+            needed -= len(parts[-1])
+            if needed <= 0:
+                break
+
+        out = np.empty((sum(map(len, parts)), len(KLINE_COLUMNS)))
+        row = 0
+        for part in reversed(parts):
+            for i, name in enumerate(KLINE_COLUMNS):
+                out[row:row + len(part), i] = part[name]
+            row += len(part)
+        return out
+
+    @staticmethod
+    def _frame(records):
+        df = pd.DataFrame({name: records[name] for name in KLINE_COLUMNS[1:]})
+        df.index = pd.to_datetime(records['timestamp'], unit='ms')
+        df.index.name = 'timestamp'
+        return df
+
+    def load_frame(self, symbol, interval, start=None, end=None):
+        """Aralığı indikatörlerle birlikte DataFrame olarak yükle (backtest)"""
+        df = self._frame(self.read(symbol, interval, start, end))
+        return calculate_technical_indicators(df)
+
+    def chunk_factory(self, symbol, interval, start=None, end=None,
+                      warmup=500):
+        """PricePredictionModel.train_streaming için ay ay DataFrame üreteci
+
+        Her aya önceki ayın son warmup mumu eklenerek indikatörler
+        hesaplanır ve sonra atılır; EWM etkisi warmup boyunca sönümlendiği
+        için sonuç tüm geçmişin tek seferde hesaplanmasıyla aynıdır.
+        """
+        def factory():
+            tail = None
+            for part in self.partitions(symbol, interval, start, end):
+                records = part if tail is None else np.concatenate((tail, part))
+                df = calculate_technical_indicators(self._frame(records))
+                yield df.iloc[len(records) - len(part):]
+                tail = records[-warmup:]
+        return factory
+
+
+def _to_ms(value):
+    """datetime, 'YYYY-MM-DD' veya ms değerini ms'ye çevir"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).value // 1_000_000)
+
+
+class HistoryDownloader:
+    """Binance'ten mum geçmişini sayfalayarak HistoryStore'a indirir
+
+    Her sembol/periyot için son kayıtlı mumdan devam eder; yarıda kalan
+    bir indirme tekrar çalıştırıldığında kaldığı yerden sürer. Sadece
+    kapanmış mumlar kaydedilir.
+    """
+
+    def __init__(self, client, store, limit=MAX_KLINE_LIMIT):
+        self.client = client
+        self.store = store
+        self.limit = limit
+
+    def download(self, symbol, interval, start, end=None, progress=None):
+        """[start, end) aralığını indir, eklenen mum sayısını döndür"""
+        step = interval_to_ms(interval)
+        end_ms = int(time.time() * 1000) if end is None else _to_ms(end)
+        last = self.store.last_timestamp(symbol, interval)
+        start_ms = _to_ms(start) if last is None else max(
+            _to_ms(start), last + step)
+
+        added = 0
+        while start_ms < end_ms:
+            klines = self.client.get_klines(
+                symbol=symbol, interval=interval, startTime=start_ms,
+                endTime=end_ms - 1, limit=self.limit
+            )
+            if not klines:
+                break
+            records = to_records(parse_klines(klines))
+            # Henüz kapanmamış mum kaydedilmez (bir sonraki çalıştırmada gelir)
+            now_ms = int(time.time() * 1000)
+            closed = records[records['close_time'] < now_ms]
+            added += self.store.append(symbol, interval, closed)
+            if len(closed) < len(records) or len(klines) < self.limit:
+                break
+            start_ms = int(records['timestamp'][-1]) + step
+            if progress:
+                progress(symbol, interval, start_ms, added)
+        return added
+
+    def download_many(self, symbols, intervals, start, end=None,
+                      progress=None):
+        """Tüm sembol/periyot kombinasyonlarını sırayla indir"""
+        results = {}
+        for symbol in symbols:
+            for interval in intervals:
+                results[(symbol, interval)] = self.download(
+                    symbol, interval, start, end, progress
+                )
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Mum geçmişini indir ve yerel depoda sakla'
+    )
+    parser.add_argument('--root', default=HISTORY_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    download = subparsers.add_parser('download', help='Geçmişi indir/devam et')
+    download.add_argument('--symbols', nargs='+', required=True)
+    download.add_argument('--intervals', nargs='+', default=['1h'])
+    download.add_argument('--start', required=True, help='YYYY-MM-DD')
+    download.add_argument('--end', default=None, help='YYYY-MM-DD')
+
+    info = subparsers.add_parser('info', help='Kayıtlı aralıkları göster')
+    info.add_argument('--symbols', nargs='+', required=True)
+    info.add_argument('--intervals', nargs='+', default=['1h'])
+
+    args = parser.parse_args()
+    store = HistoryStore(args.root)
+
+    if args.command == 'download':
+        from binance.client import Client
+
+        def progress(symbol, interval, start_ms, added):
+            print(f"\r{symbol} {interval}: {added} candles, "
+                  f"{datetime.fromtimestamp(start_ms / 1000):%Y-%m-%d %H:%M}",
+                  end='', flush=True)
+
+        downloader = HistoryDownloader(Client(API_KEY, API_SECRET), store)
+        for symbol in args.symbols:
+            for interval in args.intervals:
+                added = downloader.download(symbol, interval, args.start,
+                                            args.end, progress)
+                print(f"\r{symbol} {interval}: {added} new candles")
+    else:
+        for symbol in args.symbols:
+            for interval in args.intervals:
+                months = store.months(symbol, interval)
+                records = list(store.partitions(symbol, interval))
+                count = sum(len(r) for r in records)
+                if not count:
+                    print(f"{symbol} {interval}: empty")
+                    continue
+                first = records[0]['timestamp'][0]
+                last = records[-1]['timestamp'][-1]
+                print(f"{symbol} {interval}: {count} candles in "
+                      f"{len(months)} months, "
+                      f"{np.datetime64(int(first), 'ms')} - "
+                      f"{np.datetime64(int(last), 'ms')}")
+
+
+if __name__ == '__main__':
+    main()
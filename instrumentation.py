@@ -0,0 +1,428 @@
+# instrumentation.py
+
+import bisect
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+from urllib.parse import urlparse
+
+from config import (
+    INSTRUMENTATION_ENABLED, METRICS_HOST, METRICS_PORT, METRICS_FILE,
+    METRICS_FILE_INTERVAL, METRICS_FILE_MAX_BYTES, METRICS_FILE_BACKUPS
+)
+
+# Aşama süreleri için histogram sınırları (saniye)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1., 2.5, 5., 10., 30.
+)
+
+STAGE_SECONDS = 'trading_stage_seconds'
+ERRORS_TOTAL = 'trading_errors_total'
+REST_REQUESTS_TOTAL = 'binance_requests_total'
+REST_USED_WEIGHT = 'binance_used_weight'
+
+HELP = {
+    STAGE_SECONDS: 'Duration of trading stages and REST calls',
+    ERRORS_TOTAL: 'Errors raised inside instrumented stages by type',
+    REST_REQUESTS_TOTAL: 'Binance REST requests by endpoint and status',
+    REST_USED_WEIGHT: 'Last X-MBX-USED-WEIGHT header reported by Binance',
+}
+
+
+class Histogram:
+    """Sabit sınırlı (Prometheus tarzı) gecikme histogramı"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count', 'max')
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Son kova: +Inf
+        self.sum = 0.
+        self.count = 0
+        self.max = 0.
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Kovalardan doğrusal aradeğerlemeyle yaklaşık yüzdelik"""
+        if not self.count:
+            return 0.
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.bounds[i - 1] if i else 0.
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count,
+                           self.max)
+            seen += count
+        return self.max
+
+
+class _NoopSpan:
+    """Ölçüm kapalıyken dönen, hiçbir şey yapmayan span"""
+
+    __slots__ = ()
+    elapsed = 0.
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('registry', 'key', 'start', 'elapsed')
+
+    def __init__(self, registry, key):
+        self.registry = registry
+        self.key = key
+        self.elapsed = 0.
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.perf_counter() - self.start
+        self.registry._observe(self.key, self.elapsed)
+        if exc_type is not None:
+            self.registry.increment(ERRORS_TOTAL, stage=self.key[1][0][1],
+                                    type=exc_type.__name__)
+        return False
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _escape_label(value):
+    # Prometheus metin formatı: \ , " ve satır sonu kaçışlanır
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(
+        f'{k}="{_escape_label(v)}"' for k, v in pairs
+    ) + '}'
+
+
+class Instrumentation:
+    """Aşama süreleri, sayaçlar ve göstergeler için süreç içi kayıt
+
+    span() monotonic saatle (perf_counter) süre ölçer ve aşamanın
+    histogramına yazar; aşama içinde hata olursa türüne göre sayılır.
+    Kapalıyken span() paylaşılan boş bir nesne döndürür, sayaç/gösterge
+    çağrıları hemen döner; ölçüm noktalarının maliyeti tek bir bayrak
+    kontrolüdür. Toplanan değerler Prometheus metin formatında HTTP'den
+    ve periyodik olarak dönen (rotating) JSON dosyasına yazılır.
+    """
+
+    def __init__(self, enabled=INSTRUMENTATION_ENABLED):
+        self.enabled = enabled
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._writer = None
+
+    def span(self, stage, **labels):
+        """with span('predict'): ... bloğunun süresini ölç"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        # Aşama adı her zaman ilk etiket (hata sayacı oradan okur)
+        key = (STAGE_SECONDS,
+               (('stage', stage),) + tuple(sorted(labels.items())))
+        return _Span(self, key)
+
+    def timed(self, stage):
+        """Fonksiyonun her çağrısını span(stage) içinde çalıştıran dekoratör"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _observe(self, key, value):
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def observe(self, stage, seconds, **labels):
+        """Dışarıda ölçülmüş bir süreyi aşamaya ekle"""
+        if self.enabled:
+            self._observe(self.span(stage, **labels).key, seconds)
+
+    def increment(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def snapshot(self):
+        """Tüm metriklerin JSON'a yazılabilir kopyası"""
+        with self._lock:
+            histograms = [
+                {'name': name, 'labels': dict(labels),
+                 'count': h.count, 'sum': h.sum, 'max': h.max,
+                 'p50': h.quantile(0.5), 'p90': h.quantile(0.9),
+                 'p99': h.quantile(0.99)}
+                for (name, labels), h in sorted(self._histograms.items())
+            ]
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            gauges = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._gauges.items())
+            ]
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'histograms': histograms,
+            'counters': counters,
+            'gauges': gauges
+        }
+
+    def prometheus_text(self):
+        """Prometheus metin formatı (0.0.4)"""
+        lines = []
+
+        def header(name, kind, written):
+            if name not in written:
+                written.add(name)
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        written = set()
+        with self._lock:
+            for (name, labels), h in sorted(self._histograms.items()):
+                header(name, 'histogram', written)
+                cumulative = 0
+                for bound, count in zip(h.bounds + ('+Inf',), h.counts):
+                    cumulative += count
+                    le = bound if bound == '+Inf' else repr(float(bound))
+                    lines.append(f"{name}_bucket"
+                                 f"{_format_labels(labels, [('le', le)])} "
+                                 f"{cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {h.sum!r}")
+                lines.append(f"{name}_count{_format_labels(labels)} {h.count}")
+            for (name, labels), value in sorted(self._counters.items()):
+                header(name, 'counter', written)
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+            for (name, labels), value in sorted(self._gauges.items()):
+                header(name, 'gauge', written)
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+    # --- Dışa aktarım ---
+
+    def start_exporters(self, port=METRICS_PORT, path=METRICS_FILE,
+                        interval=METRICS_FILE_INTERVAL, host=METRICS_HOST):
+        """Açıksa /metrics HTTP uç noktasını ve JSON yazıcısını başlat"""
+        if not self.enabled:
+            return
+        if port is not None and self._server is None:
+            self._server = MetricsServer(self, host=host, port=port)
+            self._server.start()
+        if path and self._writer is None:
+            self._writer = JsonMetricsWriter(self, path, interval)
+            self._writer.start()
+
+    def stop_exporters(self):
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
+        if self._writer is not None:
+            self._writer.stop()
+            self._writer = None
+
+
+class MetricsServer:
+    """GET /metrics ile Prometheus metin formatını sunan HTTP sunucusu"""
+
+    def __init__(self, registry, host=METRICS_HOST, port=METRICS_PORT):
+        self.registry = registry
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def _make_handler(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path == '/metrics':
+                    body = registry.prometheus_text().encode()
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif path == '/metrics.json':
+                    body = json.dumps(registry.snapshot()).encode()
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='metrics-http', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class JsonMetricsWriter:
+    """Anlık görüntüyü interval saniyede bir JSON satırı olarak yazar
+
+    Dosya max_bytes'ı aşınca metrics.jsonl.1, .2 ... olarak döndürülür,
+    en fazla backups eski dosya tutulur.
+    """
+
+    def __init__(self, registry, path=METRICS_FILE,
+                 interval=METRICS_FILE_INTERVAL,
+                 max_bytes=METRICS_FILE_MAX_BYTES, backups=METRICS_FILE_BACKUPS):
+        self.registry = registry
+        self.interval = interval
+        self._handler = RotatingFileHandler(path, maxBytes=max_bytes,
+                                            backupCount=backups)
+        self._handler.setFormatter(logging.Formatter('%(message)s'))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run,
+                                        name='metrics-writer', daemon=True)
+
+    def write(self):
+        record = logging.makeLogRecord(
+            {'msg': json.dumps(self.registry.snapshot())}
+        )
+        self._handler.emit(record)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.write()  # Kapanıştaki son durum
+        self._handler.close()
+
+
+def _endpoint(uri):
+    return urlparse(uri).path
+
+
+def _record_response(registry, endpoint, response):
+    status = getattr(response, 'status_code', None) or getattr(
+        response, 'status', None)
+    registry.increment(REST_REQUESTS_TOTAL, endpoint=endpoint,
+                       status=str(status))
+    headers = getattr(response, 'headers', None) or {}
+    for name, value in headers.items():
+        name = name.lower()
+        if name.startswith('x-mbx-used-weight-'):
+            registry.set_gauge(REST_USED_WEIGHT, float(value),
+                               interval=name[len('x-mbx-used-weight-'):])
+
+
+def instrument_client(client, registry=None):
+    """Client/AsyncClient'ın tüm REST çağrılarını ölç
+
+    Her istek uç noktasıyla birlikte 'rest' aşamasına yazılır, cevap
+    durum kodu sayılır ve X-MBX-USED-WEIGHT başlıkları gösterge olarak
+    tutulur. Ölçüm kapalıysa veya istemcide _request yoksa (ör.
+    SimulatedClient) istemci değiştirilmez.
+    """
+    registry = registry or instrumentation
+    request = getattr(client, '_request', None)
+    if not registry.enabled or request is None:
+        return client
+    if getattr(request, '_instrumented', False):
+        return client
+
+    if inspect.iscoroutinefunction(request):
+        async def wrapper(method, uri, signed, force_params=False, **kwargs):
+            endpoint = _endpoint(uri)
+            client.response = None  # Bağlantı hatasında eski cevap sayılmasın
+            try:
+                with registry.span('rest', endpoint=endpoint):
+                    return await request(method, uri, signed, force_params,
+                                         **kwargs)
+            finally:
+                _record_response(registry, endpoint,
+                                 getattr(client, 'response', None))
+    else:
+        def wrapper(method, uri, signed, force_params=False, **kwargs):
+            endpoint = _endpoint(uri)
+            client.response = None  # Bağlantı hatasında eski cevap sayılmasın
+            try:
+                with registry.span('rest', endpoint=endpoint):
+                    return request(method, uri, signed, force_params,
+                                   **kwargs)
+            finally:
+                _record_response(registry, endpoint,
+                                 getattr(client, 'response', None))
+
+    wrapper._instrumented = True
+    client._request = wrapper
+    return client
+
+
+# Süreç genelinde tek kayıt; modüller span/increment'i doğrudan kullanır
+instrumentation = Instrumentation()
+span = instrumentation.span
@@ -0,0 +1,262 @@
+# kline_store.py
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import KLINE_CACHE_SIZE
+from instrumentation import span
+from utils import IncrementalIndicators
+
+# Binance tek istekte en fazla 1000 mum döndürür
+MAX_KLINE_LIMIT = 1000
+
+# Saklanan sütunlar (Binance kline cevabının 'ignore' hariç ilk 11 alanı)
+KLINE_COLUMNS = [
+    'timestamp', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_volume', 'trades', 'taker_buy_base',
+    'taker_buy_quote'
+]
+
+# Tamponda mumların yanında tutulan indikatör sütunları
+INDICATOR_COLUMNS = ['RSI', 'MACD', 'Signal']
+BUFFER_COLUMNS = KLINE_COLUMNS + INDICATOR_COLUMNS
+
+INTERVAL_MS = {
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 3_600_000,
+    '2h': 2 * 3_600_000,
+    '4h': 4 * 3_600_000,
+    '6h': 6 * 3_600_000,
+    '8h': 8 * 3_600_000,
+    '12h': 12 * 3_600_000,
+    '1d': 86_400_000,
+    '3d': 3 * 86_400_000,
+    '1w': 7 * 86_400_000,
+    '1M': 30 * 86_400_000,  # Yaklaşık değer, sadece eksik mum tahmini için
+}
+
+
+def interval_to_ms(interval):
+    """Periyot string'ini milisaniyeye çevir"""
+    try:
+        return INTERVAL_MS[interval]
+    except KeyError:
+        raise ValueError(f"Unsupported interval: {interval}")
+
+
+def parse_klines(klines):
+    """Binance kline listesini float matrisine çevir"""
+    if not klines:
+        return np.empty((0, len(KLINE_COLUMNS)))
+    return np.array([k[:len(KLINE_COLUMNS)] for k in klines], dtype=float)
+
+
+class KlineBuffer:
+    """Tek bir (sembol, periyot) için sabit boyutlu halka tampon
+
+    Her mum eklendiğinde indikatörler artımlı olarak güncellenir ve
+    mumla aynı satıra yazılır.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = np.empty((capacity, len(BUFFER_COLUMNS)))
+        self.indicators = IncrementalIndicators()
+        self.start = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def _index(self, offset):
+        return (self.start + offset) % self.capacity
+
+    def last_row(self):
+        """En son mumu döndür"""
+        if self.count == 0:
+            return None
+        return self.data[self._index(self.count - 1)]
+
+    def clear(self):
+        self.start = 0
+        self.count = 0
+        self.indicators.reset()
+
+    def _with_indicators(self, rows):
+        out = np.empty((len(rows), len(BUFFER_COLUMNS)))
+        out[:, :len(KLINE_COLUMNS)] = rows
+        with span('indicators'):
+            for i, row in enumerate(rows):
+                out[i, len(KLINE_COLUMNS):] = self.indicators.update(
+                    row[0], row[4]
+                )
+        return out
+
+    def merge(self, rows):
+        """Yeni veya güncellenmiş mumları tampona ekle"""
+        last = self.last_row()
+        if last is not None:
+            # Eski mumları at, canlı mumu yerinde güncelle
+            rows = rows[rows[:, 0] >= last[0]]
+
+        rows = self._with_indicators(rows)
+        if last is not None and len(rows) and rows[0, 0] == last[0]:
+            last[:] = rows[0]
+            rows = rows[1:]
+
+        if len(rows) == 0:
+            return 0
+        if len(rows) >= self.capacity:
+            self.data[:] = rows[-self.capacity:]
+            self.start = 0
+            self.count = self.capacity
+            return len(rows)
+
+        # Halka tampona toplu yazım (gerekirse başa sar)
+        write_at = self._index(self.count)
+        first = min(len(rows), self.capacity - write_at)
+        self.data[write_at:write_at + first] = rows[:first]
+        self.data[:len(rows) - first] = rows[first:]
+
+        overflow = self.count + len(rows) - self.capacity
+        if overflow > 0:
+            self.start = self._index(overflow)
+            self.count = self.capacity
+        else:
+            self.count += len(rows)
+        return len(rows)
+
+    def to_array(self, limit=None):
+        """Mumları kronolojik sırada kopyala"""
+        n = self.count if limit is None else min(limit, self.count)
+        begin = self._index(self.count - n)
+        end = begin + n
+        if end <= self.capacity:
+            return self.data[begin:end].copy()
+        return np.concatenate(
+            (self.data[begin:], self.data[:end - self.capacity])
+        )
+
+
+class KlineStore:
+    """(sembol, periyot) bazında yerel mum deposu
+
+    İlk çağrıda geçmişi bir kez indirir, sonraki çağrılarda sadece son
+    kaydedilen mumdan sonraki (ve henüz kapanmamış canlı) mumları çeker.
+    history (HistoryStore) verilirse yeni tamponlar önce yerel geçmişten
+    doldurulur; REST'ten sadece sonrası istenir.
+    """
+
+    def __init__(self, client, capacity=KLINE_CACHE_SIZE, history=None):
+        if capacity > MAX_KLINE_LIMIT:
+            raise ValueError(
+                f"Kline cache capacity cannot exceed {MAX_KLINE_LIMIT}"
+            )
+        self.client = client
+        self.capacity = capacity
+        self.history = history
+        self._buffers = {}
+        self._lock = threading.Lock()
+
+    def get_buffer(self, symbol, interval):
+        """Sembol/periyot için tamponu getir (yoksa oluştur)"""
+        key = (symbol, interval)
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = KlineBuffer(self.capacity)
+                if self.history is not None:
+                    buffer.merge(
+                        self.history.tail(symbol, interval, self.capacity)
+                    )
+                self._buffers[key] = buffer
+            return buffer
+
+    def request_params(self, symbol, interval, now_ms=None):
+        """Bir sonraki get_klines çağrısının parametrelerini hesapla"""
+        buffer = self.get_buffer(symbol, interval)
+        last = buffer.last_row()
+        if last is None:
+            return {'symbol': symbol, 'interval': interval,
+                    'limit': self.capacity}
+
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+
+        step = interval_to_ms(interval)
+        last_open, last_close = int(last[0]), int(last[6])
+        # Son mum hâlâ açıksa onu da yeniden iste, kapandıysa sonrasını
+        start_time = last_open if last_close >= now_ms else last_close + 1
+        missing = max(now_ms - start_time, 0) // step + 1
+
+        if missing >= self.capacity:
+            # Aradaki boşluk tampondan büyük, baştan doldur
+            return {'symbol': symbol, 'interval': interval,
+                    'limit': self.capacity}
+
+        return {'symbol': symbol, 'interval': interval,
+                'startTime': start_time, 'limit': int(missing)}
+
+    def merge(self, symbol, interval, klines, reset=False):
+        """Ham kline cevabını tampona işle"""
+        buffer = self.get_buffer(symbol, interval)
+        rows = parse_klines(klines)
+        with buffer.lock:
+            if reset:
+                buffer.clear()
+            return buffer.merge(rows)
+
+    def refresh(self, symbol, interval):
+        """Eksik mumları REST üzerinden çek ve tampona ekle
+
+        Tampon kilidi REST çağrısı sırasında tutulmaz; bu arada WebSocket
+        beslemesi mum işleyebilir. Cevaptaki eski mumları merge zaten atar.
+        """
+        buffer = self.get_buffer(symbol, interval)
+        with buffer.lock:
+            params = self.request_params(symbol, interval)
+        klines = self.client.get_klines(**params)
+        rows = parse_klines(klines)
+        with buffer.lock:
+            if 'startTime' not in params:
+                buffer.clear()
+            return buffer.merge(rows)
+
+    def get_array(self, symbol, interval, limit=None, refresh=True):
+        """Mumları numpy matrisi olarak döndür"""
+        if refresh:
+            self.refresh(symbol, interval)
+        buffer = self.get_buffer(symbol, interval)
+        with buffer.lock:
+            return buffer.to_array(limit)
+
+    def get_dataframe(self, symbol, interval, limit=None, refresh=True):
+        """Mumları indikatörlerle birlikte DataFrame olarak döndür"""
+        data = self.get_array(symbol, interval, limit, refresh)
+        with span('dataframe'):
+            df = pd.DataFrame(data[:, 1:], columns=BUFFER_COLUMNS[1:])
+            df.index = pd.to_datetime(data[:, 0].astype('int64'), unit='ms')
+            df.index.name = 'timestamp'
+        return df
+
+    def get_close_matrix(self, symbols, interval, length=None, refresh=True):
+        """Sembollerin kapanışlarını sağa hizalı (sembol x mum) matrise diz
+
+        Geçmişi kısa olan sembollerin baş kısmı NaN ile doldurulur, sonuç
+        doğrudan calculate_indicator_matrix'e verilebilir.
+        """
+        length = self.capacity if length is None else length
+        closes = np.full((len(symbols), length), np.nan)
+        for i, symbol in enumerate(symbols):
+            data = self.get_array(symbol, interval, length, refresh)
+            if len(data):
+                closes[i, length - len(data):] = data[:, 4]
+        return closes
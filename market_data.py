@@ -0,0 +1,359 @@
+# market_data.py
+
+import asyncio
+import json
+import threading
+import time
+
+import websockets
+
+from config import BINANCE_WS_URL, PRICE_MAX_AGE
+
+
+def kline_event_to_row(k):
+    """WebSocket kline mesajını REST kline satır formatına çevir"""
+    return [
+        k['t'], k['o'], k['h'], k['l'], k['c'], k['v'],
+        k['T'], k['q'], k['n'], k['V'], k['Q'], '0'
+    ]
+
+
+class MarketDataFeed:
+    """Kline ve bookTicker akışlarını dinleyen piyasa verisi beslemesi
+
+    Son fiyatlar ve mumlar bellekte tutulur; mumlar doğrudan KlineStore'a
+    işlenir. Bağlantı koptuğunda yeniden bağlanılır ve aradaki boşluk REST
+    üzerinden doldurulur. url=None ise besleme hiç bağlanmaz; fiyat ve mum
+    okumaları REST'e düşer.
+    """
+
+    def __init__(self, kline_store, url=BINANCE_WS_URL, reconnect_delay=1,
+                 max_reconnect_delay=60):
+        self.kline_store = kline_store
+        self.url = url.rstrip('/') if url is not None else None
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.is_running = False
+        self.is_connected = False
+
+        self._klines = set()   # (symbol, interval)
+        self._tickers = set()  # symbol
+        self._on_market_tickers = None  # !miniTicker@arr callback'i
+        self._prices = {}      # symbol -> (bid, ask, last, güncellenme zamanı)
+        self._lock = threading.Lock()
+        self._candle_closed = threading.Condition(self._lock)
+        self._closed_candles = {}  # symbol -> kapanan son mumun açılış zamanı
+
+        self._loop = None
+        self._thread = None
+        self._websocket = None
+        self._request_id = 0
+
+    # --- Abonelikler ---
+
+    @staticmethod
+    def _kline_stream(symbol, interval):
+        return f"{symbol.lower()}@kline_{interval}"
+
+    @staticmethod
+    def _ticker_stream(symbol):
+        return f"{symbol.lower()}@bookTicker"
+
+    MARKET_TICKER_STREAM = '!miniTicker@arr'
+
+    def _streams(self):
+        with self._lock:
+            streams = [self._kline_stream(s, i) for s, i in self._klines]
+            streams += [self._ticker_stream(s) for s in self._tickers]
+            if self._on_market_tickers is not None:
+                streams.append(self.MARKET_TICKER_STREAM)
+        return sorted(streams)
+
+    def subscribe(self, symbol, interval='1h'):
+        """Sembolün kline ve bookTicker akışlarına abone ol"""
+        new_streams = []
+        with self._lock:
+            if (symbol, interval) not in self._klines:
+                self._klines.add((symbol, interval))
+                new_streams.append(self._kline_stream(symbol, interval))
+            if symbol not in self._tickers:
+                self._tickers.add(symbol)
+                new_streams.append(self._ticker_stream(symbol))
+
+        if new_streams and self._websocket is not None:
+            asyncio.run_coroutine_threadsafe(
+                self._send_subscribe(new_streams, symbol, interval),
+                self._loop
+            )
+
+    def subscribe_market_tickers(self, callback):
+        """Tüm piyasa mini-ticker akışını callback(mesaj listesi)'ne bağla"""
+        with self._lock:
+            new = self._on_market_tickers is None
+            self._on_market_tickers = callback
+        if new and self._websocket is not None:
+            asyncio.run_coroutine_threadsafe(
+                self._send_subscribe([self.MARKET_TICKER_STREAM]), self._loop
+            )
+
+    def is_streaming(self, symbol, interval):
+        """Sembol/periyot için canlı akış aktif mi"""
+        with self._lock:
+            subscribed = (symbol, interval) in self._klines
+        buffer = self.kline_store.get_buffer(symbol, interval)
+        return self.is_connected and subscribed and len(buffer) > 0
+
+    # --- Okuma ---
+
+    def get_price(self, symbol, max_age=PRICE_MAX_AGE):
+        """Bellekteki son fiyatı döndür (yoksa veya eskiyse None)"""
+        with self._lock:
+            entry = self._prices.get(symbol)
+        if entry is None:
+            return None
+        bid, ask, last, updated = entry
+        if max_age is not None and time.monotonic() - updated > max_age:
+            return None
+        if bid and ask:
+            return (bid + ask) / 2
+        return last
+
+    def wait_for_candle(self, symbol, timeout):
+        """Sembol için yeni bir mum kapanana kadar bekle"""
+        with self._candle_closed:
+            last_seen = self._closed_candles.get(symbol)
+            return self._candle_closed.wait_for(
+                lambda: self._closed_candles.get(symbol) != last_seen
+                or not self.is_running,
+                timeout
+            )
+
+    # --- Yaşam döngüsü ---
+
+    def start(self):
+        """Beslemeyi arka plan thread'inde başlat"""
+        if self.is_running:
+            return
+        self.is_running = True
+        if self.url is None:
+            return  # Çevrimdışı: wait_for_candle sadece zaman aşımını bekler
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Beslemeyi durdur"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        with self._candle_closed:
+            self._candle_closed.notify_all()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._close_websocket)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _close_websocket(self):
+        if self._websocket is not None:
+            asyncio.ensure_future(self._websocket.close())
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while self.is_running:
+            streams = self._streams()
+            if not streams:
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            try:
+                url = f"{self.url}/stream?streams={'/'.join(streams)}"
+                async with websockets.connect(url) as websocket:
+                    self._websocket = websocket
+                    delay = self.reconnect_delay
+
+                    # Bağlantı yokken kaçırılan mumları REST ile tamamla;
+                    # besleme ancak bundan sonra bağlı sayılır
+                    await self._backfill()
+                    self.is_connected = True
+
+                    async for message in websocket:
+                        self._handle_message(json.loads(message))
+                        if not self.is_running:
+                            break
+            except Exception as e:
+                if self.is_running:
+                    print(f"Market data connection error: {str(e)}")
+            finally:
+                self.is_connected = False
+                self._websocket = None
+
+            if self.is_running:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _backfill(self, klines=None):
+        if klines is None:
+            with self._lock:
+                klines = list(self._klines)
+        loop = asyncio.get_running_loop()
+        for symbol, interval in klines:
+            try:
+                await loop.run_in_executor(
+                    None, self.kline_store.refresh, symbol, interval
+                )
+            except Exception as e:
+                print(f"Kline backfill error ({symbol} {interval}): {str(e)}")
+
+    async def _send_subscribe(self, streams, symbol=None, interval=None):
+        websocket = self._websocket
+        if websocket is None:
+            return  # Yeniden bağlanırken URL'e zaten eklenecek
+        self._request_id += 1
+        await websocket.send(json.dumps({
+            'method': 'SUBSCRIBE',
+            'params': streams,
+            'id': self._request_id
+        }))
+        if symbol is not None:
+            await self._backfill([(symbol, interval)])
+
+    # --- Mesaj işleme ---
+
+    def _handle_message(self, message):
+        data = message.get('data', message)
+        if isinstance(data, list):
+            # !miniTicker@arr: son saniyede değişen tüm sembollerin ticker'ı
+            if self._on_market_tickers is not None:
+                self._on_market_tickers(data)
+            return
+        if 'result' in data and 'id' in data:
+            return  # SUBSCRIBE cevabı
+
+        if data.get('e') == 'kline':
+            self._handle_kline(data['k'])
+        elif 'b' in data and 'a' in data and 's' in data:
+            self._handle_book_ticker(data)
+
+    def _handle_kline(self, k):
+        symbol = k['s']
+        # Geçmiş henüz yüklenmediyse tek mumla tamponu başlatma
+        if len(self.kline_store.get_buffer(symbol, k['i'])):
+            self.kline_store.merge(symbol, k['i'], [kline_event_to_row(k)])
+
+        with self._lock:
+            bid, ask = self._prices.get(symbol, (None, None, None, 0))[:2]
+            self._prices[symbol] = (bid, ask, float(k['c']), time.monotonic())
+
+        if k['x']:
+            with self._candle_closed:
+                self._closed_candles[symbol] = k['t']
+                self._candle_closed.notify_all()
+
+    def _handle_book_ticker(self, data):
+        with self._lock:
+            last = self._prices.get(data['s'], (None, None, None, 0))[2]
+            self._prices[data['s']] = (
+                float(data['b']), float(data['a']), last, time.monotonic()
+            )
+
+
+class ReplayServer:
+    """Kaydedilmiş akış mesajlarını yerelde yayınlayan WebSocket sunucusu
+
+    Gerçek Binance bağlantısı olmadan MarketDataFeed'i denemek için
+    kullanılır. disconnect_after verilirse her bağlantı o kadar mesajdan
+    sonra kesilir, böylece yeniden bağlanma ve boşluk doldurma da denenebilir.
+    """
+
+    def __init__(self, messages, host='127.0.0.1', port=0, delay=0,
+                 disconnect_after=None):
+        self.messages = list(messages)
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.disconnect_after = disconnect_after
+        self.connections = 0
+        self.subscriptions = []
+
+        self._loop = None
+        self._thread = None
+        self._server = None
+        self._ready = threading.Event()
+        self._position = 0
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """JSON Lines dosyasından mesajları yükle"""
+        with open(path, 'r') as f:
+            messages = [json.loads(line) for line in f if line.strip()]
+        return cls(messages, **kwargs)
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self):
+        """Sunucuyu arka planda başlat ve adresini döndür"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self.url
+
+    def stop(self):
+        """Sunucuyu durdur"""
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve())
+        self._ready.set()
+        self._loop.run_forever()
+        self._server.close()
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+
+    async def _serve(self):
+        self._server = await websockets.serve(
+            self._handle_client, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _handle_client(self, websocket, path=None):
+        self.connections += 1
+        sent = 0
+        receiver = asyncio.ensure_future(self._receive(websocket))
+        try:
+            while self._position < len(self.messages):
+                if (self.disconnect_after is not None
+                        and sent >= self.disconnect_after):
+                    break
+                await websocket.send(json.dumps(self.messages[self._position]))
+                self._position += 1
+                sent += 1
+                await asyncio.sleep(self.delay)
+            else:
+                # Mesajlar bitti, istemci kapatana kadar bağlantıyı tut
+                await receiver
+        finally:
+            receiver.cancel()
+
+    async def _receive(self, websocket):
+        async for message in websocket:
+            request = json.loads(message)
+            if request.get('method') == 'SUBSCRIBE':
+                self.subscriptions.extend(request['params'])
+                await websocket.send(json.dumps(
+                    {'result': None, 'id': request['id']}
+                ))
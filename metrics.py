@@ -0,0 +1,212 @@
+# metrics.py
+
+import threading
+from collections import deque
+
+from config import INITIAL_BALANCE
+
+
+def order_fills(order):
+    """Emir cevabındaki tüm fill'leri (miktar, fiyat, komisyon, varlık) döndür"""
+    return [
+        (float(fill['qty']), float(fill['price']),
+         float(fill.get('commission', 0)), fill.get('commissionAsset'))
+        for fill in order.get('fills', [])
+    ]
+
+
+def order_costs(symbol, side, fills, quote_asset='USDT'):
+    """Emrin quote cinsinden ücreti ve lot'a giren net miktarı
+
+    PerformanceTracker.on_order ile aynı kural: quote komisyonu ücrettir,
+    alımda coin cinsinden komisyon miktardan düşülür.
+    """
+    base_asset = symbol[:-len(quote_asset)]
+    fee = 0.
+    net_quantity = 0.
+    for quantity, _, commission, asset in fills:
+        if asset == quote_asset:
+            fee += commission
+        elif asset == base_asset and side == 'BUY':
+            quantity -= commission
+        net_quantity += quantity
+    return fee, net_quantity
+
+
+class PerformanceTracker:
+    """Her fill ile artımlı güncellenen kar/zarar ve kazanma oranı takipçisi
+
+    Alımlar sembol bazında lot kuyruğuna eklenir, satışlar FIFO sırasıyla
+    en eski lotlardan düşülür. Toplam maliyet, piyasa değeri, en yüksek
+    özsermaye ve drawdown her güncellemede tutulur; metrikler için geçmiş
+    yeniden taranmaz.
+    """
+
+    def __init__(self, initial_equity=INITIAL_BALANCE, quote_asset='USDT'):
+        self.initial_equity = initial_equity
+        self.quote_asset = quote_asset
+
+        self.realized_pnl = 0.
+        self.fees = 0.
+        self.wins = 0
+        self.losses = 0
+        self.fill_count = 0
+        self.unmatched_quantity = 0.  # Karşılığında alım olmayan satış miktarı
+
+        self._lots = {}          # sembol -> deque([miktar, fiyat])
+        self._quantity = {}      # sembol -> açık miktar
+        self._cost = {}          # sembol -> açık lotların maliyeti
+        self._last_price = {}    # sembol -> son fiyat
+        self._total_cost = 0.
+        self._market_value = 0.
+
+        self.peak_equity = initial_equity
+        self.max_drawdown = 0.
+        self.max_drawdown_pct = 0.
+        self._lock = threading.Lock()
+
+    def _set_position(self, symbol, quantity, cost, price):
+        """Sembolün açık miktar/maliyet/fiyatını değiştirip toplamları güncelle"""
+        old_value = self._quantity.get(symbol, 0.) * self._last_price.get(symbol, 0.)
+        self._total_cost += cost - self._cost.get(symbol, 0.)
+        self._market_value += quantity * price - old_value
+
+        self._quantity[symbol] = quantity
+        self._cost[symbol] = cost
+        self._last_price[symbol] = price
+
+    def _update_drawdown(self):
+        equity = self.equity
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+        drawdown = self.peak_equity - equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+        if self.peak_equity > 0:
+            self.max_drawdown_pct = max(
+                self.max_drawdown_pct, drawdown / self.peak_equity * 100
+            )
+
+    def _apply_fill(self, symbol, side, quantity, price, fee):
+        """Tek bir fill'i işle, (kar, kapanan miktar) döndür"""
+        lots = self._lots.setdefault(symbol, deque())
+        position = self._quantity.get(symbol, 0.)
+        cost = self._cost.get(symbol, 0.)
+        self.fees += fee
+        self.fill_count += 1
+
+        if side == 'BUY':
+            lots.append([quantity, price])
+            self._set_position(symbol, position + quantity,
+                               cost + quantity * price, price)
+            return -fee, 0.
+
+        pnl = -fee
+        remaining = quantity
+        while remaining > 0 and lots:
+            lot = lots[0]
+            matched = min(remaining, lot[0])
+            pnl += matched * (price - lot[1])
+            cost -= matched * lot[1]
+            position -= matched
+            remaining -= matched
+            lot[0] -= matched
+            if lot[0] <= 1e-12:
+                lots.popleft()
+        self.unmatched_quantity += remaining
+
+        if not lots:
+            position, cost = 0., 0.  # Kayan nokta artıklarını temizle
+        self._set_position(symbol, position, cost, price)
+        return pnl, quantity - remaining
+
+    def on_fill(self, symbol, side, quantity, price, fee=0.):
+        """Tek fill'i tek işlem olarak kaydet (kayıtlı geçmişi yüklerken)"""
+        return self.on_order(symbol, side, [(quantity, price, fee, self.quote_asset)])
+
+    def on_order(self, symbol, side, fills):
+        """Bir emrin tüm fill'lerini işle, emrin gerçekleşen karını döndür
+
+        Komisyon quote varlıkta ise ücret olarak düşülür, alınan coin
+        cinsinden ise lot miktarından düşülür.
+        """
+        base_asset = symbol[:-len(self.quote_asset)]
+        with self._lock:
+            pnl = 0.
+            closed = 0.
+            for quantity, price, commission, asset in fills:
+                fee = 0.
+                if asset == self.quote_asset:
+                    fee = commission
+                elif asset == base_asset and side == 'BUY':
+                    quantity -= commission
+                fill_pnl, matched = self._apply_fill(
+                    symbol, side, quantity, price, fee
+                )
+                pnl += fill_pnl
+                closed += matched
+
+            self.realized_pnl += pnl
+            if closed > 0:
+                if pnl > 0:
+                    self.wins += 1
+                else:
+                    self.losses += 1
+            self._update_drawdown()
+            return pnl
+
+    def mark(self, symbol, price):
+        """Açık pozisyonu anlık fiyatla değerle"""
+        with self._lock:
+            if self._quantity.get(symbol):
+                self._set_position(symbol, self._quantity[symbol],
+                                   self._cost[symbol], price)
+                self._update_drawdown()
+            else:
+                self._last_price[symbol] = price
+
+    @property
+    def unrealized_pnl(self):
+        return self._market_value - self._total_cost
+
+    @property
+    def equity(self):
+        return self.initial_equity + self.realized_pnl + self.unrealized_pnl
+
+    @property
+    def exposure(self):
+        """Açık pozisyonların anlık piyasa değeri"""
+        return self._market_value
+
+    @property
+    def win_rate(self):
+        closed = self.wins + self.losses
+        return self.wins / closed * 100 if closed else 0
+
+    def position(self, symbol):
+        """Sembolün açık miktarı ve ortalama maliyeti"""
+        with self._lock:
+            quantity = self._quantity.get(symbol, 0.)
+            cost = self._cost.get(symbol, 0.)
+        return quantity, (cost / quantity if quantity else 0.)
+
+    def snapshot(self):
+        """Tüm metrikleri tek seferde döndür"""
+        with self._lock:
+            equity = self.equity
+            return {
+                'total_profit': self.realized_pnl,
+                'unrealized_profit': self.unrealized_pnl,
+                'fees': self.fees,
+                'win_rate': self.win_rate,
+                'closed_trades': self.wins + self.losses,
+                'equity': equity,
+                'exposure': self._market_value,
+                'drawdown': self.peak_equity - equity,
+                'max_drawdown': self.max_drawdown,
+                'max_drawdown_pct': self.max_drawdown_pct,
+                'open_positions': {
+                    symbol: quantity
+                    for symbol, quantity in self._quantity.items() if quantity
+                }
+            }
@@ -0,0 +1,177 @@
+# model_registry.py
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from config import (
+    MODEL_REGISTRY_DIR, MODEL_MAX_AGE, INFERENCE_BACKEND
+)
+from numpy_model import NumpyPricePredictor
+
+WEIGHTS_FILE = 'weights.npz'
+METADATA_FILE = 'metadata.json'
+
+
+def check_weights(path):
+    """Ağırlık dosyasındaki tüm değerler sonlu değilse ValueError"""
+    with np.load(path) as data:
+        invalid = [name for name in data.files
+                   if not np.isfinite(data[name]).all()]
+    if invalid:
+        raise ValueError(f"Non-finite model weights: {', '.join(invalid)}")
+
+
+class ModelRegistry:
+    """Sembol/periyot bazında sürümlü model deposu
+
+    Her sürüm kendi klasöründe ağırlıkları (export_numpy formatı, scaler
+    dahil) ve eğitim bilgilerini tutar:
+
+        <root>/<symbol>/<interval>/v0001/weights.npz
+        <root>/<symbol>/<interval>/v0001/metadata.json
+
+    Modeller ilk kullanıldıklarında yüklenir ve önbellekte tutulur.
+    Sonlu olmayan (NaN/inf) ağırlıklar kaydedilmez; diskte böyle bir sürüm
+    varsa yüklenmez ve atlanır.
+    """
+
+    def __init__(self, root=MODEL_REGISTRY_DIR, max_age=MODEL_MAX_AGE,
+                 backend=INFERENCE_BACKEND):
+        self.root = root
+        self.max_age = max_age
+        self.backend = backend
+        self._cache = {}  # (symbol, interval) -> (version, model, metadata)
+        self._invalid = set()  # Yüklenemeyen (symbol, interval, version)
+        self._lock = threading.Lock()
+
+    def _model_dir(self, symbol, interval):
+        return os.path.join(self.root, symbol, interval)
+
+    def _version_dir(self, symbol, interval, version):
+        return os.path.join(self._model_dir(symbol, interval), f"v{version:04d}")
+
+    def versions(self, symbol, interval):
+        """Kayıtlı sürüm numaralarını sıralı döndür"""
+        model_dir = self._model_dir(symbol, interval)
+        if not os.path.isdir(model_dir):
+            return []
+        return sorted(
+            int(name[1:]) for name in os.listdir(model_dir)
+            if name.startswith('v') and name[1:].isdigit()
+        )
+
+    def latest_version(self, symbol, interval):
+        """Kullanılabilir en son sürüm (geçersiz ağırlıklılar atlanır)"""
+        versions = [
+            version for version in self.versions(symbol, interval)
+            if (symbol, interval, version) not in self._invalid
+        ]
+        return versions[-1] if versions else None
+
+    def load_metadata(self, symbol, interval, version=None):
+        """Sürümün eğitim bilgilerini getir (varsayılan: en son sürüm)"""
+        if version is None:
+            version = self.latest_version(symbol, interval)
+            if version is None:
+                return None
+        path = os.path.join(
+            self._version_dir(symbol, interval, version), METADATA_FILE
+        )
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def is_stale(self, symbol, interval):
+        """En son sürüm yoksa veya max_age'den eskiyse True"""
+        with self._lock:
+            cached = self._cache.get((symbol, interval))
+        metadata = cached[2] if cached else self.load_metadata(symbol, interval)
+        if metadata is None:
+            return True
+        trained_at = datetime.fromisoformat(metadata['trained_at'])
+        age = (datetime.now() - trained_at).total_seconds()
+        return age > self.max_age
+
+    def save(self, symbol, interval, model, **metadata):
+        """Eğitilmiş modeli yeni bir sürüm olarak kaydet"""
+        model_dir = self._model_dir(symbol, interval)
+        os.makedirs(model_dir, exist_ok=True)
+
+        # Önce geçici klasöre yaz, sonra tek adımda yerine taşı
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=model_dir)
+        try:
+            weights_path = os.path.join(tmp_dir, WEIGHTS_FILE)
+            model.export_numpy(weights_path)
+            check_weights(weights_path)
+            with self._lock:
+                versions = self.versions(symbol, interval)
+                version = (versions[-1] if versions else 0) + 1
+                metadata.update({
+                    'symbol': symbol,
+                    'interval': interval,
+                    'version': version,
+                    'trained_at': datetime.now().isoformat(),
+                })
+                with open(os.path.join(tmp_dir, METADATA_FILE), 'w') as f:
+                    json.dump(metadata, f, indent=4)
+                os.rename(tmp_dir, self._version_dir(symbol, interval, version))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return version
+
+    def load(self, symbol, interval, version):
+        """Belirli bir sürümü seçili backend ile yükle"""
+        path = os.path.join(
+            self._version_dir(symbol, interval, version), WEIGHTS_FILE
+        )
+        try:
+            check_weights(path)
+        except ValueError:
+            self._invalid.add((symbol, interval, version))
+            raise
+        if self.backend == 'numpy':
+            return NumpyPricePredictor.load(path)
+
+        from models import PricePredictionModel
+        return PricePredictionModel.from_numpy(path)
+
+    def get(self, symbol, interval):
+        """Modeli getir (ilk çağrıda en son sürüm yüklenir, yoksa None)
+
+        Sonraki sürümler activate ile devreye alınır; böylece çağıran
+        thread disk okumasını beklemez.
+        """
+        key = (symbol, interval)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached[1]
+
+        # Geçersiz ağırlıklı sürümler (ör. düzeltmeden önce kaydedilmiş
+        # NaN modeller) atlanır, bir önceki sürüm kullanılır
+        while True:
+            version = self.latest_version(symbol, interval)
+            if version is None:
+                return None
+            try:
+                return self.activate(symbol, interval, version)
+            except ValueError:
+                if (symbol, interval, version) not in self._invalid:
+                    raise
+
+    def activate(self, symbol, interval, version):
+        """Sürümü yükleyip önbellekteki modelin yerine tek adımda koy"""
+        model = self.load(symbol, interval, version)
+        metadata = self.load_metadata(symbol, interval, version)
+        key = (symbol, interval)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None or cached[0] < version:
+                self._cache[key] = (version, model, metadata)
+            return self._cache[key][1]
@@ -2,13 +2,15 @@
 
 import tensorflow as tf
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import MinMaxScaler
-from config import SEQUENCE_LENGTH, EPOCHS, BATCH_SIZE
+from config import SEQUENCE_LENGTH, EPOCHS, BATCH_SIZE, FEATURES
 
 class PricePredictionModel:
     def __init__(self):
         self.model = self._create_model()
         self.scaler = MinMaxScaler()
+        self._forward = self._compile_forward()
 
     def _create_model(self):
         model = tf.keras.Sequential([
@@ -21,45 +23,154 @@ class PricePredictionModel:
         model.compile(optimizer='adam', loss='mean_squared_error')
         return model
 
+    def _compile_forward(self):
+        """Sabit imzalı, derlenmiş ileri geçiş (yeniden izleme yapmaz)"""
+        model = self.model
+
+        @tf.function(input_signature=[
+            tf.TensorSpec(shape=(None, SEQUENCE_LENGTH, len(FEATURES)),
+                          dtype=tf.float32)
+        ])
+        def forward(x):
+            return model(x, training=False)
+
+        return forward
+
+    @staticmethod
+    def make_windows(scaled_data):
+        """Kopyasız kayan pencereler: X[i] = scaled_data[i:i+SEQUENCE_LENGTH]"""
+        # (N-SEQ+1, 5, SEQ) görünümü -> (N-SEQ, SEQ, 5), veri kopyalanmaz
+        windows = sliding_window_view(scaled_data, SEQUENCE_LENGTH, axis=0)
+        X = windows[:-1].transpose(0, 2, 1)
+        y = scaled_data[SEQUENCE_LENGTH:, 0]
+        return X, y
+
     def prepare_data(self, df):
-        # Özellik seçimi
-        features = ['close', 'volume', 'RSI', 'MACD', 'Signal']
-        dataset = df[features].values
+        # Özellik seçimi; indikatörlerin ısınma satırları (ilk RSI/MACD
+        # değerleri) NaN'dır ve eğitime girerse tüm ağırlıklar NaN olur
+        dataset = df[FEATURES].values
+        dataset = dataset[np.isfinite(dataset).all(axis=1)]
         
         # Veriyi normalize et
         scaled_data = self.scaler.fit_transform(dataset)
         
         # Eğitim verisi oluştur
-        X = []
-        y = []
-        for i in range(SEQUENCE_LENGTH, len(scaled_data)):
-            X.append(scaled_data[i-SEQUENCE_LENGTH:i])
-            y.append(scaled_data[i, 0])
-        
-        return np.array(X), np.array(y)
+        return self.make_windows(scaled_data)
 
     def train(self, df):
         X, y = self.prepare_data(df)
         self.model.fit(X, y, epochs=EPOCHS, batch_size=BATCH_SIZE, verbose=0)
 
+    def fit_scaler_streaming(self, chunk_factory):
+        """Scaler'ı tüm veriyi belleğe almadan parça parça eğit"""
+        self.scaler = MinMaxScaler()
+        for chunk in chunk_factory():
+            self.scaler.partial_fit(chunk[FEATURES].values)
+
+    def make_dataset(self, chunk_factory, batch_size=BATCH_SIZE):
+        """Parçalardan pencere batch'leri üreten akışlı tf.data hattı
+
+        chunk_factory her çağrıldığında DataFrame parçalarını kronolojik
+        sırayla veren yeni bir iterator döndürmelidir (her epoch'ta yeniden
+        okunur). Parça sınırlarındaki pencereler için önceki parçanın son
+        SEQUENCE_LENGTH satırı taşınır; bellekte aynı anda tek parça bulunur.
+        NaN içeren pencereler (indikatör ısınması) atlanır; sonuç
+        prepare_data'nın pencereleriyle aynıdır.
+        """
+        def generator():
+            tail = None
+            for chunk in chunk_factory():
+                scaled = self.scaler.transform(
+                    chunk[FEATURES].values).astype(np.float32)
+                if tail is not None:
+                    scaled = np.concatenate((tail, scaled))
+                if len(scaled) > SEQUENCE_LENGTH:
+                    X, y = self.make_windows(scaled)
+                    valid = np.isfinite(scaled).all(axis=1)
+                    if not valid.all():
+                        # Pencere i, i..i+SEQUENCE_LENGTH satırlarını kullanır
+                        keep = sliding_window_view(
+                            valid, SEQUENCE_LENGTH + 1).all(axis=1)
+                        X, y = X[keep], y[keep]
+                    for start in range(0, len(X), batch_size):
+                        yield (X[start:start + batch_size],
+                               y[start:start + batch_size])
+                tail = scaled[-SEQUENCE_LENGTH:]
+
+        dataset = tf.data.Dataset.from_generator(
+            generator,
+            output_signature=(
+                tf.TensorSpec(shape=(None, SEQUENCE_LENGTH, len(FEATURES)),
+                              dtype=tf.float32),
+                tf.TensorSpec(shape=(None,), dtype=tf.float32)
+            )
+        )
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+    def train_streaming(self, chunk_factory, epochs=EPOCHS,
+                        batch_size=BATCH_SIZE):
+        """Belleğe sığmayan geçmiş üzerinde akışlı eğitim"""
+        self.fit_scaler_streaming(chunk_factory)
+        dataset = self.make_dataset(chunk_factory, batch_size)
+        self.model.fit(dataset, epochs=epochs, verbose=0)
+
     def predict(self, df):
-        # Son SEQUENCE_LENGTH kadar veriyi al
-        last_sequence = df.tail(SEQUENCE_LENGTH)
-        features = ['close', 'volume', 'RSI', 'MACD', 'Signal']
-        sequence = last_sequence[features].values
-        
-        # Veriyi normalize et
-        scaled_sequence = self.scaler.transform(sequence)
-        
-        # Tahmin için yeniden şekillendir
-        X = scaled_sequence.reshape((1, SEQUENCE_LENGTH, 5))
+        return self.predict_batch([df])[0]
+
+    def predict_batch(self, dfs):
+        """Birden fazla sembolün son dizilerini tek tensörde tahmin et"""
+        # Son SEQUENCE_LENGTH kadar veriyi al ve normalize et
+        X = np.stack([
+            self.scaler.transform(df[FEATURES].values[-SEQUENCE_LENGTH:])
+            for df in dfs
+        ]).astype(np.float32)
         
         # Tahmin yap
-        prediction = self.model.predict(X)
+        predictions = self._forward(tf.constant(X)).numpy()[:, 0]
         
-        # Tahmini gerçek değere dönüştür
-        prediction_transformed = self.scaler.inverse_transform(
-            np.array([[prediction[0, 0], 0, 0, 0, 0]])
-        )[0, 0]
+        # Tahminleri gerçek değere dönüştür (sadece close sütunu)
+        return (predictions - self.scaler.min_[0]) / self.scaler.scale_[0]
+
+    def export_numpy(self, path):
+        """Ağırlıkları ve scaler'ı NumPy çıkarımı için .npz olarak kaydet"""
+        lstm1, lstm2, dense1, dense2 = self.model.layers
+        arrays = {}
+        for name, layer in (('lstm1', lstm1), ('lstm2', lstm2)):
+            kernel, recurrent_kernel, bias = layer.get_weights()
+            arrays[f'{name}_kernel'] = kernel
+            arrays[f'{name}_recurrent_kernel'] = recurrent_kernel
+            arrays[f'{name}_bias'] = bias
+        for name, layer in (('dense1', dense1), ('dense2', dense2)):
+            kernel, bias = layer.get_weights()
+            arrays[f'{name}_kernel'] = kernel
+            arrays[f'{name}_bias'] = bias
         
-        return prediction_transformed
\ No newline at end of file
+        np.savez(
+            path,
+            scaler_min=self.scaler.min_,
+            scaler_scale=self.scaler.scale_,
+            scaler_data_min=self.scaler.data_min_,
+            scaler_data_max=self.scaler.data_max_,
+            sequence_length=SEQUENCE_LENGTH,
+            **arrays
+        )
+
+    @classmethod
+    def from_numpy(cls, path):
+        """export_numpy ile kaydedilen ağırlıklardan Keras modelini kur"""
+        instance = cls()
+        with np.load(path) as data:
+            instance.model.set_weights([
+                data[f'{name}_{part}']
+                for name in ('lstm1', 'lstm2')
+                for part in ('kernel', 'recurrent_kernel', 'bias')
+            ] + [
+                data[f'{name}_{part}']
+                for name in ('dense1', 'dense2')
+                for part in ('kernel', 'bias')
+            ])
+            # Scaler'ı kaydedilen min/max değerleriyle aynı şekilde kur
+            instance.scaler.fit(np.stack([
+                data['scaler_data_min'], data['scaler_data_max']
+            ]))
+        return instance
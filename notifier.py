@@ -0,0 +1,163 @@
+# notifier.py
+
+import queue
+import threading
+import time
+
+from config import (
+    NOTIFY_QUEUE_SIZE, NOTIFY_RATE_LIMIT, NOTIFY_BURST,
+    NOTIFY_COALESCE_WINDOW
+)
+
+
+def repeat_message(payload, count):
+    """Tekrarlanan bildirim için özet mesajı"""
+    return f"{payload} (repeated {count} more times)"
+
+
+class NotificationDispatcher:
+    """Bildirimleri sınırlı bir kuyruk üzerinden arka planda gönderen dağıtıcı
+
+    notify() hiçbir zaman beklemez: mesaj kuyruğa alınır ve ayrı bir thread
+    tarafından hız sınırına uyularak sink'e iletilir. Aynı hata
+    coalesce_window içinde tekrar ederse tekrar gönderilmez, pencere
+    bitince tek bir özet mesajı gönderilir. Kuyruk doluyken drop_policy
+    'drop_oldest' ise en eski, 'drop_new' ise yeni mesaj atılır.
+    """
+
+    def __init__(self, sink, maxsize=NOTIFY_QUEUE_SIZE, rate=NOTIFY_RATE_LIMIT,
+                 burst=NOTIFY_BURST, coalesce_window=NOTIFY_COALESCE_WINDOW,
+                 drop_policy='drop_oldest', summarize=repeat_message,
+                 name='notifier'):
+        if drop_policy not in ('drop_oldest', 'drop_new'):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.sink = sink
+        self.rate = rate
+        self.burst = burst
+        self.coalesce_window = coalesce_window
+        self.drop_policy = drop_policy
+        self.summarize = summarize
+
+        self.stats = {'sent': 0, 'failed': 0, 'dropped': 0, 'coalesced': 0}
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._suppressed = {}  # anahtar -> [payload, tekrar sayısı, pencere sonu]
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        self._running = False
+        self._name = name
+        self._thread = None
+        self.start()
+
+    def start(self):
+        """Gönderim thread'ini başlat (stop sonrası yeniden başlatır)"""
+        self._running = True
+        if self._thread is not None and self._thread.is_alive():
+            return  # Önceki thread hâlâ kuyruğu boşaltıyor, devam eder
+        self._thread = threading.Thread(target=self._run, name=self._name,
+                                        daemon=True)
+        self._thread.start()
+
+    def notify(self, payload, kind='info', key=None):
+        """Bildirimi kuyruğa al (beklemeden döner, atılırsa False)"""
+        if kind == 'error':
+            key = payload if key is None else key
+            now = time.monotonic()
+            with self._lock:
+                entry = self._suppressed.get(key)
+                if entry is not None and now < entry[2]:
+                    entry[1] += 1
+                    self.stats['coalesced'] += 1
+                    return True
+                self._suppressed[key] = [payload, 0, now + self.coalesce_window]
+        return self._put(payload)
+
+    def _put(self, payload):
+        try:
+            self._queue.put_nowait(payload)
+            return True
+        except queue.Full:
+            pass
+
+        with self._lock:
+            self.stats['dropped'] += 1
+        if self.drop_policy == 'drop_new':
+            return False
+
+        # En eskiyi at, yeniye yer aç
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self._queue.put_nowait(payload)
+            return True
+        except queue.Full:
+            return False
+
+    def _flush_suppressed(self, force=False):
+        """Penceresi dolan tekrar sayaçları için özet mesajı kuyruğa al"""
+        now = time.monotonic()
+        summaries = []
+        with self._lock:
+            for key, (payload, count, window_end) in list(
+                    self._suppressed.items()):
+                if force or now >= window_end:
+                    del self._suppressed[key]
+                    if count:
+                        summaries.append(self.summarize(payload, count))
+        for summary in summaries:
+            self._put(summary)
+
+    def _acquire_token(self):
+        if not self.rate:
+            return
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last_refill) * self.rate
+            )
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            time.sleep((1 - self._tokens) / self.rate)
+
+    def _run(self):
+        while self._running or not self._queue.empty():
+            self._flush_suppressed()
+            try:
+                payload = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            self._acquire_token()
+            try:
+                self.sink(payload)
+                self.stats['sent'] += 1
+            except Exception as e:
+                self.stats['failed'] += 1
+                print(f"Notification delivery error: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def pending(self):
+        """Kuyrukta bekleyen bildirim sayısı"""
+        return self._queue.qsize()
+
+    def stop(self, flush=True, timeout=5):
+        """Dağıtıcıyı durdur (flush ise kuyruk ve bekleyen özetler de gönderilir)"""
+        if flush:
+            self._flush_suppressed(force=True)
+        else:
+            with self._lock:
+                self._suppressed.clear()
+            while not self._queue.empty():
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except queue.Empty:
+                    break
+        self._running = False
+        self._thread.join(timeout=timeout)
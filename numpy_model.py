@@ -0,0 +1,93 @@
+# numpy_model.py
+
+import numpy as np
+
+from config import SEQUENCE_LENGTH, FEATURES
+
+# Bu modül bilerek TensorFlow import etmez; canlı bot sadece NumPy ile
+# PricePredictionModel'in (2xLSTM(50) + Dense(25) + Dense(1)) ileri
+# geçişini çalıştırabilsin diye.
+
+
+def _sigmoid(x):
+    return 1. / (1. + np.exp(-x))
+
+
+def lstm_forward(x, kernel, recurrent_kernel, bias, return_sequences):
+    """Keras LSTM katmanının ileri geçişi (kapı sırası: i, f, c, o)"""
+    batch, steps, _ = x.shape
+    units = recurrent_kernel.shape[0]
+    h = np.zeros((batch, units), dtype=x.dtype)
+    c = np.zeros((batch, units), dtype=x.dtype)
+
+    # Girdi katkısını tüm zaman adımları için tek matris çarpımıyla hesapla
+    x_proj = x @ kernel + bias
+    outputs = np.empty((batch, steps, units), dtype=x.dtype) \
+        if return_sequences else None
+
+    for t in range(steps):
+        z = x_proj[:, t] + h @ recurrent_kernel
+        i = _sigmoid(z[:, :units])
+        f = _sigmoid(z[:, units:2 * units])
+        g = np.tanh(z[:, 2 * units:3 * units])
+        o = _sigmoid(z[:, 3 * units:])
+        c = f * c + i * g
+        h = o * np.tanh(c)
+        if return_sequences:
+            outputs[:, t] = h
+
+    return outputs if return_sequences else h
+
+
+class NumpyPricePredictor:
+    """export_numpy ile kaydedilen model için TensorFlow'suz çıkarım
+
+    PricePredictionModel ile aynı predict/predict_batch arayüzüne sahiptir.
+    """
+
+    def __init__(self, weights):
+        self.weights = {
+            name: np.asarray(value, dtype=np.float32)
+            for name, value in weights.items()
+            if not name.startswith('scaler_') and name != 'sequence_length'
+        }
+        self.scaler_min = np.asarray(weights['scaler_min'], dtype=np.float64)
+        self.scaler_scale = np.asarray(weights['scaler_scale'],
+                                       dtype=np.float64)
+        self.sequence_length = int(weights.get('sequence_length',
+                                               SEQUENCE_LENGTH))
+
+    @classmethod
+    def load(cls, path):
+        """.npz dosyasından yükle"""
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def forward(self, X):
+        """Ölçeklenmiş (batch, sequence_length, 5) girdiden ham tahmin"""
+        w = self.weights
+        X = np.asarray(X, dtype=np.float32)
+        h = lstm_forward(X, w['lstm1_kernel'], w['lstm1_recurrent_kernel'],
+                         w['lstm1_bias'], return_sequences=True)
+        h = lstm_forward(h, w['lstm2_kernel'], w['lstm2_recurrent_kernel'],
+                         w['lstm2_bias'], return_sequences=False)
+        h = h @ w['dense1_kernel'] + w['dense1_bias']
+        h = h @ w['dense2_kernel'] + w['dense2_bias']
+        return h
+
+    def predict(self, df):
+        return self.predict_batch([df])[0]
+
+    def predict_batch(self, dfs):
+        """Birden fazla sembolün son dizilerini tek seferde tahmin et"""
+        # Son sequence_length kadar veriyi al ve normalize et
+        X = np.stack([
+            df[FEATURES].values[-self.sequence_length:] * self.scaler_scale
+            + self.scaler_min
+            for df in dfs
+        ])
+
+        predictions = self.forward(X)[:, 0]
+
+        # Tahminleri gerçek değere dönüştür (sadece close sütunu)
+        return (predictions - self.scaler_min[0]) / self.scaler_scale[0]
@@ -0,0 +1,161 @@
+# retrain_scheduler.py
+
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from config import (
+    EPOCHS, SEQUENCE_LENGTH, FEATURES, MODEL_REGISTRY_DIR,
+    RETRAIN_WORKERS, RETRAIN_DRIFT_THRESHOLD
+)
+from model_registry import ModelRegistry
+
+
+def train_and_save(symbol, interval, df, registry_root=MODEL_REGISTRY_DIR):
+    """Modeli eğitip depoya yeni sürüm olarak kaydet, sürümü döndür
+
+    Eğitim sürecinde çalışır; TensorFlow sadece burada import edilir.
+    """
+    from models import PricePredictionModel
+
+    model = PricePredictionModel()
+    model.train(df)
+    return ModelRegistry(root=registry_root).save(
+        symbol, interval, model,
+        samples=len(df),
+        last_candle=str(df.index[-1]),
+        epochs=EPOCHS,
+        sequence_length=SEQUENCE_LENGTH,
+        features=FEATURES
+    )
+
+
+class RetrainScheduler:
+    """Modelleri ayrı süreç havuzunda arka planda yeniden eğiten planlayıcı
+
+    Model eskidiğinde (ModelRegistry.is_stale) ya da tahmin hatası eşiği
+    aştığında eğitim kuyruğa alınır. Eğitim bitince yeni sürüm depodan
+    yüklenip canlı modelin yerine tek adımda geçirilir; trading döngüsü
+    hiçbir zaman eğitimi beklemez.
+    """
+
+    def __init__(self, registry, max_workers=RETRAIN_WORKERS,
+                 drift_threshold=RETRAIN_DRIFT_THRESHOLD, error_alpha=0.1,
+                 on_error=None):
+        self.registry = registry
+        self.max_workers = max_workers or os.cpu_count()
+        self.drift_threshold = drift_threshold
+        self.error_alpha = error_alpha
+        self.on_error = on_error
+
+        self._executor = None
+        self._pending = {}      # (symbol, interval) -> Future
+        self._errors = {}       # (symbol, interval) -> ortalama mutlak % hata
+        self._predictions = {}  # (symbol, interval) -> {mum zamanı: tahmin}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            # fork, ana süreçteki TensorFlow/thread durumunu kopyalamasın
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    def is_pending(self, symbol, interval):
+        with self._lock:
+            return (symbol, interval) in self._pending
+
+    def drift(self, symbol, interval):
+        """Ortalama mutlak yüzde tahmin hatası (henüz ölçülmediyse None)"""
+        with self._lock:
+            return self._errors.get((symbol, interval))
+
+    def should_retrain(self, symbol, interval):
+        """Model eski mi veya tahmin hatası eşiği aştı mı"""
+        if self.registry.is_stale(symbol, interval):
+            return True
+        drift = self.drift(symbol, interval)
+        return drift is not None and drift > self.drift_threshold
+
+    def submit(self, symbol, interval, df):
+        """Eğitimi kuyruğa al (zaten sıradaysa False)"""
+        key = (symbol, interval)
+        with self._lock:
+            if key in self._pending:
+                return False
+            future = self._get_executor().submit(
+                train_and_save, symbol, interval, df, self.registry.root
+            )
+            self._pending[key] = future
+        future.add_done_callback(
+            lambda f: self._on_done(symbol, interval, f)
+        )
+        return True
+
+    def maybe_retrain(self, symbol, interval, df):
+        """Gerekiyorsa eğitimi kuyruğa al, beklemeden dön"""
+        if self.is_pending(symbol, interval):
+            return False
+        if not self.should_retrain(symbol, interval):
+            return False
+        return self.submit(symbol, interval, df)
+
+    def _on_done(self, symbol, interval, future):
+        key = (symbol, interval)
+        try:
+            version = future.result()
+            # Yeni sürümü yükleyip canlı modelin yerine koy
+            self.registry.activate(symbol, interval, version)
+            with self._lock:
+                self._errors.pop(key, None)
+        except Exception as e:
+            if self.on_error:
+                self.on_error(f"Error retraining {symbol} {interval}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def observe(self, symbol, interval, df, predicted_price):
+        """Tahmini kaydet ve önceki tahminlerin gerçekleşen hatasını ölç
+
+        df'in son mumu üzerinden yapılan tahmin bir sonraki mumun
+        kapanışı içindir; hata o mum kapandığında hesaplanır. Sonlu
+        olmayan tahmin modelin bozuk olduğunu gösterir, hemen yeniden
+        eğitim istenir.
+        """
+        key = (symbol, interval)
+        index = df.index
+        closes = df['close'].values
+        with self._lock:
+            if not math.isfinite(predicted_price):
+                self._errors[key] = math.inf
+                return
+
+            pending = self._predictions.setdefault(key, {})
+            pending[index[-1]] = predicted_price
+
+            for candle_time in [t for t in pending if t < index[-1]]:
+                target = index.searchsorted(candle_time, side='right')
+                if target >= len(index) - 1:
+                    continue  # Hedef mum henüz kapanmadı (son satır canlı)
+                predicted = pending.pop(candle_time)
+                if index[target - 1] != candle_time or not closes[target]:
+                    continue  # Tahminin yapıldığı mum artık depoda değil
+
+                error = abs(predicted - closes[target]) / closes[target]
+                current = self._errors.get(key)
+                self._errors[key] = error if current is None else (
+                    self.error_alpha * error
+                    + (1 - self.error_alpha) * current
+                )
+
+    def shutdown(self, wait=False):
+        """Süreç havuzunu kapat (bekleyen işler iptal edilir)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,193 @@
+# screener.py
+
+import threading
+import time
+
+import numpy as np
+
+from config import MAX_COIN_PRICE, MINIMUM_VOLUME, SCREENER_TTL, SCREENER_TOP_K
+
+TICKER_COLUMNS = ('price', 'open', 'high', 'low', 'volume', 'quote_volume')
+
+# REST 24hr ticker ve !miniTicker@arr alanları: (sembol, sütunlar...)
+REST_FIELDS = ('symbol', 'lastPrice', 'openPrice', 'highPrice', 'lowPrice',
+               'volume', 'quoteVolume')
+STREAM_FIELDS = ('s', 'c', 'o', 'h', 'l', 'v', 'q')
+
+
+class TickerTable:
+    """Tüm piyasanın 24 saatlik ticker'larını sütun bazlı tutan tablo
+
+    Her sembol bir satırdır; güncellemeler gelen sembollerin satırlarına
+    toplu olarak yazılır. Filtreler sütunlar üzerinde vektörel çalışır.
+    """
+
+    def __init__(self, quote_asset='USDT', capacity=4096):
+        self.quote_asset = quote_asset
+        self.symbols = []
+        self._rows = {}  # sembol -> satır
+        self.columns = {name: np.zeros(capacity) for name in TICKER_COLUMNS}
+        self.is_quote = np.zeros(capacity, dtype=bool)  # quote_asset çifti mi
+        self.updated = np.zeros(capacity)  # monotonic güncellenme zamanı
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _reserve(self, size):
+        capacity = len(self.is_quote)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, values in self.columns.items():
+            self.columns[name] = np.resize(values, capacity)
+        self.is_quote = np.resize(self.is_quote, capacity)
+        self.updated = np.resize(self.updated, capacity)
+
+    def _row_indices(self, symbols):
+        rows = np.empty(len(symbols), dtype=np.int64)
+        for i, symbol in enumerate(symbols):
+            row = self._rows.get(symbol)
+            if row is None:
+                row = len(self.symbols)
+                self._reserve(row + 1)
+                self.symbols.append(symbol)
+                self._rows[symbol] = row
+                self.is_quote[row] = symbol.endswith(self.quote_asset)
+            rows[i] = row
+        return rows
+
+    def update(self, tickers, fields):
+        """dict listesini (REST veya stream formatı) tabloya yaz"""
+        if not tickers:
+            return
+        key, fields = fields[0], fields[1:]
+        rows = self._row_indices([t[key] for t in tickers])
+        for name, field in zip(TICKER_COLUMNS, fields):
+            self.columns[name][rows] = np.array(
+                [t[field] for t in tickers], dtype=float
+            )
+        self.updated[rows] = time.monotonic()
+
+    def view(self, name):
+        return self.columns[name][:len(self.symbols)]
+
+
+class Screener:
+    """Fiyat/hacim filtresi ve hacim sıralamasıyla uygun coinleri seçer
+
+    Ticker tablosu ilk kullanımda get_ticker ile tam olarak doldurulur,
+    sonra tüm piyasa mini-ticker akışıyla (on_mini_tickers) veya akış
+    yokken en fazla ttl saniyede bir get_ticker ile güncellenir.
+    Seçim: quote_asset çiftleri içinde max_price altı ve 24 saatlik quote
+    hacmi min_volume üstü olanlar; hacme göre ilk top_k argpartition ile
+    bulunur, sadece bu k satır sıralanır. İlk top_k değiştiğinde
+    abonelere yeni sıralama bildirilir.
+    """
+
+    def __init__(self, client, max_price=MAX_COIN_PRICE,
+                 min_volume=MINIMUM_VOLUME, top_k=SCREENER_TOP_K,
+                 ttl=SCREENER_TTL, quote_asset='USDT'):
+        self.client = client
+        self.max_price = max_price
+        self.min_volume = min_volume
+        self.top_k = top_k
+        self.ttl = ttl
+        self.table = TickerTable(quote_asset)
+
+        self._polled_at = None    # Son REST güncellemesi (monotonic)
+        self._streamed_at = None  # Son akış mesajı (monotonic)
+        self._ranking = ()
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    # --- Güncelleme ---
+
+    def is_stale(self):
+        # !miniTicker@arr sadece son saniyede değişen sembolleri taşır;
+        # akış ancak tam bir get_ticker görüntüsünden sonra tabloyu
+        # güncel tutabilir
+        if self._polled_at is None:
+            return True
+        now = time.monotonic()
+        return not any(
+            updated is not None and now - updated <= self.ttl
+            for updated in (self._polled_at, self._streamed_at)
+        )
+
+    def refresh(self, force=False):
+        """Tablo eskiyse tüm ticker'ları REST'ten çek"""
+        # Aynı anda gelen çağrılar tek bir get_ticker'ı paylaşır
+        with self._refresh_lock:
+            if not force and not self.is_stale():
+                return False
+            tickers = self.client.get_ticker()
+            with self._lock:
+                self.table.update(tickers, REST_FIELDS)
+                self._polled_at = time.monotonic()
+        self._publish()
+        return True
+
+    def on_mini_tickers(self, events):
+        """!miniTicker@arr mesajını işle (MarketDataFeed thread'inde)"""
+        with self._lock:
+            self.table.update(events, STREAM_FIELDS)
+            self._streamed_at = time.monotonic()
+        self._publish()
+
+    # --- Seçim ---
+
+    def _select_rows(self, k):
+        table = self.table
+        price = table.view('price')
+        volume = table.view('quote_volume')
+        mask = (table.is_quote[:len(table)] & (price > 0)
+                & (price < self.max_price) & (volume >= self.min_volume))
+        rows = np.flatnonzero(mask)
+        if len(rows) > k:
+            rows = rows[np.argpartition(-volume[rows], k - 1)[:k]]
+        return rows[np.argsort(-volume[rows], kind='stable')]
+
+    def select(self, k=None):
+        """Filtreye uyan en yüksek hacimli k coin"""
+        k = self.top_k if k is None else k
+        with self._lock:
+            rows = self._select_rows(k)
+            symbols = self.table.symbols
+            return [
+                {'symbol': symbols[row], 'price': price, 'volume': volume}
+                for row, price, volume in zip(
+                    rows.tolist(),
+                    self.table.view('price')[rows].tolist(),
+                    self.table.view('quote_volume')[rows].tolist()
+                )
+            ]
+
+    def get_viable_coins(self):
+        """Gerekirse tabloyu yenileyip uygun coinleri döndür"""
+        self.refresh()
+        return self.select()
+
+    # --- Abonelik ---
+
+    def subscribe(self, callback):
+        """callback(sıralama) ilk top_k değiştikçe çağrılır"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def _publish(self):
+        if not self._subscribers:
+            return
+        coins = self.select()
+        ranking = tuple(coin['symbol'] for coin in coins)
+        with self._lock:
+            if ranking == self._ranking:
+                return
+            self._ranking = ranking
+        for callback in list(self._subscribers):
+            try:
+                callback(coins)
+            except Exception as e:
+                print(f"Screener subscriber error: {str(e)}")
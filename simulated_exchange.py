@@ -0,0 +1,472 @@
+# simulated_exchange.py
+
+import itertools
+import json
+import threading
+import time
+
+import numpy as np
+from binance.exceptions import BinanceAPIException
+
+from config import INITIAL_BALANCE, BACKTEST_FEE_RATE, KLINE_CACHE_SIZE
+from kline_store import KLINE_COLUMNS, MAX_KLINE_LIMIT, interval_to_ms
+from exchange_info import SymbolFilters, _decimal
+from history_store import to_matrix
+
+# Mum matrisindeki sütun sıraları
+TIME, OPEN, HIGH, LOW, CLOSE, VOLUME, CLOSE_TIME, QUOTE_VOLUME, TRADES = range(9)
+
+DAY_MS = 86_400_000
+
+
+def api_error(code, message, status_code=400):
+    """Binance'in hata cevabıyla aynı BinanceAPIException'ı üret"""
+    return BinanceAPIException(
+        None, status_code, json.dumps({'code': code, 'msg': message})
+    )
+
+
+def synthetic_klines(symbol, interval, start, count, price=0.5,
+                     volatility=0.002, volume=1e6, seed=None):
+    """Geometrik rastgele yürüyüşle count mumluk matris üret
+
+    seed verilmezse sembol adından türetilir; aynı parametreler her zaman
+    aynı mumları verir.
+    """
+    step = interval_to_ms(interval)
+    rng = np.random.default_rng(
+        sum(map(ord, symbol)) if seed is None else seed
+    )
+    returns = rng.normal(0, volatility, count)
+    close = price * np.exp(np.cumsum(returns))
+    open_ = np.concatenate(([price], close[:-1]))
+    spread = np.abs(rng.normal(0, volatility / 2, count))
+
+    rows = np.empty((count, len(KLINE_COLUMNS)))
+    rows[:, TIME] = start + step * np.arange(count)
+    rows[:, OPEN] = open_
+    rows[:, HIGH] = np.maximum(open_, close) * (1 + spread)
+    rows[:, LOW] = np.minimum(open_, close) * (1 - spread)
+    rows[:, CLOSE] = close
+    rows[:, VOLUME] = volume / price * rng.lognormal(0, 0.5, count)
+    rows[:, CLOSE_TIME] = rows[:, TIME] + step - 1
+    rows[:, QUOTE_VOLUME] = rows[:, VOLUME] * close
+    rows[:, TRADES] = np.maximum(rows[:, VOLUME] * price // 100, 1)
+    rows[:, TRADES + 1] = rows[:, VOLUME] / 2
+    rows[:, TRADES + 2] = rows[:, QUOTE_VOLUME] / 2
+    return rows
+
+
+def default_filters(price):
+    """Fiyat seviyesine uygun LOT_SIZE/PRICE_FILTER/NOTIONAL kuralları"""
+    tick = 10. ** (np.floor(np.log10(price)) - 4)
+    step = min(10. ** -np.floor(np.log10(price) + 1), 1.)
+    return [
+        {'filterType': 'PRICE_FILTER', 'minPrice': f"{tick:.8f}",
+         'maxPrice': '1000000.00000000', 'tickSize': f"{tick:.8f}"},
+        {'filterType': 'LOT_SIZE', 'minQty': f"{step:.8f}",
+         'maxQty': '90000000.00000000', 'stepSize': f"{step:.8f}"},
+        {'filterType': 'NOTIONAL', 'minNotional': '5.00000000',
+         'applyMinToMarket': True}
+    ]
+
+
+class ReplayClock:
+    """Simülasyon saati
+
+    speed verilirse gerçek zamanın speed katı hızla ilerler (speed=60:
+    saniyede bir dakika). speed=None ise sadece advance/set ile ilerler;
+    yük testleri için belirlenimli kullanım budur.
+    """
+
+    def __init__(self, start_ms, speed=None):
+        self._start = int(start_ms)
+        self._offset = 0
+        self.speed = speed
+        self._started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def now_ms(self):
+        with self._lock:
+            now = self._start + self._offset
+            if self.speed:
+                now += int((time.monotonic() - self._started_at)
+                           * 1000 * self.speed)
+            return now
+
+    def advance(self, ms):
+        with self._lock:
+            self._offset += int(ms)
+
+    def set(self, timestamp_ms):
+        with self._lock:
+            self._offset = int(timestamp_ms) - self._start
+            self._started_at = time.monotonic()
+
+
+class SimulatedClient:
+    """Kayıtlı veya sentetik mumlardan fiyat üreten yerel borsa
+
+    Botun kullandığı Client alt kümesini (get_klines, get_ticker,
+    get_symbol_ticker, get_exchange_info, get_symbol_info, create_order,
+    get_account, get_asset_balance) aynı cevap formatıyla sunar. Fiyat,
+    saatin içinde bulunduğu mumun açılışından kapanışına doğrusal olarak
+    ilerler; gelecekteki mumlar hiçbir uçtan görünmez.
+
+    Market emirleri fiyatın iki yanındaki kademeli sanal defterden
+    doldurulur: her kademe level_notional USDT derinliğindedir ve
+    level_spacing kadar uzaktadır. levels kademeye sığmayan kısım
+    gerçekleşmez (Binance'teki gibi status EXPIRED, executedQty eksik).
+    latency saniye (veya (min, max) aralığı) her çağrıyı geciktirir;
+    emir, gecikme sonundaki fiyattan gerçekleşir.
+    """
+
+    def __init__(self, klines, interval='1m', clock=None, balances=None,
+                 fee_rate=BACKTEST_FEE_RATE, latency=0., levels=5,
+                 level_notional=1000., level_spacing=0.0005, spread=0.0002,
+                 filters=None, seed=0):
+        self.interval = interval
+        self.step = interval_to_ms(interval)
+        self._klines = {
+            symbol: np.asarray(rows, dtype=float)
+            for symbol, rows in klines.items()
+        }
+        if clock is None:
+            # Varsayılan: bot ilk istekte tam bir tampon geçmiş görsün
+            first = min(rows[0, TIME] for rows in self._klines.values())
+            clock = ReplayClock(first + KLINE_CACHE_SIZE * self.step)
+        self.clock = clock
+
+        self.fee_rate = fee_rate
+        self.latency = latency
+        self.levels = levels
+        self.level_notional = level_notional
+        self.level_spacing = level_spacing
+        self.spread = spread
+        self._rng = np.random.default_rng(seed)
+
+        self._filters = {}
+        for symbol, rows in self._klines.items():
+            rules = (filters or {}).get(symbol) or default_filters(
+                float(rows[0, CLOSE])
+            )
+            self._filters[symbol] = (rules, SymbolFilters(symbol, rules))
+
+        self._balances = {'USDT': float(INITIAL_BALANCE)}
+        for symbol in self._klines:
+            self._balances.setdefault(self.base_asset(symbol), 0.)
+        self._balances.update(balances or {})
+        self.orders = []
+        self._order_ids = itertools.count(1)
+        self._trade_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def synthetic(cls, symbols, interval='1m', count=10_000, start=None,
+                  **kwargs):
+        """Sembol başına count sentetik mumla borsa kur"""
+        if start is None:
+            step = interval_to_ms(interval)
+            start = (int(time.time() * 1000) // step - count) * step
+        return cls({
+            symbol: synthetic_klines(symbol, interval, start, count)
+            for symbol in symbols
+        }, interval, **kwargs)
+
+    @classmethod
+    def from_history(cls, store, symbols, interval, start=None, end=None,
+                     **kwargs):
+        """HistoryStore'daki kayıtlı mumlarla borsa kur"""
+        return cls({
+            symbol: to_matrix(store.read(symbol, interval, start, end))
+            for symbol in symbols
+        }, interval, **kwargs)
+
+    @staticmethod
+    def base_asset(symbol):
+        return symbol[:-4] if symbol.endswith('USDT') else symbol
+
+    def _delay(self):
+        latency = self.latency
+        if isinstance(latency, tuple):
+            latency = self._rng.uniform(*latency)
+        if latency:
+            time.sleep(latency)
+
+    def _rows(self, symbol):
+        try:
+            return self._klines[symbol]
+        except KeyError:
+            raise api_error(-1121, 'Invalid symbol.')
+
+    def _visible(self, symbol, start_ms, now_ms, end_ms=None):
+        """[start_ms, end_ms] içinde açılmış mumlar; canlı mum now_ms'e kadar kısmi"""
+        rows = self._rows(symbol)
+        lo = rows[:, TIME].searchsorted(start_ms)
+        hi = rows[:, TIME].searchsorted(
+            now_ms if end_ms is None else min(end_ms, now_ms), side='right'
+        )
+        rows = rows[lo:hi].copy()
+        if len(rows) and rows[-1, CLOSE_TIME] >= now_ms:
+            live = rows[-1]
+            fraction = (now_ms - live[TIME]) / self.step
+            price = live[OPEN] + (live[CLOSE] - live[OPEN]) * fraction
+            live[HIGH] = max(live[OPEN], price)
+            live[LOW] = min(live[OPEN], price)
+            live[CLOSE] = price
+            live[[VOLUME, QUOTE_VOLUME, TRADES + 1, TRADES + 2]] *= fraction
+            live[TRADES] = np.floor(live[TRADES] * fraction)
+        return rows
+
+    def _price(self, symbol, now_ms):
+        rows = self._visible(symbol, now_ms - self.step, now_ms)
+        if not len(rows):
+            rows = self._rows(symbol)[:1]
+            if not len(rows) or rows[0, TIME] > now_ms:
+                raise api_error(-1121, 'Invalid symbol.')
+        return float(rows[-1, CLOSE])
+
+    @staticmethod
+    def _aggregate(rows, step):
+        """Taban mumları step'lik mumlarda topla"""
+        keys = rows[:, TIME].astype(np.int64) // step
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        ends = np.concatenate((starts[1:], [len(rows)])) - 1
+        out = np.empty((len(starts), len(KLINE_COLUMNS)))
+        out[:, TIME] = keys[starts] * step
+        out[:, OPEN] = rows[starts, OPEN]
+        out[:, HIGH] = np.maximum.reduceat(rows[:, HIGH], starts)
+        out[:, LOW] = np.minimum.reduceat(rows[:, LOW], starts)
+        out[:, CLOSE] = rows[ends, CLOSE]
+        out[:, CLOSE_TIME] = out[:, TIME] + step - 1
+        for column in (VOLUME, QUOTE_VOLUME, TRADES, TRADES + 1, TRADES + 2):
+            out[:, column] = np.add.reduceat(rows[:, column], starts)
+        return out
+
+    @staticmethod
+    def _format_klines(rows):
+        return [
+            [int(row[TIME]), f"{row[OPEN]:.8f}", f"{row[HIGH]:.8f}",
+             f"{row[LOW]:.8f}", f"{row[CLOSE]:.8f}", f"{row[VOLUME]:.8f}",
+             int(row[CLOSE_TIME]), f"{row[QUOTE_VOLUME]:.8f}",
+             int(row[TRADES]), f"{row[TRADES + 1]:.8f}",
+             f"{row[TRADES + 2]:.8f}", "0"]
+            for row in rows.tolist()
+        ]
+
+    # --- Client arayüzü ---
+
+    def ping(self):
+        return {}
+
+    def get_server_time(self):
+        return {'serverTime': self.clock.now_ms()}
+
+    def get_klines(self, symbol, interval, startTime=None, endTime=None,
+                   limit=500):
+        """Saate kadar açılmış mumlar (taban periyodun katlarında toplanır)"""
+        self._delay()
+        step = interval_to_ms(interval)
+        if step % self.step:
+            raise api_error(-1120, 'Invalid interval.')
+        limit = min(int(limit), MAX_KLINE_LIMIT)
+        now = self.clock.now_ms()
+        end = now if endTime is None else min(int(endTime), now)
+
+        if startTime is not None:
+            start = int(startTime) // step * step
+            end = min(end, start + limit * step - 1)
+        else:
+            start = (end // step - limit + 1) * step
+
+        rows = self._visible(symbol, start, now, end)
+        if step != self.step and len(rows):
+            rows = self._aggregate(rows, step)
+        if startTime is not None:
+            rows = rows[rows[:, TIME] >= int(startTime)]
+        return self._format_klines(rows[-limit:] if startTime is None
+                                   else rows[:limit])
+
+    def _ticker(self, symbol, now):
+        rows = self._visible(symbol, now - DAY_MS + 1, now)
+        if not len(rows):
+            raise api_error(-1121, 'Invalid symbol.')
+        last, open_ = rows[-1, CLOSE], rows[0, OPEN]
+        volume = rows[:, VOLUME].sum()
+        quote_volume = rows[:, QUOTE_VOLUME].sum()
+        return {
+            'symbol': symbol,
+            'priceChange': f"{last - open_:.8f}",
+            'priceChangePercent': f"{(last / open_ - 1) * 100:.3f}",
+            'weightedAvgPrice': f"{quote_volume / volume if volume else last:.8f}",
+            'lastPrice': f"{last:.8f}",
+            'bidPrice': f"{last * (1 - self.spread / 2):.8f}",
+            'askPrice': f"{last * (1 + self.spread / 2):.8f}",
+            'openPrice': f"{open_:.8f}",
+            'highPrice': f"{rows[:, HIGH].max():.8f}",
+            'lowPrice': f"{rows[:, LOW].min():.8f}",
+            'volume': f"{volume:.8f}",
+            'quoteVolume': f"{quote_volume:.8f}",
+            'openTime': int(now - DAY_MS),
+            'closeTime': int(now),
+            'count': int(rows[:, TRADES].sum())
+        }
+
+    def get_ticker(self, symbol=None):
+        """24 saatlik istatistikler (symbol yoksa tüm semboller)"""
+        self._delay()
+        now = self.clock.now_ms()
+        if symbol is not None:
+            return self._ticker(symbol, now)
+        tickers = []
+        for name in self._klines:
+            try:
+                tickers.append(self._ticker(name, now))
+            except BinanceAPIException:
+                continue  # Verisi henüz başlamamış sembol
+        return tickers
+
+    def get_symbol_ticker(self, symbol=None):
+        self._delay()
+        now = self.clock.now_ms()
+        if symbol is not None:
+            return {'symbol': symbol, 'price': f"{self._price(symbol, now):.8f}"}
+        return [
+            {'symbol': name, 'price': f"{self._price(name, now):.8f}"}
+            for name in self._klines
+        ]
+
+    def get_exchange_info(self):
+        self._delay()
+        return {
+            'timezone': 'UTC',
+            'serverTime': self.clock.now_ms(),
+            'rateLimits': [],
+            'symbols': [self._symbol_info(symbol) for symbol in self._klines]
+        }
+
+    def _symbol_info(self, symbol):
+        return {
+            'symbol': symbol,
+            'status': 'TRADING',
+            'baseAsset': self.base_asset(symbol),
+            'quoteAsset': 'USDT',
+            'orderTypes': ['MARKET'],
+            'filters': self._filters[symbol][0]
+        }
+
+    def get_symbol_info(self, symbol):
+        if symbol not in self._klines:
+            return None
+        return self._symbol_info(symbol)
+
+    def get_account(self):
+        self._delay()
+        with self._lock:
+            return {
+                'canTrade': True,
+                'balances': [
+                    {'asset': asset, 'free': f"{free:.8f}",
+                     'locked': '0.00000000'}
+                    for asset, free in self._balances.items()
+                ]
+            }
+
+    def get_asset_balance(self, asset):
+        for balance in self.get_account()['balances']:
+            if balance['asset'].lower() == asset.lower():
+                return balance
+        return None
+
+    def _book_fills(self, side, quantity, mid, filters):
+        """Sanal defterde quantity'yi kademe kademe doldur
+
+        Kademe miktarları step size'a aşağı yuvarlanır; gerçekleşen miktar
+        her zaman lot kuralına uyar.
+        """
+        direction = 1 if side == 'BUY' else -1
+        fills = []
+        remaining = quantity
+        for level in range(self.levels):
+            if remaining <= 0:
+                break
+            price = mid * (1 + direction * (self.spread / 2
+                                            + level * self.level_spacing))
+            qty = float(filters.round_quantity(
+                min(remaining, self.level_notional / price)
+            ))
+            if qty <= 0:
+                break
+            fills.append((qty, price))
+            remaining -= qty
+        return fills
+
+    def create_order(self, symbol, side, type, quantity, **params):
+        """Market emrini sanal defterden doldur (Binance FULL cevabı)"""
+        self._delay()
+        if type != 'MARKET':
+            raise api_error(-1116, 'Invalid orderType.')
+        if side not in ('BUY', 'SELL'):
+            raise api_error(-1117, 'Invalid side.')
+        filters = self._filters.get(symbol, (None, None))[1]
+        if filters is None:
+            raise api_error(-1121, 'Invalid symbol.')
+
+        step = filters.step_size
+        if (_decimal(quantity) < filters.min_qty
+                or (step and _decimal(quantity) % step)):
+            raise api_error(-1013, 'Filter failure: LOT_SIZE')
+        quantity = float(quantity)
+
+        now = self.clock.now_ms()
+        mid = self._price(symbol, now)
+        if quantity * mid < float(filters.min_notional):
+            raise api_error(-1013, 'Filter failure: NOTIONAL')
+
+        base = self.base_asset(symbol)
+        with self._lock:
+            fills = self._book_fills(side, quantity, mid, filters)
+            executed = sum(qty for qty, _ in fills)
+            quote = sum(qty * price for qty, price in fills)
+            fees = [qty * price * self.fee_rate for qty, price in fills]
+
+            if side == 'BUY':
+                if quote + sum(fees) > self._balances['USDT'] + 1e-9:
+                    raise api_error(
+                        -2010,
+                        'Account has insufficient balance for requested action.'
+                    )
+                self._balances['USDT'] -= quote + sum(fees)
+                self._balances[base] += executed
+            else:
+                if quantity > self._balances.get(base, 0.) + 1e-12:
+                    raise api_error(
+                        -2010,
+                        'Account has insufficient balance for requested action.'
+                    )
+                self._balances[base] -= executed
+                self._balances['USDT'] += quote - sum(fees)
+
+            order = {
+                'symbol': symbol,
+                'orderId': next(self._order_ids),
+                'clientOrderId': params.get('newClientOrderId', ''),
+                'transactTime': now,
+                'price': '0.00000000',
+                'origQty': f"{quantity:.8f}",
+                'executedQty': f"{executed:.8f}",
+                'cummulativeQuoteQty': f"{quote:.8f}",
+                'status': ('FILLED' if executed >= quantity * (1 - 1e-12)
+                           else 'EXPIRED'),
+                'timeInForce': 'GTC',
+                'type': type,
+                'side': side,
+                'fills': [
+                    {'price': f"{price:.8f}", 'qty': f"{qty:.8f}",
+                     'commission': f"{fee:.8f}", 'commissionAsset': 'USDT',
+                     'tradeId': next(self._trade_ids)}
+                    for (qty, price), fee in zip(fills, fees)
+                ]
+            }
+            self.orders.append(order)
+        return order
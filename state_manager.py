@@ -2,11 +2,65 @@
 
 import json
 import os
+import threading
 from datetime import datetime
 
+from config import STATE_SNAPSHOT_INTERVAL, STATE_FSYNC
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+STATE_VERSION = 2
+
+
+class TradeRecord(dict):
+    """timestamp'i ilk erişimde datetime'a çeviren işlem kaydı
+
+    Yüklenen kayıtlarda timestamp metin olarak kalır; sadece okunan
+    kayıtlar ayrıştırılır.
+    """
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if key == 'timestamp' and isinstance(value, str):
+            value = datetime.fromisoformat(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
+def _format_time(value):
+    return value.strftime(TIME_FORMAT) if isinstance(value, datetime) else value
+
+
+def _serialize_trade(trade):
+    return {
+        'timestamp': _format_time(dict.__getitem__(trade, 'timestamp')),
+        'symbol': trade['symbol'],
+        'side': trade['side'],
+        'quantity': trade['quantity'],
+        'price': trade['price'],
+        'fee': trade.get('fee', 0.),
+        'net_quantity': trade.get('net_quantity', trade['quantity'])
+    }
+
+
 class StateManager:
-    def __init__(self, filename='bot_state.json'):
+    """Bot durumunu snapshot + sadece eklenen günlük (journal) ile saklar
+
+    Her işlem ve bakiye değişikliği günlük dosyasına tek satır JSON olarak
+    eklenir, dosyanın tamamı yeniden yazılmaz. Günlük snapshot_interval
+    kayda ulaşınca tam durum geçici dosyaya yazılıp os.replace ile
+    snapshot'ın yerine konur ve günlük sıfırlanır. Yüklemede snapshot
+    okunur, ardından günlükteki yeni kayıtlar sırayla uygulanır.
+    """
+
+    def __init__(self, filename='bot_state.json', journal=None,
+                 snapshot_interval=STATE_SNAPSHOT_INTERVAL, fsync=STATE_FSYNC):
         self.filename = filename
+        self.journal = journal or os.path.splitext(filename)[0] + '.journal'
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync
         self.default_state = {
             'current_balance': 30,
             'current_coin': None,
@@ -14,44 +68,151 @@ class StateManager:
             'last_update': None
         }
 
+        self._seq = 0              # Son yazılan günlük kaydının sıra numarası
+        self._journal_records = 0  # Son snapshot'tan beri eklenen kayıt sayısı
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _write(self, record):
+        # self._lock tutularak çağrılır
+        self._seq += 1
+        record['seq'] = self._seq
+        if self._file is None:
+            self._file = open(self.journal, 'a')
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._journal_records += 1
+        return self._journal_records
+
+    def _append(self, record):
+        with self._lock:
+            return self._write(record)
+
+    def append_trade(self, trade, history=None):
+        """İşlemi günlüğe ekle (geçmişin boyutundan bağımsız)
+
+        history verilirse işlem aynı kilit altında ona da eklenir; araya
+        giren bir checkpoint işlemi hem snapshot'a hem günlüğe yazamaz.
+        """
+        record = {'type': 'trade', 'trade': _serialize_trade(trade)}
+        with self._lock:
+            if history is not None:
+                history.append(trade)
+            self._write(record)
+
     def save_state(self, bot_instance):
-        """Bot durumunu kaydet"""
-        state = {
+        """Bakiye ve coin bilgisini günlüğe ekle, gerekirse snapshot al"""
+        count = self._append({
+            'type': 'state',
             'current_balance': bot_instance.current_balance,
             'current_coin': bot_instance.current_coin,
-            'trading_history': [
-                {
-                    'timestamp': trade['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
-                    'symbol': trade['symbol'],
-                    'side': trade['side'],
-                    'quantity': trade['quantity'],
-                    'price': trade['price']
-                }
-                for trade in bot_instance.trading_history
-            ],
-            'last_update': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        with open(self.filename, 'w') as f:
-            json.dump(state, f, indent=4)
+            'last_update': datetime.now().strftime(TIME_FORMAT)
+        })
+        if count >= self.snapshot_interval:
+            self.checkpoint(bot_instance)
+
+    def checkpoint(self, bot_instance):
+        """Tam durumu atomik olarak snapshot'a yaz ve günlüğü sıfırla"""
+        history = bot_instance.trading_history
+        with self._lock:
+            state = {
+                'version': STATE_VERSION,
+                'last_seq': self._seq,
+                'current_balance': bot_instance.current_balance,
+                'current_coin': bot_instance.current_coin,
+                # TradeLedger kayıtları sütunlardan toplu üretir
+                'trading_history': (
+                    history.to_records() if hasattr(history, 'to_records')
+                    else [_serialize_trade(trade) for trade in history]
+                ),
+                'last_update': datetime.now().strftime(TIME_FORMAT)
+            }
+
+            tmp_path = self.filename + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.filename)
+
+            # Snapshot yerindeyse günlükteki kayıtlar artık gereksiz; burada
+            # çökülürse last_seq sayesinde eski kayıtlar tekrar uygulanmaz
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.journal, 'w')
+            self._journal_records = 0
+
+    def _replay(self, state, last_seq):
+        """Günlükteki snapshot sonrası kayıtları duruma uygula"""
+        if not os.path.exists(self.journal):
+            return last_seq, 0
+
+        history = state['trading_history']
+        count = 0
+        valid_end = 0
+        with open(self.journal, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Yarım kalmış son satır (yazarken çökme)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                valid_end += len(line)
+                seq = record.get('seq', 0)
+                if seq <= last_seq:
+                    continue
+                last_seq = seq
+                count += 1
+
+                if record['type'] == 'trade':
+                    history.append(TradeRecord(record['trade']))
+                elif record['type'] == 'state':
+                    state['current_balance'] = record['current_balance']
+                    state['current_coin'] = record['current_coin']
+                    state['last_update'] = record['last_update']
+
+        # Yarım satırı at ki sonraki kayıtlar ona eklenip bozulmasın
+        if valid_end < os.path.getsize(self.journal):
+            with open(self.journal, 'r+b') as f:
+                f.truncate(valid_end)
+        return last_seq, count
 
     def load_state(self):
-        """Kaydedilmiş durumu yükle"""
-        if not os.path.exists(self.filename):
-            return self.default_state
-            
+        """Kaydedilmiş durumu yükle (snapshot + günlük)"""
+        state = {
+            key: (list(value) if isinstance(value, list) else value)
+            for key, value in self.default_state.items()
+        }
+        last_seq = 0
+
         try:
-            with open(self.filename, 'r') as f:
-                state = json.load(f)
-                
-            # Timestamp'leri datetime objesine çevir
-            for trade in state['trading_history']:
-                trade['timestamp'] = datetime.strptime(
-                    trade['timestamp'], 
-                    '%Y-%m-%d %H:%M:%S'
-                )
-                
-            return state
+            if os.path.exists(self.filename):
+                with open(self.filename, 'r') as f:
+                    snapshot = json.load(f)
+                # Eski tam JSON formatı da aynı şekilde okunur (last_seq yok)
+                last_seq = snapshot.pop('last_seq', 0)
+                snapshot.pop('version', None)
+                state.update(snapshot)
+                state['trading_history'] = [
+                    TradeRecord(trade) for trade in state['trading_history']
+                ]
+
+            last_seq, count = self._replay(state, last_seq)
         except Exception as e:
             print(f"Error loading state: {str(e)}")
-            return self.default_state
\ No newline at end of file
+            return self.default_state
+
+        with self._lock:
+            self._seq = last_seq
+            self._journal_records = count
+        return state
+
+    def close(self):
+        """Günlük dosyasını kapat"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
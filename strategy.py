@@ -0,0 +1,20 @@
+# strategy.py
+
+from config import RSI_OVERSOLD, RSI_OVERBOUGHT
+
+# Karar kuralları hem skaler değerlerle (canlı döngü) hem de numpy
+# dizileriyle (toplu değerlendirme) çalışacak şekilde yazılmıştır.
+
+
+def buy_signal(rsi, macd, signal, predicted_price, current_price,
+               oversold=RSI_OVERSOLD):
+    """Alım koşulu: aşırı satım, MACD yukarı kesişim, yükseliş tahmini"""
+    return ((rsi < oversold) & (macd > signal) &
+            (predicted_price > current_price))
+
+
+def sell_signal(rsi, macd, signal, predicted_price, current_price,
+                overbought=RSI_OVERBOUGHT):
+    """Satım koşulu: aşırı alım, MACD aşağı kesişim, düşüş tahmini"""
+    return ((rsi > overbought) & (macd < signal) &
+            (predicted_price < current_price))
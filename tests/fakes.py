@@ -0,0 +1,217 @@
+# tests/fakes.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from kline_store import interval_to_ms
+
+# Testlerde gerçek servislerin yerine kullanılan yerel sunucular
+
+
+class FakeTelegramServer:
+    """Telegram Bot API'nin sendMessage ucunu taklit eden yerel HTTP sunucusu
+
+    telegram.Bot(token, base_url=server.base_url) ile kullanılır. Gelen
+    mesajlar messages listesinde tutulur; delay ile yavaş API, fail_status
+    ile hata cevapları denenebilir.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, delay=0, fail_status=None):
+        self.delay = delay
+        self.fail_status = fail_status
+        self.messages = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/bot"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length).decode()
+                if 'json' in self.headers.get('Content-Type', ''):
+                    params = json.loads(body or '{}')
+                else:
+                    params = {k: v[0] for k, v in parse_qs(body).items()}
+
+                time.sleep(server.delay)
+                if server.fail_status:
+                    self._reply(server.fail_status, {
+                        'ok': False, 'error_code': server.fail_status,
+                        'description': 'Fake error'
+                    })
+                    return
+
+                with server._lock:
+                    server.messages.append(params)
+                    message_id = len(server.messages)
+                self._reply(200, {'ok': True, 'result': {
+                    'message_id': message_id,
+                    'date': int(time.time()),
+                    'chat': {'id': params.get('chat_id', 0), 'type': 'private'},
+                    'text': params.get('text', '')
+                }})
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Sunucuyu arka planda başlat, base_url döndür"""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class FakeKlineServer:
+    """Binance REST'in ping/time/klines uçlarını taklit eden yerel sunucu
+
+    Mumlar rastgele yürüyüşle (sembol ve zamandan belirlenimli) üretilir.
+    Client.API_URL sunucunun api_url'ine ayarlanarak kullanılır.
+    fail_after istekten sonra 500 döner (yarım kalan indirmeyi denemek
+    için); request_count yapılan kline isteklerini sayar. Her cevapta
+    dakikalık ağırlık X-MBX-USED-WEIGHT-1M başlığıyla döner; weight_limit
+    aşılırsa Binance gibi 429 ve Retry-After verilir. delay her kline
+    cevabını geciktirir (saniye). rejections'a eklenen durum kodları
+    (429/418) sıradaki kline isteklerine sırayla, retry_after saniyelik
+    Retry-After ile döner.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, fail_after=None,
+                 weight_limit=None, delay=0, retry_after=1):
+        self.fail_after = fail_after
+        self.weight_limit = weight_limit
+        self.delay = delay
+        self.retry_after = retry_after
+        self.rejections = []
+        self.request_count = 0
+        self._minute = None
+        self.used_weight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def api_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    @staticmethod
+    def klines(symbol, interval, start_time, end_time, limit):
+        """[start_time, end_time] aralığında en fazla limit mum üret"""
+        step = interval_to_ms(interval)
+        first = -(-start_time // step) * step
+        opens = np.arange(first, end_time + 1, step, dtype=np.int64)[:limit]
+        # Fiyat, açılış zamanından türetilir: aynı istek aynı cevabı verir
+        seed = sum(map(ord, symbol))
+        close = 1 + 0.1 * np.sin(opens / (step * 500.) + seed)
+        return [
+            [int(t), f"{c:.8f}", f"{c * 1.01:.8f}", f"{c * 0.99:.8f}",
+             f"{c:.8f}", "1000.0", int(t + step - 1), f"{c * 1000:.8f}",
+             10, "500.0", f"{c * 500:.8f}", "0"]
+            for t, c in zip(opens.tolist(), close.tolist())
+        ]
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                weight = 2 if url.path.endswith('/klines') else 1
+                with server._lock:
+                    minute = int(time.time() // 60)
+                    if minute != server._minute:
+                        server._minute, server.used_weight = minute, 0
+                    server.used_weight += weight
+                    self._used = server.used_weight
+                    limited = (server.weight_limit is not None
+                               and server.used_weight > server.weight_limit)
+                if limited:
+                    self._retry_after = 60 - int(time.time() % 60)
+                    return self._reply(429, {
+                        'code': -1003, 'msg': 'Too many requests.'
+                    })
+                if url.path.endswith('/ping'):
+                    return self._reply(200, {})
+                if url.path.endswith('/time'):
+                    return self._reply(200, {'serverTime': int(time.time() * 1000)})
+                if not url.path.endswith('/klines'):
+                    return self._reply(404, {'code': -1, 'msg': 'Not found'})
+
+                with server._lock:
+                    server.request_count += 1
+                    failing = (server.fail_after is not None
+                               and server.request_count > server.fail_after)
+                    rejected = (server.rejections.pop(0)
+                                if server.rejections else None)
+                if rejected is not None:
+                    self._retry_after = server.retry_after
+                    return self._reply(rejected, {
+                        'code': -1003, 'msg': 'Way too many requests.'
+                    })
+                if failing:
+                    return self._reply(500, {'code': -1000, 'msg': 'Fake error'})
+
+                time.sleep(server.delay)
+                now = int(time.time() * 1000)
+                self._reply(200, server.klines(
+                    params['symbol'], params['interval'],
+                    int(params.get('startTime', 0)),
+                    min(int(params.get('endTime', now)), now),
+                    int(params.get('limit', 500))
+                ))
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.send_header('X-MBX-USED-WEIGHT-1M', str(self._used))
+                if status in (418, 429):
+                    self.send_header('Retry-After', str(self._retry_after))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Sunucuyu arka planda başlat, api_url döndür"""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self.api_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
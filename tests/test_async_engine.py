@@ -0,0 +1,76 @@
+# tests/test_async_engine.py
+
+import asyncio
+
+import pandas as pd
+
+from async_engine import AsyncTradingEngine
+from exchange_info import ExchangeInfoCache
+from simulated_exchange import default_filters
+
+
+class OrderClient:
+    """Emirleri kaydeden, tamamen dolduran AsyncClient yerine geçen istemci"""
+
+    def __init__(self, price):
+        self.price = price
+        self.orders = []
+
+    async def get_exchange_info(self):
+        return {'symbols': [{'symbol': 'ABCUSDT',
+                             'filters': default_filters(self.price)}]}
+
+    async def create_order(self, **params):
+        self.orders.append(params)
+        quantity = float(params['quantity'])
+        return {'executedQty': params['quantity'],
+                'cummulativeQuoteQty': str(quantity * self.price),
+                'fills': [{'qty': params['quantity'], 'price': str(self.price),
+                           'commission': '0', 'commissionAsset': 'USDT'}]}
+
+
+class Performance:
+    def mark(self, symbol, price):
+        pass
+
+
+class Bot:
+    def __init__(self, balance):
+        self.current_balance = balance
+        self.exchange_info = ExchangeInfoCache(None)
+        self.performance = Performance()
+        self.trades = []
+
+    def record_trade(self, *args):
+        self.trades.append(args)
+
+
+def buy_frame():
+    # Aşırı satım ve MACD yukarı kesişim: alım sinyali
+    return pd.DataFrame({'RSI': [20.], 'MACD': [1.], 'Signal': [0.]})
+
+
+def evaluate(balance, price=0.5):
+    bot = Bot(balance)
+    engine = AsyncTradingEngine(bot, ['ABCUSDT'])
+    engine.client = OrderClient(price)
+    state = engine.states['ABCUSDT']
+    order = asyncio.run(engine.evaluate_symbol(
+        state, buy_frame(), price, predicted_price=price * 1.1
+    ))
+    return engine, state, order
+
+
+def test_buy_signal_places_order():
+    engine, state, order = evaluate(30)
+    assert order is not None
+    assert engine.client.orders[0]['quantity'] == '60.0000000'
+    assert state.in_position
+
+
+def test_buy_below_min_notional_is_skipped():
+    # 3 USDT, 5 USDT'lik NOTIONAL altında: emir yok, hata yok
+    engine, state, order = evaluate(3)
+    assert order is None
+    assert engine.client.orders == []
+    assert not state.in_position
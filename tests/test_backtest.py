@@ -0,0 +1,67 @@
+# tests/test_backtest.py
+
+import numpy as np
+import pandas as pd
+
+from backtest import Backtester, position_changes
+from exchange_info import SymbolFilters
+
+# Adımı 1 olan, 25 USDT altı emirleri reddeden kurallar
+FILTERS = SymbolFilters('ABCUSDT', [
+    {'filterType': 'LOT_SIZE', 'minQty': '1', 'maxQty': '1000',
+     'stepSize': '1'},
+    {'filterType': 'NOTIONAL', 'minNotional': '25'},
+])
+
+
+class ScriptedBacktester(Backtester):
+    """Sinyalleri indikatörler yerine verilen dizilerden alan backtester"""
+
+    def __init__(self, close, buy, sell, **kwargs):
+        index = pd.date_range('2024-01-01', periods=len(close), freq='h')
+        super().__init__(pd.DataFrame({'close': close}, index=index),
+                         'ABCUSDT', filters=FILTERS, fee_rate=0.,
+                         slippage=0., initial_balance=30, **kwargs)
+        self._buy = np.array(buy, dtype=bool)
+        self._sell = np.array(sell, dtype=bool)
+
+    def signals(self, oversold=None, overbought=None):
+        return self._buy, self._sell
+
+
+def trades(result):
+    return [(t['side'], t['price'], t['quantity']) for t in result['trades']]
+
+
+def test_position_changes():
+    buy = np.array([0, 1, 1, 0, 0, 1, 0, 0], dtype=bool)
+    sell = np.array([1, 0, 0, 1, 1, 0, 0, 1], dtype=bool)
+    entries, exits = position_changes(buy, sell)
+    assert entries.tolist() == [1, 5]
+    assert exits.tolist() == [3, 7]
+
+
+def test_skipped_buy_retries_on_next_buy_signal():
+    # 16'dan 1 adet = 16 USDT < 25: ilk alım gerçekleşmez. Canlı bot
+    # pozisyona girmediği için 2. mumdaki alım sinyalinde tekrar dener.
+    close = [16., 16., 10., 10., 12., 12.]
+    buy = [1, 0, 1, 0, 0, 0]
+    sell = [0, 0, 0, 0, 1, 0]
+    result = ScriptedBacktester(close, buy, sell).run()
+    assert trades(result) == [('BUY', 10., 3.), ('SELL', 12., 3.)]
+    assert result['metrics']['current_balance'] == 36.
+
+
+def test_consecutive_failed_buys_until_fillable_price():
+    close = [16., 17., 18., 9., 9., 11.]
+    buy = [1, 1, 1, 1, 1, 0]
+    sell = [0, 0, 0, 0, 0, 1]
+    result = ScriptedBacktester(close, buy, sell).run()
+    assert trades(result) == [('BUY', 9., 3.), ('SELL', 11., 3.)]
+
+
+def test_no_fillable_buy_means_no_trades():
+    close = [16., 16., 16.]
+    result = ScriptedBacktester(close, [1, 1, 0], [0, 0, 1]).run()
+    assert trades(result) == []
+    assert result['metrics']['current_balance'] == 30
@@ -0,0 +1,82 @@
+# tests/test_exchange_info.py
+
+from decimal import Decimal
+
+import pytest
+
+from exchange_info import ExchangeInfoCache, SymbolFilters
+
+RULES = [
+    {'filterType': 'PRICE_FILTER', 'minPrice': '0.00010000',
+     'maxPrice': '1000.00000000', 'tickSize': '0.00010000'},
+    {'filterType': 'LOT_SIZE', 'minQty': '0.10000000',
+     'maxQty': '1000.00000000', 'stepSize': '0.10000000'},
+    {'filterType': 'MIN_NOTIONAL', 'minNotional': '5.00000000'},
+]
+
+
+@pytest.fixture
+def filters():
+    return SymbolFilters('ABCUSDT', RULES)
+
+
+def test_quantity_is_floored_to_step_without_float_error(filters):
+    # 0.3 / 0.1 float ile 2.9999999999999996 olur; Decimal ile tam 3 adım
+    assert filters.round_quantity(0.3) == Decimal('0.3')
+    assert filters.round_quantity(0.39) == Decimal('0.3')
+    assert filters.round_price(1.23456) == Decimal('1.2345')
+    assert filters.order_quantity(10, 3) == '3.30000000'
+
+
+def test_quantity_is_formatted_without_exponent():
+    small = SymbolFilters('XYZUSDT', [
+        {'filterType': 'LOT_SIZE', 'minQty': '0.00001000',
+         'maxQty': '100.00000000', 'stepSize': '0.00001000'},
+    ])
+    assert small.format_quantity(0.0000123) == '0.00001000'
+    assert 'e' not in small.order_quantity(0.5, 40000)
+
+
+def test_below_min_qty_raises_instead_of_rounding_up(filters):
+    # 6 USDT 60'lık fiyatta 0.1 adet alamaz; minQty'ye yükseltilmez
+    with pytest.raises(ValueError, match='minQty'):
+        filters.order_quantity(5.9, 60)
+    assert filters.order_quantity(6, 60) == '0.10000000'
+
+
+def test_max_qty_caps_the_order(filters):
+    assert filters.order_quantity(10000, 1) == '1000.00000000'
+
+
+def test_below_min_notional_raises(filters):
+    with pytest.raises(ValueError, match='MIN_NOTIONAL'):
+        filters.order_quantity(4.9, 1)
+    assert filters.order_quantity(5, 1) == '5.0000000'
+
+
+def test_notional_filter_replaces_min_notional():
+    rules = RULES[:2] + [{'filterType': 'NOTIONAL', 'minNotional': '10'}]
+    with pytest.raises(ValueError):
+        SymbolFilters('ABCUSDT', rules).order_quantity(9, 1)
+
+
+class InfoClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get_exchange_info(self):
+        self.calls += 1
+        return {'symbols': [{'symbol': 'ABCUSDT', 'filters': RULES}]}
+
+
+def test_cache_loads_once_until_invalidated():
+    client = InfoClient()
+    cache = ExchangeInfoCache(client, ttl=60)
+    assert cache.order_quantity('ABCUSDT', 10, 3) == '3.30000000'
+    cache.get('ABCUSDT')
+    assert client.calls == 1
+    cache.invalidate()
+    cache.get('ABCUSDT')
+    assert client.calls == 2
+    with pytest.raises(KeyError):
+        cache.get('NONEUSDT')
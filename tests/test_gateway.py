@@ -0,0 +1,189 @@
+# tests/test_gateway.py
+
+import asyncio
+import threading
+import time
+
+import pytest
+from binance.client import AsyncClient, Client
+from binance.exceptions import BinanceAPIException
+
+from gateway import (
+    PRIORITY_BACKGROUND, PRIORITY_CHART, PRIORITY_MARKET_DATA, RestGateway,
+    request_priority
+)
+from tests.fakes import FakeKlineServer
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeKlineServer()
+    monkeypatch.setattr(Client, 'API_URL', server.start())
+    yield server
+    server.stop()
+
+
+def klines(gateway, start, priority=None, done=None, label=None):
+    with request_priority(priority):
+        result = gateway.get_klines(symbol='BTCUSDT', interval='1h',
+                                    startTime=start, limit=5)
+    if done is not None:
+        done.append(label)
+    return result
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def run_queued(gateway, calls):
+    """Tek bağlantı meşgulken calls'u sıraya sok, bitiş sırasını dön
+
+    calls: (etiket, başlangıç zamanı, öncelik, sıraya girmesi beklenir mi)
+    """
+    done = []
+    threads = [threading.Thread(target=klines, args=(gateway, 0))]
+    threads[0].start()
+    assert wait_until(lambda: gateway._active == 1)
+    for label, start, priority, queued in calls:
+        # Sıraya girmeyen istek bekleyen aynı çağrıya katılmış olmalı
+        expected = (len(gateway._waiting) + queued,
+                    gateway.stats['coalesced'] + (not queued))
+        thread = threading.Thread(target=klines,
+                                  args=(gateway, start, priority, done, label))
+        thread.start()
+        threads.append(thread)
+        assert wait_until(lambda: (len(gateway._waiting),
+                                   gateway.stats['coalesced']) == expected)
+    for thread in threads:
+        thread.join()
+    return done
+
+
+def test_identical_requests_share_one_call(server):
+    server.delay = 0.2
+    gateway = RestGateway(Client('key', 'secret'))
+    results = [None] * 5
+
+    def worker(i):
+        results[i] = klines(gateway, 0)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert server.request_count == 1
+    assert gateway.stats['coalesced'] == 4
+    assert all(result is results[0] for result in results)
+
+
+def test_queued_requests_run_in_priority_order(server):
+    server.delay = 0.2
+    gateway = RestGateway(Client('key', 'secret'), pool_size=1)
+    done = run_queued(gateway, [
+        ('background', 1, PRIORITY_BACKGROUND, True),
+        ('chart', 2, PRIORITY_CHART, True),
+        ('market', 3, PRIORITY_MARKET_DATA, True),
+    ])
+    assert done == ['market', 'chart', 'background']
+
+
+def test_joining_request_promotes_queued_call(server):
+    server.delay = 0.2
+    gateway = RestGateway(Client('key', 'secret'), pool_size=1)
+    done = run_queued(gateway, [
+        ('background', 1, PRIORITY_BACKGROUND, True),
+        ('chart', 2, PRIORITY_CHART, True),
+        # Bekleyen arka plan isteğine katılır, onu öne taşır
+        ('market', 1, PRIORITY_MARKET_DATA, False),
+    ])
+    assert done.index('background') < done.index('chart')
+    assert done.index('market') < done.index('chart')
+    assert gateway.stats['promoted'] == 1
+    assert server.request_count == 3
+
+
+def test_rate_limited_request_is_retried_after_pause(server):
+    gateway = RestGateway(Client('key', 'secret'))
+    server.rejections = [429]
+    started = time.monotonic()
+    assert len(klines(gateway, 0)) == 5
+    assert time.monotonic() - started >= server.retry_after * 0.9
+    assert gateway.stats['rate_limited'] == 1
+    assert gateway.stats['retries'] == 1
+
+
+def test_ban_fails_fast_until_it_expires(server):
+    gateway = RestGateway(Client('key', 'secret'))
+    server.rejections = [418]
+    with pytest.raises(BinanceAPIException) as error:
+        klines(gateway, 0)
+    assert error.value.status_code == 418
+
+    # Ban sürerken istek sunucuya gitmeden hata verir
+    with pytest.raises(BinanceAPIException):
+        klines(gateway, 1)
+    assert server.request_count == 1
+    assert gateway.stats['banned'] == 1
+
+    time.sleep(server.retry_after)
+    assert len(klines(gateway, 2)) == 5
+
+
+async def async_gateway(gateway):
+    return gateway.wrap_async(await AsyncClient.create('key', 'secret'))
+
+
+async def async_klines(gateway, start):
+    return await gateway.get_klines(symbol='BTCUSDT', interval='1h',
+                                    startTime=start, limit=5)
+
+
+def test_async_requests_share_one_call(server, monkeypatch):
+    monkeypatch.setattr(AsyncClient, 'API_URL', server.api_url)
+    server.delay = 0.2
+    gateway = RestGateway(Client('key', 'secret'))
+
+    async def run():
+        client = await async_gateway(gateway)
+        try:
+            return await asyncio.gather(
+                *(async_klines(client, 0) for _ in range(5)))
+        finally:
+            await client.close_connection()
+
+    results = asyncio.run(run())
+    assert server.request_count == 1
+    assert gateway.stats['coalesced'] == 4
+    assert all(result is results[0] for result in results)
+    # Cevaptaki X-MBX-USED-WEIGHT-1M ortak bütçeye yazılır
+    assert gateway.used_weight == server.used_weight
+
+
+def test_async_ban_blocks_sync_client(server, monkeypatch):
+    monkeypatch.setattr(AsyncClient, 'API_URL', server.api_url)
+    gateway = RestGateway(Client('key', 'secret'))
+    server.rejections = [418]
+
+    async def run():
+        client = await async_gateway(gateway)
+        try:
+            await async_klines(client, 0)
+        finally:
+            await client.close_connection()
+
+    with pytest.raises(BinanceAPIException) as error:
+        asyncio.run(run())
+    assert error.value.status_code == 418
+
+    # Ban durumu ortak: senkron istek sunucuya gitmeden hata verir
+    with pytest.raises(BinanceAPIException):
+        klines(gateway, 1)
+    assert server.request_count == 1
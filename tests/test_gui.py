@@ -0,0 +1,112 @@
+# tests/test_gui.py
+
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtWidgets = pytest.importorskip('PyQt6.QtWidgets')
+QtCharts = pytest.importorskip('PyQt6.QtCharts')
+
+from gui import TradingBotGUI  # noqa: E402
+from utils import bucket_downsample  # noqa: E402
+
+HOUR = 3_600_000.
+BUDGET = 800
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return (QtWidgets.QApplication.instance()
+            or QtWidgets.QApplication([]))
+
+
+class RecordingSeries(QtCharts.QLineSeries):
+    """Seriye yapılan yazmaları kaydeden QLineSeries"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def replace(self, *args):
+        # replace(index, nokta) tek nokta, replace(noktalar) tüm seri
+        self.calls.append(('replace', args[0]) if len(args) == 2
+                          else ('replace_all',))
+        return super().replace(*args)
+
+    def removePoints(self, index, count):
+        self.calls.append(('remove', index, count))
+        return super().removePoints(index, count)
+
+    def append(self, points):
+        self.calls.append(('append', len(points)))
+        return super().append(points)
+
+    def xy(self):
+        return np.array([(p.x(), p.y()) for p in self.points()])
+
+
+class Chart:
+    """Sadece seri eşitleme yolunu kullanan pencere yerine geçen nesne"""
+
+    _sync_series = TradingBotGUI._sync_series
+    _plot = TradingBotGUI._plot
+
+    def __init__(self):
+        self._plotted = {}
+
+
+def candles(count, seed=0):
+    x = 1.7e12 + np.arange(count) * HOUR
+    y = 100 + np.random.default_rng(seed).normal(size=count).cumsum()
+    return x, y
+
+
+def plotted(x, y):
+    keep = bucket_downsample(x, y, BUDGET)
+    return np.column_stack((x[keep], y[keep]))
+
+
+def test_tick_replaces_only_the_live_candle():
+    chart, series = Chart(), RecordingSeries()
+    x, y = candles(10_000)
+    chart._plot(series, x, y, BUDGET)
+    size = len(series.points())
+    series.calls.clear()
+
+    # Canlı mumun kapanışı değişti
+    y = y.copy()
+    y[-1] += 5
+    chart._plot(series, x, y, BUDGET)
+
+    assert series.calls == [('replace', size - 1)]
+    np.testing.assert_array_equal(series.xy(), plotted(x, y))
+
+
+@pytest.mark.parametrize('slide', [False, True])
+def test_new_candle_is_a_single_update(slide):
+    chart, series = Chart(), RecordingSeries()
+    x, y = candles(10_100)
+    chart._plot(series, x[:10_000], y[:10_000], BUDGET)
+    appends = 0
+    for count in range(10_001, 10_100):
+        # Depo doluysa en eski mum düşer (pencere kayar), değilse büyür
+        window = slice(count - 10_000 if slide else 0, count)
+        series.calls.clear()
+        chart._plot(series, x[window], y[window], BUDGET)
+        assert len(series.calls) == 1
+        appends += series.calls == [('append', 1)]
+        np.testing.assert_array_equal(series.xy(),
+                                      plotted(x[window], y[window]))
+    # Kova kapanmadıkça ve baştaki kova düşmedikçe sadece bir ekleme
+    assert appends > 50
+
+
+def test_short_series_is_not_downsampled():
+    chart, series = Chart(), RecordingSeries()
+    x, y = candles(300)
+    y[:14] = np.nan  # RSI ısınması
+    chart._plot(series, x, y, BUDGET)
+    np.testing.assert_array_equal(series.xy(),
+                                  np.column_stack((x[14:], y[14:])))
@@ -0,0 +1,117 @@
+# tests/test_history_store.py
+
+import os
+
+import numpy as np
+import pytest
+from binance.client import Client
+from binance.exceptions import BinanceAPIException
+
+from history_store import KLINE_DTYPE, HistoryDownloader, HistoryStore, _to_ms
+from kline_store import KLINE_COLUMNS, interval_to_ms, parse_klines
+from tests.fakes import FakeKlineServer
+
+SYMBOL = 'BTCUSDT'
+INTERVAL = '1h'
+STEP = interval_to_ms(INTERVAL)
+START = '2024-01-01'
+END = '2024-03-01'  # Ocak + Şubat: 1440 saatlik mum, iki bölüm
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeKlineServer()
+    monkeypatch.setattr(Client, 'API_URL', server.start())
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path))
+
+
+def expected_rows(start=START, end=END):
+    start_ms, end_ms = _to_ms(start), _to_ms(end)
+    count = (end_ms - start_ms) // STEP
+    return parse_klines(FakeKlineServer.klines(
+        SYMBOL, INTERVAL, start_ms, end_ms - 1, count
+    ))
+
+
+def stored_rows(store):
+    records = store.read(SYMBOL, INTERVAL)
+    return np.column_stack([records[name] for name in KLINE_COLUMNS])
+
+
+def test_download_partitions_by_month(server, store):
+    downloader = HistoryDownloader(Client('key', 'secret'), store)
+    assert downloader.download(SYMBOL, INTERVAL, START, END) == 1440
+
+    assert store.months(SYMBOL, INTERVAL) == ['2024-01', '2024-02']
+    np.testing.assert_array_equal(stored_rows(store), expected_rows())
+    # 1000'lik sayfalarla iki istek
+    assert server.request_count == 2
+
+
+def test_download_resumes_after_failure(server, store):
+    server.fail_after = 1
+    downloader = HistoryDownloader(Client('key', 'secret'), store)
+    with pytest.raises(BinanceAPIException):
+        downloader.download(SYMBOL, INTERVAL, START, END)
+    assert len(store.read(SYMBOL, INTERVAL)) == 1000
+
+    server.fail_after = None
+    server.request_count = 0
+    assert downloader.download(SYMBOL, INTERVAL, START, END) == 440
+    assert server.request_count == 1  # Sadece eksik kısım istendi
+    np.testing.assert_array_equal(stored_rows(store), expected_rows())
+
+
+def test_torn_final_record_is_discarded(server, store):
+    downloader = HistoryDownloader(Client('key', 'secret'), store)
+    downloader.download(SYMBOL, INTERVAL, START, '2024-02-10')
+    path = os.path.join(store._dir(SYMBOL, INTERVAL), '2024-02.bin')
+    size = os.path.getsize(path)
+    # Yazılırken çökmüş bir kaydın ilk 40 byte'ı
+    with open(path, 'ab') as f:
+        f.write(b'\x01' * 40)
+
+    # Yarım kayıt okunmaz ve sonraki eklemede kesilir
+    assert store.last_timestamp(SYMBOL, INTERVAL) == _to_ms('2024-02-10') - STEP
+    downloader.download(SYMBOL, INTERVAL, START, END)
+    assert os.path.getsize(path) % KLINE_DTYPE.itemsize == 0
+    assert os.path.getsize(path) > size
+    np.testing.assert_array_equal(stored_rows(store), expected_rows())
+
+
+def test_read_is_a_memmap_view(server, store):
+    HistoryDownloader(Client('key', 'secret'), store).download(
+        SYMBOL, INTERVAL, START, END)
+
+    february = store.read(SYMBOL, INTERVAL, '2024-02-01', '2024-02-03')
+    assert isinstance(february, np.memmap)
+    assert february.base is not None  # Dosya eşlemesinin dilimi, kopya değil
+    assert len(february) == 48
+    np.testing.assert_array_equal(
+        february['timestamp'],
+        np.arange(_to_ms('2024-02-01'), _to_ms('2024-02-03'), STEP)
+    )
+
+    # Aylar arası aralık birleştirilir
+    both = store.read(SYMBOL, INTERVAL, '2024-01-31', '2024-02-02')
+    assert len(both) == 48
+    assert both['timestamp'][0] == _to_ms('2024-01-31')
+
+
+def test_tail_spans_partitions(server, store):
+    HistoryDownloader(Client('key', 'secret'), store).download(
+        SYMBOL, INTERVAL, START, END)
+    expected = expected_rows()
+
+    tail = store.tail(SYMBOL, INTERVAL, 700)  # Şubat 696 mum + Ocak'tan 4
+    np.testing.assert_array_equal(tail, expected[-700:])
+    np.testing.assert_array_equal(store.tail(SYMBOL, INTERVAL, 10),
+                                  expected[-10:])
+    assert store.tail(SYMBOL, INTERVAL, 5000).shape == expected.shape
+    assert store.tail('NONE', INTERVAL, 10).shape == (0, len(KLINE_COLUMNS))
@@ -0,0 +1,75 @@
+# tests/test_indicators.py
+
+import numpy as np
+import pandas as pd
+
+from utils import (
+    IncrementalIndicators, calculate_indicator_matrix,
+    calculate_technical_indicators
+)
+
+
+def _closes(count, seed=0):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    # Sabit kalan fiyatlar ewm'in prev == value dalını da dener
+    if count > 45:
+        closes[40:45] = closes[40]
+    return closes
+
+
+def _reference(closes):
+    frame = calculate_technical_indicators(pd.DataFrame({'close': closes}))
+    return frame[['RSI', 'MACD', 'Signal']].to_numpy()
+
+
+def test_streamed_updates_match_batch():
+    closes = _closes(200)
+    engine = IncrementalIndicators()
+    streamed = np.array([engine.update(i, c) for i, c in enumerate(closes)])
+    np.testing.assert_allclose(streamed, _reference(closes), rtol=1e-12,
+                               atol=1e-12, equal_nan=True)
+
+
+def test_live_candle_revisions_match_batch():
+    closes = _closes(120, seed=1)
+    rng = np.random.default_rng(2)
+    engine = IncrementalIndicators()
+    streamed = []
+    for i, close in enumerate(closes):
+        # Canlı mum kapanmadan önce birkaç kez farklı fiyatlarla güncellenir
+        for revision in close * (1 + rng.normal(0, 0.02, 3)):
+            values = engine.update(i, revision)
+            expected = _reference(np.append(closes[:i], revision))[-1]
+            np.testing.assert_allclose(values, expected, rtol=1e-12,
+                                       atol=1e-12, equal_nan=True)
+        streamed.append(engine.update(i, close))
+    np.testing.assert_allclose(np.array(streamed), _reference(closes),
+                               rtol=1e-12, atol=1e-12, equal_nan=True)
+    assert engine.values == tuple(streamed[-1])
+
+
+def test_out_of_order_candle_is_rejected():
+    engine = IncrementalIndicators()
+    engine.update(10, 1.0)
+    try:
+        engine.update(9, 1.0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("older candle was accepted")
+
+
+def test_indicator_matrix_matches_batch_per_row():
+    closes = np.full((3, 150), np.nan)
+    closes[0] = _closes(150, seed=3)
+    closes[1, 50:] = _closes(100, seed=4)  # Kısa geçmiş, başı NaN
+    closes[2, 140:] = _closes(10, seed=5)  # RSI periyodundan kısa
+    matrix = calculate_indicator_matrix(closes)
+    for row in range(3):
+        valid = ~np.isnan(closes[row])
+        expected = _reference(closes[row][valid])
+        actual = np.column_stack([matrix[name][row][valid]
+                                  for name in ('RSI', 'MACD', 'Signal')])
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9,
+                                   equal_nan=True)
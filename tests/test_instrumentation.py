@@ -0,0 +1,39 @@
+# tests/test_instrumentation.py
+
+import json
+from urllib.request import urlopen
+
+from instrumentation import Instrumentation, MetricsServer
+
+
+def test_label_values_are_escaped():
+    registry = Instrumentation(enabled=True)
+    registry.increment('errors_total', type='Bad "quote" \\ path\nline')
+    text = registry.prometheus_text()
+    assert ('errors_total{type="Bad \\"quote\\" \\\\ path\\nline"} 1'
+            in text.splitlines())
+
+
+def test_span_records_histogram():
+    registry = Instrumentation(enabled=True)
+    with registry.span('predict', symbol='BTCUSDT'):
+        pass
+    text = registry.prometheus_text()
+    assert 'stage="predict"' in text
+    assert 'symbol="BTCUSDT"' in text
+
+
+def test_metrics_server_binds_to_loopback_by_default():
+    registry = Instrumentation(enabled=True)
+    registry.set_gauge('binance_used_weight', 12)
+    server = MetricsServer(registry, port=0)
+    server.start()
+    try:
+        assert server._server.server_address[0] == '127.0.0.1'
+        url = f'http://127.0.0.1:{server.port}'
+        with urlopen(f'{url}/metrics') as response:
+            assert b'binance_used_weight 12' in response.read()
+        with urlopen(f'{url}/metrics.json') as response:
+            assert json.load(response)
+    finally:
+        server.stop()
@@ -0,0 +1,163 @@
+# tests/test_market_data.py
+
+import threading
+import time
+
+from kline_store import KlineStore, interval_to_ms
+from market_data import MarketDataFeed, ReplayServer
+from tests.fakes import FakeKlineServer
+
+STEP = interval_to_ms('1h')
+
+
+class KlineClient:
+    """get_klines çağrılarını kaydeden, FakeKlineServer mumları dönen istemci"""
+
+    def __init__(self, gate=None):
+        self.calls = []
+        self.gate = gate
+
+    def get_klines(self, symbol, interval, limit, startTime=None):
+        self.calls.append((symbol, interval, startTime, limit))
+        if self.gate is not None:
+            self.gate.wait(5)
+        end = int(time.time() * 1000)
+        start = startTime if startTime is not None else end - limit * STEP
+        return FakeKlineServer.klines(symbol, interval, start, end, limit)
+
+
+def kline_message(open_time, close, closed=False):
+    return {'stream': 'btcusdt@kline_1h', 'data': {'e': 'kline', 'k': {
+        's': 'BTCUSDT', 'i': '1h', 't': open_time, 'T': open_time + STEP - 1,
+        'o': '1', 'h': '2', 'l': '0.5', 'c': str(close), 'v': '10',
+        'q': '10', 'n': 5, 'V': '5', 'Q': '5', 'x': closed
+    }}}
+
+
+def book_message(bid, ask):
+    return {'stream': 'btcusdt@bookTicker',
+            'data': {'u': 1, 's': 'BTCUSDT', 'b': str(bid), 'B': '1',
+                     'a': str(ask), 'A': '1'}}
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def live_open_time():
+    return int(time.time() * 1000) // STEP * STEP
+
+
+def start_feed(server, client):
+    store = KlineStore(client, capacity=100)
+    feed = MarketDataFeed(store, url=server.start(), reconnect_delay=0.05)
+    feed.subscribe('BTCUSDT', '1h')
+    feed.start()
+    return store, feed
+
+
+def test_connected_only_after_backfill():
+    gate = threading.Event()
+    client = KlineClient(gate)
+    server = ReplayServer([book_message(1.0, 1.2)])
+    store, feed = start_feed(server, client)
+    try:
+        assert wait_until(lambda: client.calls)
+        time.sleep(0.1)
+        assert not feed.is_connected
+        assert not feed.is_streaming('BTCUSDT', '1h')
+        gate.set()
+        assert wait_until(lambda: feed.is_connected)
+        assert feed.is_streaming('BTCUSDT', '1h')
+        assert len(store.get_buffer('BTCUSDT', '1h')) == 100
+    finally:
+        gate.set()
+        feed.stop()
+        server.stop()
+
+
+def test_reconnect_backfills_and_streams_candles():
+    live = live_open_time()
+    messages = [
+        book_message(1.0, 1.2),
+        kline_message(live, 1.5),
+        kline_message(live, 1.7, closed=True),
+        book_message(2.0, 2.2),
+    ]
+    client = KlineClient()
+    server = ReplayServer(messages, disconnect_after=2)
+    store, feed = start_feed(server, client)
+    try:
+        assert wait_until(lambda: feed.get_price('BTCUSDT') == 2.1)
+        assert server.connections >= 2
+        # İlk bağlantıda tam geçmiş, yeniden bağlanınca sadece eksik kısım
+        assert client.calls[0][2] is None
+        assert any(call[2] is not None for call in client.calls[1:])
+
+        last = store.get_buffer('BTCUSDT', '1h').last_row()
+        assert last[0] == live
+        assert last[4] == 1.7
+    finally:
+        feed.stop()
+        server.stop()
+
+
+def test_subscribe_while_connected_sends_subscribe_and_backfills():
+    client = KlineClient()
+    server = ReplayServer([book_message(1.0, 1.2)])
+    store, feed = start_feed(server, client)
+    try:
+        assert wait_until(lambda: feed.is_connected)
+        feed.subscribe('ETHUSDT', '1h')
+        assert wait_until(lambda: 'ethusdt@kline_1h' in server.subscriptions)
+        assert wait_until(lambda: len(store.get_buffer('ETHUSDT', '1h')))
+    finally:
+        feed.stop()
+        server.stop()
+
+
+def test_refresh_does_not_block_stream_merges():
+    gate = threading.Event()
+    client = KlineClient()
+    store = KlineStore(client, capacity=100)
+    store.refresh('BTCUSDT', '1h')
+
+    client.gate = gate
+    worker = threading.Thread(target=store.refresh, args=('BTCUSDT', '1h'))
+    worker.start()
+    try:
+        assert wait_until(lambda: len(client.calls) == 2)
+        # REST çağrısı sürerken akıştan gelen mum beklemeden işlenmeli
+        merged = threading.Event()
+        live = live_open_time()
+        threading.Thread(target=lambda: (
+            store.merge('BTCUSDT', '1h', FakeKlineServer.klines(
+                'BTCUSDT', '1h', live, live, 1)),
+            merged.set()
+        )).start()
+        assert merged.wait(1)
+    finally:
+        gate.set()
+        worker.join()
+    assert store.get_buffer('BTCUSDT', '1h').last_row()[0] == live
+
+
+def test_offline_feed_never_connects():
+    feed = MarketDataFeed(KlineStore(KlineClient()), url=None)
+    feed.subscribe('BTCUSDT', '1h')
+    feed.start()
+    try:
+        assert feed._thread is None
+        assert not feed.is_streaming('BTCUSDT', '1h')
+        assert feed.get_price('BTCUSDT') is None
+        # Mum gelmez: bekleme zaman aşımıyla biter, döngüyü döndürmez
+        started = time.monotonic()
+        assert not feed.wait_for_candle('BTCUSDT', 0.2)
+        assert time.monotonic() - started >= 0.2
+    finally:
+        feed.stop()
@@ -0,0 +1,69 @@
+# tests/test_metrics.py
+
+from datetime import datetime
+
+import pytest
+
+from metrics import PerformanceTracker, order_costs
+from state_manager import StateManager
+from trade_ledger import TradeLedger
+
+# Emirler (sembol, yön, fill'ler); fill: (miktar, fiyat, komisyon, varlık)
+ORDERS = [
+    ('ABCUSDT', 'BUY', [(60., 0.50, 0.06, 'ABC'), (40., 0.51, 0.04, 'ABC')]),
+    ('XYZUSDT', 'BUY', [(10., 2.0, 0.02, 'USDT')]),
+    ('ABCUSDT', 'SELL', [(50., 0.55, 0.0275, 'USDT')]),
+    ('ABCUSDT', 'SELL', [(49.9, 0.48, 0.024, 'USDT')]),
+    ('XYZUSDT', 'SELL', [(10., 2.2, 0.0022, 'BNB')]),
+]
+
+
+def trade_record(symbol, side, fills):
+    """bot.record_trade'in kaydettiği satır"""
+    executed = sum(qty for qty, _, _, _ in fills)
+    fee, net_quantity = order_costs(symbol, side, fills)
+    return {
+        'timestamp': datetime(2024, 1, 1), 'symbol': symbol, 'side': side,
+        'quantity': executed,
+        'price': sum(qty * price for qty, price, _, _ in fills) / executed,
+        'fee': fee, 'net_quantity': net_quantity
+    }
+
+
+def test_order_costs():
+    assert order_costs(*ORDERS[0]) == pytest.approx((0., 99.9))
+    assert order_costs(*ORDERS[2]) == pytest.approx((0.0275, 50.))
+    # Başka varlıkta (BNB) ödenen komisyon ücrete de miktara da yansımaz
+    assert order_costs(*ORDERS[4]) == pytest.approx((0., 10.))
+
+
+def test_metrics_rebuilt_from_saved_history_match_live(tmp_path):
+    live = PerformanceTracker(initial_equity=100)
+    manager = StateManager(str(tmp_path / 'state.json'))
+    history = TradeLedger()
+    for symbol, side, fills in ORDERS:
+        live.on_order(symbol, side, fills)
+        manager.append_trade(trade_record(symbol, side, fills), history)
+    manager.close()
+
+    manager = StateManager(str(tmp_path / 'state.json'))
+    ledger = TradeLedger.from_records(manager.load_state()['trading_history'])
+    manager.close()
+    rebuilt = PerformanceTracker(initial_equity=100)
+    for symbol, side, quantity, price, fee in ledger.iterfills():
+        rebuilt.on_fill(symbol, side, quantity, price, fee)
+
+    expected = live.snapshot()
+    actual = rebuilt.snapshot()
+    for key in ('total_profit', 'fees', 'win_rate', 'closed_trades',
+                'equity', 'max_drawdown'):
+        assert actual[key] == pytest.approx(expected[key]), key
+    assert actual['open_positions'] == pytest.approx(expected['open_positions'])
+
+
+def test_old_records_without_fees_replay_gross():
+    ledger = TradeLedger.from_records([
+        {'timestamp': '2024-01-01 00:00:00', 'symbol': 'ABCUSDT',
+         'side': 'BUY', 'quantity': 10., 'price': 1.}
+    ])
+    assert list(ledger.iterfills()) == [('ABCUSDT', 'BUY', 10., 1., 0.)]
@@ -0,0 +1,55 @@
+# tests/test_model_registry.py
+
+import numpy as np
+import pytest
+
+from model_registry import ModelRegistry
+
+
+class ArrayModel:
+    """export_numpy ile sabit ağırlıklar yazan model"""
+
+    def __init__(self, value=1.):
+        self.value = value
+
+    def export_numpy(self, path):
+        np.savez(path, scaler_min=np.zeros(5), scaler_scale=np.ones(5),
+                 sequence_length=60,
+                 dense2_bias=np.full(1, self.value, dtype=np.float32))
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(root=str(tmp_path), backend='numpy')
+
+
+def test_save_and_get(registry):
+    assert registry.get('BTCUSDT', '1h') is None
+    assert registry.save('BTCUSDT', '1h', ArrayModel(2.)) == 1
+    model = registry.get('BTCUSDT', '1h')
+    assert model.weights['dense2_bias'][0] == 2.
+    assert not registry.is_stale('BTCUSDT', '1h')
+
+
+@pytest.mark.parametrize('value', [np.nan, np.inf])
+def test_non_finite_weights_are_not_saved(registry, value):
+    with pytest.raises(ValueError):
+        registry.save('BTCUSDT', '1h', ArrayModel(value))
+    assert registry.versions('BTCUSDT', '1h') == []
+    assert registry.get('BTCUSDT', '1h') is None
+
+
+def test_stored_non_finite_version_is_skipped(registry):
+    registry.save('BTCUSDT', '1h', ArrayModel(1.))
+    # Düzeltmeden önce kaydedilmiş NaN ağırlıklı sürüm
+    version = registry.save('BTCUSDT', '1h', ArrayModel(1.))
+    ArrayModel(np.nan).export_numpy(
+        registry._version_dir('BTCUSDT', '1h', version) + '/weights.npz')
+
+    model = registry.get('BTCUSDT', '1h')
+    assert model.weights['dense2_bias'][0] == 1.
+    assert registry.latest_version('BTCUSDT', '1h') == 1
+    with pytest.raises(ValueError):
+        registry.activate('BTCUSDT', '1h', version)
+    # Yeni sürüm numarası geçersiz klasörle çakışmaz
+    assert registry.save('BTCUSDT', '1h', ArrayModel(3.)) == 3
@@ -0,0 +1,57 @@
+# tests/test_models.py
+
+import numpy as np
+import pytest
+
+from config import SEQUENCE_LENGTH
+from history_store import HistoryStore, _to_ms, to_records
+from kline_store import KlineStore, parse_klines
+from tests.fakes import FakeKlineServer
+
+models = pytest.importorskip('models')
+
+
+class KlineClient:
+    def get_klines(self, symbol, interval, limit, startTime=None):
+        return FakeKlineServer.klines(symbol, interval, 0,
+                                      limit * 3_600_000, limit)
+
+
+@pytest.fixture(scope='module')
+def store_frame():
+    # Canlı botun eğittiği çerçeve: ilk satırlarda RSI NaN
+    store = KlineStore(KlineClient(), capacity=500)
+    df = store.get_dataframe('BTCUSDT', '1h')
+    assert df['RSI'].isna().any()
+    return df
+
+
+def test_prepare_data_drops_warmup_rows(store_frame):
+    model = models.PricePredictionModel()
+    X, y = model.prepare_data(store_frame)
+    valid = store_frame.dropna()
+    assert len(X) == len(valid) - SEQUENCE_LENGTH
+    assert np.isfinite(X).all() and np.isfinite(y).all()
+    assert model.scaler.data_min_[2] == valid['RSI'].min()
+
+
+def test_streamed_windows_match_prepare_data(tmp_path):
+    history = HistoryStore(str(tmp_path))
+    start, end = _to_ms('2024-01-01'), _to_ms('2024-03-01')
+    history.append('BTCUSDT', '1h', to_records(parse_klines(
+        FakeKlineServer.klines('BTCUSDT', '1h', start, end - 1, 1440))))
+
+    model = models.PricePredictionModel()
+    X, y = model.prepare_data(history.load_frame('BTCUSDT', '1h'))
+
+    # Ay ay akış: ilk parçanın ısınma satırları NaN
+    factory = history.chunk_factory('BTCUSDT', '1h')
+    model.fit_scaler_streaming(factory)
+    batches = list(model.make_dataset(factory, batch_size=256)
+                   .as_numpy_iterator())
+    streamed_X = np.concatenate([batch[0] for batch in batches])
+    streamed_y = np.concatenate([batch[1] for batch in batches])
+
+    assert np.isfinite(streamed_X).all()
+    np.testing.assert_allclose(streamed_X, X, atol=1e-5)
+    np.testing.assert_allclose(streamed_y, y, atol=1e-5)
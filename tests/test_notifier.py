@@ -0,0 +1,128 @@
+# tests/test_notifier.py
+
+import threading
+import time
+
+import telegram
+
+from notifier import NotificationDispatcher
+from tests.fakes import FakeTelegramServer
+
+
+class BlockingSink:
+    """İlk mesajda gate açılana kadar bekleyen, gelenleri kaydeden sink"""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.received = []
+
+    def __call__(self, payload):
+        self.started.set()
+        self.gate.wait(5)
+        self.received.append(payload)
+
+
+def test_repeated_errors_are_coalesced_into_summary():
+    received = []
+    dispatcher = NotificationDispatcher(received.append, rate=None,
+                                        coalesce_window=60)
+    for _ in range(5):
+        dispatcher.notify('boom', kind='error')
+    dispatcher.notify('other', kind='error')
+    dispatcher.stop()
+
+    assert received == ['boom', 'other', 'boom (repeated 4 more times)']
+    assert dispatcher.stats['coalesced'] == 4
+    assert dispatcher.stats['sent'] == 3
+
+
+def test_rate_limit_spaces_out_deliveries():
+    times = []
+    dispatcher = NotificationDispatcher(lambda _: times.append(time.monotonic()),
+                                        rate=20, burst=1)
+    for i in range(5):
+        dispatcher.notify(i)
+    dispatcher.stop()
+
+    assert len(times) == 5
+    # İlk mesaj jetonla hemen gider, kalan dördü 1/20 saniye arayla
+    assert times[-1] - times[0] >= 4 / 20 * 0.9
+
+
+def test_drop_oldest_keeps_newest_messages():
+    sink = BlockingSink()
+    dispatcher = NotificationDispatcher(sink, maxsize=2, rate=None)
+    dispatcher.notify('first')
+    assert sink.started.wait(1)  # 'first' sink'te bekliyor, kuyruk boş
+    for payload in ('a', 'b', 'c', 'd'):
+        assert dispatcher.notify(payload)
+    sink.gate.set()
+    dispatcher.stop()
+
+    assert sink.received == ['first', 'c', 'd']
+    assert dispatcher.stats['dropped'] == 2
+
+
+def test_drop_new_rejects_when_full():
+    sink = BlockingSink()
+    dispatcher = NotificationDispatcher(sink, maxsize=2, rate=None,
+                                        drop_policy='drop_new')
+    dispatcher.notify('first')
+    assert sink.started.wait(1)
+    results = [dispatcher.notify(payload) for payload in ('a', 'b', 'c')]
+    sink.gate.set()
+    dispatcher.stop()
+
+    assert results == [True, True, False]
+    assert sink.received == ['first', 'a', 'b']
+
+
+def test_restart_after_stop():
+    received = []
+    dispatcher = NotificationDispatcher(received.append, rate=None)
+    dispatcher.notify('before')
+    dispatcher.stop()
+    dispatcher.start()
+    dispatcher.notify('after')
+    dispatcher.stop()
+    assert received == ['before', 'after']
+
+
+def test_delivers_through_telegram_api():
+    server = FakeTelegramServer(delay=0.05)
+    bot = telegram.Bot('123:fake', base_url=server.start())
+    dispatcher = NotificationDispatcher(
+        lambda text: bot.send_message(chat_id=42, text=text), rate=None
+    )
+    try:
+        started = time.monotonic()
+        for i in range(3):
+            dispatcher.notify(f'message {i}')
+        # Yavaş API notify'ı bekletmez
+        assert time.monotonic() - started < 0.05
+        dispatcher.stop()
+    finally:
+        server.stop()
+
+    assert [m['text'] for m in server.messages] == [
+        'message 0', 'message 1', 'message 2'
+    ]
+    assert all(str(m['chat_id']) == '42' for m in server.messages)
+    assert dispatcher.stats['sent'] == 3
+
+
+def test_failed_delivery_is_counted():
+    server = FakeTelegramServer(fail_status=400)
+    bot = telegram.Bot('123:fake', base_url=server.start())
+    dispatcher = NotificationDispatcher(
+        lambda text: bot.send_message(chat_id=42, text=text), rate=None
+    )
+    try:
+        dispatcher.notify('lost')
+        dispatcher.stop()
+    finally:
+        server.stop()
+
+    assert dispatcher.stats == {'sent': 0, 'failed': 1, 'dropped': 0,
+                                'coalesced': 0}
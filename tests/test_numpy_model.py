@@ -0,0 +1,51 @@
+# tests/test_numpy_model.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import FEATURES, SEQUENCE_LENGTH
+from numpy_model import NumpyPricePredictor
+
+models = pytest.importorskip('models')
+
+
+@pytest.fixture(scope='module')
+def keras_model():
+    rng = np.random.default_rng(0)
+    model = models.PricePredictionModel()
+    # Varsayılan başlatma çıktıları sıfıra yakın tutar; farkları görmek
+    # için daha geniş rastgele ağırlıklar
+    model.model.set_weights([
+        rng.normal(0, 0.3, weights.shape).astype(np.float32)
+        for weights in model.model.get_weights()
+    ])
+    frame = pd.DataFrame(rng.uniform(1, 100, (200, len(FEATURES))),
+                         columns=FEATURES)
+    model.scaler.fit(frame.values)
+    return model, frame
+
+
+def test_forward_matches_keras(keras_model, tmp_path):
+    model, _ = keras_model
+    path = tmp_path / 'weights.npz'
+    model.export_numpy(path)
+    predictor = NumpyPricePredictor.load(path)
+
+    X = np.random.default_rng(1).uniform(
+        0, 1, (8, SEQUENCE_LENGTH, len(FEATURES))).astype(np.float32)
+    np.testing.assert_allclose(predictor.forward(X),
+                               model.model.predict(X, verbose=0),
+                               rtol=1e-4, atol=1e-5)
+
+
+def test_predict_batch_matches_keras(keras_model, tmp_path):
+    model, frame = keras_model
+    path = tmp_path / 'weights.npz'
+    model.export_numpy(path)
+    predictor = NumpyPricePredictor.load(path)
+
+    frames = [frame.iloc[:100], frame.iloc[50:150], frame]
+    np.testing.assert_allclose(predictor.predict_batch(frames),
+                               model.predict_batch(frames),
+                               rtol=1e-4, atol=1e-4)
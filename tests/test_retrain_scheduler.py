@@ -0,0 +1,49 @@
+# tests/test_retrain_scheduler.py
+
+import math
+
+import numpy as np
+import pytest
+
+from kline_store import KlineStore
+from model_registry import ModelRegistry
+from retrain_scheduler import RetrainScheduler, train_and_save
+from tests.fakes import FakeKlineServer
+
+models = pytest.importorskip('models')
+
+
+class KlineClient:
+    def get_klines(self, symbol, interval, limit, startTime=None):
+        return FakeKlineServer.klines(symbol, interval, 0,
+                                      limit * 3_600_000, limit)
+
+
+class FreshRegistry:
+    root = None
+
+    def is_stale(self, symbol, interval):
+        return False
+
+
+def test_retrained_model_predicts_finite(tmp_path, monkeypatch):
+    monkeypatch.setattr(models, 'EPOCHS', 1)
+    df = KlineStore(KlineClient(), capacity=500).get_dataframe('BTCUSDT', '1h')
+    assert df['RSI'].isna().any()  # Isınma satırları eğitim çerçevesinde
+
+    version = train_and_save('BTCUSDT', '1h', df, str(tmp_path))
+    model = ModelRegistry(root=str(tmp_path), backend='numpy').get(
+        'BTCUSDT', '1h')
+    assert version == 1
+    assert all(np.isfinite(value).all() for value in model.weights.values())
+    assert np.isfinite(model.predict(df))
+
+
+def test_non_finite_prediction_requests_retrain():
+    scheduler = RetrainScheduler(FreshRegistry())
+    df = KlineStore(KlineClient(), capacity=100).get_dataframe('BTCUSDT', '1h')
+    assert not scheduler.should_retrain('BTCUSDT', '1h')
+
+    scheduler.observe('BTCUSDT', '1h', df, float('nan'))
+    assert scheduler.drift('BTCUSDT', '1h') == math.inf
+    assert scheduler.should_retrain('BTCUSDT', '1h')
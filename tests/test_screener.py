@@ -0,0 +1,91 @@
+# tests/test_screener.py
+
+import numpy as np
+
+from screener import Screener
+
+
+def rest_ticker(symbol, price, quote_volume):
+    return {'symbol': symbol, 'lastPrice': str(price), 'openPrice': str(price),
+            'highPrice': str(price), 'lowPrice': str(price), 'volume': '1',
+            'quoteVolume': str(quote_volume)}
+
+
+def mini_ticker(symbol, price, quote_volume):
+    return {'e': '24hrMiniTicker', 's': symbol, 'c': str(price),
+            'o': str(price), 'h': str(price), 'l': str(price), 'v': '1',
+            'q': str(quote_volume)}
+
+
+class TickerClient:
+    def __init__(self, tickers):
+        self.tickers = tickers
+        self.calls = 0
+
+    def get_ticker(self):
+        self.calls += 1
+        return self.tickers
+
+
+def make_tickers(count, seed=0):
+    rng = np.random.default_rng(seed)
+    tickers = [
+        rest_ticker(f'C{i}USDT', price, volume)
+        for i, (price, volume) in enumerate(zip(
+            rng.uniform(0.01, 2, count), rng.uniform(1e5, 1e8, count)))
+    ]
+    tickers.append(rest_ticker('CHEAPBTC', 0.1, 1e9))  # USDT çifti değil
+    return tickers
+
+
+def reference(tickers, max_price=1.0, min_volume=1e6, k=10):
+    rows = [
+        (t['symbol'], float(t['lastPrice']), float(t['quoteVolume']))
+        for t in tickers if t['symbol'].endswith('USDT')
+        and 0 < float(t['lastPrice']) < max_price
+        and float(t['quoteVolume']) >= min_volume
+    ]
+    rows.sort(key=lambda row: -row[2])
+    return [symbol for symbol, _, _ in rows[:k]]
+
+
+def test_selection_matches_full_scan():
+    tickers = make_tickers(500)
+    screener = Screener(TickerClient(tickers), max_price=1.0,
+                        min_volume=1e6, top_k=10)
+    coins = screener.get_viable_coins()
+    assert [coin['symbol'] for coin in coins] == reference(tickers)
+
+
+def test_stream_alone_does_not_count_as_fresh():
+    tickers = make_tickers(50)
+    client = TickerClient(tickers)
+    screener = Screener(client, max_price=1.0, min_volume=1e6, top_k=10)
+
+    # Akış ilk REST görüntüsünden önce bağlandı: sadece bir sembol geldi
+    screener.on_mini_tickers([mini_ticker('C0USDT', 0.5, 5e8)])
+    assert screener.is_stale()
+    coins = screener.get_viable_coins()
+    assert client.calls == 1
+    assert len(coins) == 10
+
+    # Tam görüntüden sonra akış tabloyu güncel tutar, REST çağrılmaz
+    screener.on_mini_tickers([mini_ticker('C1USDT', 0.5, 9e9)])
+    assert not screener.is_stale()
+    assert screener.get_viable_coins()[0]['symbol'] == 'C1USDT'
+    assert client.calls == 1
+
+
+def test_subscribers_notified_on_ranking_change():
+    tickers = make_tickers(50)
+    screener = Screener(TickerClient(tickers), max_price=1.0,
+                        min_volume=1e6, top_k=3)
+    rankings = []
+    screener.subscribe(lambda coins: rankings.append(
+        [coin['symbol'] for coin in coins]))
+    screener.refresh()
+    top = rankings[-1]
+    screener.on_mini_tickers([mini_ticker(top[0], 0.5, 1e6 + 1)])
+    screener.on_mini_tickers([mini_ticker(top[0], 0.5, 1e6 + 2)])
+    assert len(rankings) == 2
+    assert top[0] not in rankings[-1]
@@ -0,0 +1,97 @@
+# tests/test_simulated_exchange.py
+
+import time
+
+import pytest
+from binance.exceptions import BinanceAPIException
+
+from kline_store import interval_to_ms
+from simulated_exchange import ReplayClock, SimulatedClient, synthetic_klines
+
+STEP = interval_to_ms('1m')
+
+
+def exchange(count=100, now_index=50, **kwargs):
+    """Saati now_index. mumun ortasında duran tek sembollü borsa"""
+    rows = synthetic_klines('ABCUSDT', '1m', 0, count)
+    clock = ReplayClock(now_index * STEP + STEP // 2)
+    return SimulatedClient({'ABCUSDT': rows}, clock=clock, **kwargs), rows
+
+
+def test_klines_visible_only_up_to_clock():
+    client, rows = exchange()
+    klines = client.get_klines(symbol='ABCUSDT', interval='1m',
+                               endTime=10 * 100 * STEP, limit=1000)
+    assert len(klines) == 51
+    assert klines[-1][0] == 50 * STEP
+
+    # Canlı mum kısmi: kapanış açılıştan gerçek kapanışa yarı yolda
+    live = rows[50]
+    assert float(klines[-1][4]) == pytest.approx(
+        (live[1] + live[4]) / 2, rel=1e-6)
+    assert float(klines[-2][4]) == pytest.approx(rows[49, 4], rel=1e-6)
+
+    # Gelecekten başlayan istek boş döner, saat ilerleyince mum görünür
+    assert client.get_klines(symbol='ABCUSDT', interval='1m',
+                             startTime=51 * STEP) == []
+    client.clock.advance(STEP)
+    klines = client.get_klines(symbol='ABCUSDT', interval='1m',
+                               startTime=51 * STEP)
+    assert [k[0] for k in klines] == [51 * STEP]
+
+
+def test_ticker_uses_price_at_clock():
+    client, rows = exchange()
+    price = float(client.get_symbol_ticker(symbol='ABCUSDT')['price'])
+    assert price == pytest.approx((rows[50, 1] + rows[50, 4]) / 2, rel=1e-6)
+    assert float(client.get_ticker(symbol='ABCUSDT')['lastPrice']) == \
+        pytest.approx(price, rel=1e-6)
+
+
+def test_order_within_book_depth_is_filled():
+    client, _ = exchange(balances={'USDT': 1000.})
+    order = client.create_order(symbol='ABCUSDT', side='BUY', type='MARKET',
+                                quantity='100')
+    assert order['status'] == 'FILLED'
+    assert float(order['executedQty']) == 100
+    assert client.get_asset_balance('ABC')['free'] == '100.00000000'
+
+
+def test_order_beyond_book_depth_expires_partially_filled():
+    client, _ = exchange(levels=2, level_notional=50.,
+                         balances={'USDT': 1000.})
+    order = client.create_order(symbol='ABCUSDT', side='BUY', type='MARKET',
+                                quantity='1000')
+    assert order['status'] == 'EXPIRED'
+    assert len(order['fills']) == 2
+    executed = float(order['executedQty'])
+    assert 0 < executed < 1000
+    assert executed == sum(float(fill['qty']) for fill in order['fills'])
+    # Her kademe bir öncekinden pahalı
+    prices = [float(fill['price']) for fill in order['fills']]
+    assert prices[0] < prices[1]
+    assert float(client.get_asset_balance('ABC')['free']) == executed
+
+
+def test_latency_delays_every_call():
+    client, _ = exchange(latency=0.1)
+    started = time.monotonic()
+    client.get_klines(symbol='ABCUSDT', interval='1m', limit=10)
+    client.create_order(symbol='ABCUSDT', side='BUY', type='MARKET',
+                        quantity='20')
+    assert time.monotonic() - started >= 0.2
+
+
+def test_insufficient_balance_raises_binance_error():
+    client, _ = exchange(balances={'USDT': 10.})
+    with pytest.raises(BinanceAPIException) as error:
+        client.create_order(symbol='ABCUSDT', side='BUY', type='MARKET',
+                            quantity='100')
+    assert error.value.code == -2010
+    assert client.get_asset_balance('USDT')['free'] == '10.00000000'
+    assert client.orders == []
+
+    with pytest.raises(BinanceAPIException) as error:
+        client.create_order(symbol='ABCUSDT', side='SELL', type='MARKET',
+                            quantity='100')
+    assert error.value.code == -2010
@@ -0,0 +1,98 @@
+# tests/test_state_manager.py
+
+import threading
+from datetime import datetime
+
+from state_manager import StateManager
+from trade_ledger import TradeLedger
+
+
+class FakeBot:
+    def __init__(self):
+        self.current_balance = 30.
+        self.current_coin = 'BTCUSDT'
+        self.trading_history = TradeLedger()
+
+
+def make_trade(i):
+    return {'timestamp': datetime(2024, 1, 1), 'symbol': 'BTCUSDT',
+            'side': 'BUY' if i % 2 == 0 else 'SELL',
+            'quantity': 1. + i, 'price': 100. + i}
+
+
+def load(tmp_path):
+    manager = StateManager(str(tmp_path / 'state.json'))
+    try:
+        return manager.load_state()
+    finally:
+        manager.close()
+
+
+def test_snapshot_and_journal_round_trip(tmp_path):
+    bot = FakeBot()
+    manager = StateManager(str(tmp_path / 'state.json'), snapshot_interval=3)
+    for i in range(7):
+        manager.append_trade(make_trade(i), bot.trading_history)
+        bot.current_balance += 1
+        manager.save_state(bot)
+    manager.close()
+
+    state = load(tmp_path)
+    assert [t['quantity'] for t in state['trading_history']] == [
+        1. + i for i in range(7)
+    ]
+    assert state['current_balance'] == 37.
+
+
+class CheckpointingLedger(TradeLedger):
+    """Her eklemeden hemen sonra başka bir thread'de checkpoint başlatan geçmiş
+
+    Ekleme ile günlük kaydı arasına checkpoint girerse işlem hem snapshot'a
+    hem günlüğe (daha yüksek seq ile) yazılır.
+    """
+
+    def __init__(self, manager, bot):
+        super().__init__()
+        self.manager = manager
+        self.bot = bot
+        self.threads = []
+
+    def append(self, trade):
+        super().append(trade)
+        thread = threading.Thread(target=self.manager.checkpoint,
+                                  args=(self.bot,))
+        thread.start()
+        thread.join(timeout=0.2)
+        self.threads.append(thread)
+
+
+def test_checkpoint_between_append_and_journal_does_not_duplicate(tmp_path):
+    bot = FakeBot()
+    manager = StateManager(str(tmp_path / 'state.json'))
+    bot.trading_history = CheckpointingLedger(manager, bot)
+    for i in range(3):
+        manager.append_trade(make_trade(i), bot.trading_history)
+    for thread in bot.trading_history.threads:
+        thread.join()
+    manager.close()
+
+    history = load(tmp_path)['trading_history']
+    assert [t['quantity'] for t in history] == [1., 2., 3.]
+
+
+def test_torn_journal_line_is_dropped(tmp_path):
+    bot = FakeBot()
+    manager = StateManager(str(tmp_path / 'state.json'))
+    for i in range(3):
+        manager.append_trade(make_trade(i), bot.trading_history)
+    manager.close()
+    with open(manager.journal, 'a') as f:
+        f.write('{"type": "trade", "tra')
+
+    assert len(load(tmp_path)['trading_history']) == 3
+    # Yarım satır atıldı, sonraki ekleme temiz bir satıra yazılır
+    manager = StateManager(str(tmp_path / 'state.json'))
+    manager.load_state()
+    manager.append_trade(make_trade(3), bot.trading_history)
+    manager.close()
+    assert len(load(tmp_path)['trading_history']) == 4
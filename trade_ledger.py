@@ -0,0 +1,307 @@
+# trade_ledger.py
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+SIDES = ('BUY', 'SELL')
+SIDE_CODES = {side: code for code, side in enumerate(SIDES)}
+
+LEDGER_DTYPES = {
+    'timestamp': 'datetime64[ms]',
+    'symbol': np.int32,     # semboller tablosundaki sıra numarası
+    'side': np.int8,        # 0: BUY, 1: SELL
+    'quantity': np.float64,
+    'price': np.float64,
+    'fee': np.float64,          # quote varlık cinsinden komisyon
+    'net_quantity': np.float64  # alımda coin cinsinden komisyon düşülmüş miktar
+}
+
+
+class _GrowableColumn:
+    """Kapasitesi ikiye katlanarak büyüyen tek tipli NumPy dizisi"""
+
+    __slots__ = ('data', 'size')
+
+    def __init__(self, dtype, capacity=1024):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def _reserve(self, size):
+        if size > len(self.data):
+            capacity = max(size, len(self.data) * 2)
+            data = np.empty(capacity, dtype=self.data.dtype)
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+
+    def append(self, value):
+        self._reserve(self.size + 1)
+        self.data[self.size] = value
+        self.size += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self.data.dtype)
+        self._reserve(self.size + len(values))
+        self.data[self.size:self.size + len(values)] = values
+        self.size += len(values)
+
+    def view(self):
+        return self.data[:self.size]
+
+
+class TradeLedger:
+    """İşlem geçmişini sütun bazlı NumPy dizilerinde tutan defter
+
+    Her işlem satırı ~30 byte yer kaplar; semboller bir kez tabloya yazılıp
+    sıra numarasıyla tutulur. Zaman sorguları sıralı zaman sütununda
+    searchsorted ile, sembol sorguları sembol başına satır indeksiyle
+    yapılır. Eski liste arayüzü (len, indeks, döngü, append) korunur;
+    satırlar okunurken dict olarak üretilir.
+    """
+
+    def __init__(self, capacity=1024):
+        self._columns = {
+            name: _GrowableColumn(dtype, capacity)
+            for name, dtype in LEDGER_DTYPES.items()
+        }
+        self._symbols = []        # sıra numarası -> sembol
+        self._symbol_ids = {}     # sembol -> sıra numarası
+        self._symbol_rows = []    # sıra numarası -> satır indeksi sütunu
+        self._time_sorted = True  # Zaman sütunu sıralı mı
+        self._time_order = None   # Sıralı değilse argsort önbelleği
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_records(cls, trades):
+        """dict listesinden (kayıtlı geçmiş) toplu olarak defter kur"""
+        ledger = cls(capacity=max(len(trades), 1024))
+        ledger.extend(trades)
+        return ledger
+
+    def _intern(self, symbol):
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self._symbols)
+            self._symbols.append(symbol)
+            self._symbol_ids[symbol] = symbol_id
+            self._symbol_rows.append(_GrowableColumn(np.int64, 64))
+        return symbol_id
+
+    def _note_times(self, first, last):
+        """Yeni satırlar eklenince zaman sırasının bozulup bozulmadığını izle"""
+        self._time_order = None
+        if not self._time_sorted:
+            return
+        timestamps = self._columns['timestamp'].data
+        if first > 0 and timestamps[first - 1] > timestamps[first]:
+            self._time_sorted = False
+        elif last - first > 1:
+            self._time_sorted = bool(np.all(
+                timestamps[first + 1:last] >= timestamps[first:last - 1]
+            ))
+
+    def append(self, trade):
+        """Tek işlem ekle (timestamp, symbol, side, quantity, price[, fee,
+        net_quantity])"""
+        with self._lock:
+            row = len(self)
+            symbol_id = self._intern(trade['symbol'])
+            columns = self._columns
+            columns['timestamp'].append(
+                np.datetime64(dict.__getitem__(trade, 'timestamp'), 'ms')
+            )
+            columns['symbol'].append(symbol_id)
+            columns['side'].append(SIDE_CODES[trade['side']])
+            columns['quantity'].append(trade['quantity'])
+            columns['price'].append(trade['price'])
+            columns['fee'].append(trade.get('fee', 0.))
+            columns['net_quantity'].append(
+                trade.get('net_quantity', trade['quantity'])
+            )
+            self._symbol_rows[symbol_id].append(row)
+            self._note_times(row, row + 1)
+
+    def extend(self, trades):
+        """Birden fazla işlemi vektörel olarak ekle"""
+        if not len(trades):
+            return
+        with self._lock:
+            first = len(self)
+            symbol_ids = np.array(
+                [self._intern(trade['symbol']) for trade in trades],
+                dtype=np.int32
+            )
+            columns = self._columns
+            # Metin zamanlar da tek seferde (C tarafında) ayrıştırılır
+            columns['timestamp'].extend(np.array(
+                [dict.__getitem__(trade, 'timestamp') for trade in trades],
+                dtype='datetime64[ms]'
+            ))
+            columns['symbol'].extend(symbol_ids)
+            columns['side'].extend(
+                [SIDE_CODES[trade['side']] for trade in trades]
+            )
+            columns['quantity'].extend([trade['quantity'] for trade in trades])
+            columns['price'].extend([trade['price'] for trade in trades])
+            # Eski kayıtlarda komisyon yok: ücret 0, net miktar = miktar
+            columns['fee'].extend([trade.get('fee', 0.) for trade in trades])
+            columns['net_quantity'].extend([
+                trade.get('net_quantity', trade['quantity']) for trade in trades
+            ])
+
+            rows = np.arange(first, first + len(trades))
+            for symbol_id in np.unique(symbol_ids):
+                self._symbol_rows[symbol_id].extend(
+                    rows[symbol_ids == symbol_id]
+                )
+            self._note_times(first, len(self))
+
+    def __len__(self):
+        return self._columns['price'].size
+
+    def _row(self, i):
+        columns = self._columns
+        return {
+            'timestamp': columns['timestamp'].data[i].item(),
+            'symbol': self._symbols[columns['symbol'].data[i]],
+            'side': SIDES[columns['side'].data[i]],
+            'quantity': float(columns['quantity'].data[i]),
+            'price': float(columns['price'].data[i]),
+            'fee': float(columns['fee'].data[i]),
+            'net_quantity': float(columns['net_quantity'].data[i])
+        }
+
+    def cell(self, row, name):
+        """Tek hücrenin değeri (tablo görünümü sadece görünen satırları okur)"""
+        value = self._columns[name].data[row]
+        if name == 'symbol':
+            return self._symbols[value]
+        if name == 'side':
+            return SIDES[value]
+        return value.item()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('ledger index out of range')
+        return self._row(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def column(self, name):
+        """Sütunun (kopyasız) görünümü"""
+        return self._columns[name].view()
+
+    @property
+    def symbols(self):
+        return list(self._symbols)
+
+    def symbol_rows(self, symbol):
+        """Sembolün satır indeksleri (eklenme sırasıyla)"""
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            return np.empty(0, dtype=np.int64)
+        return self._symbol_rows[symbol_id].view()
+
+    def time_rows(self, start=None, end=None):
+        """[start, end) aralığındaki satır indeksleri"""
+        timestamps = self.column('timestamp')
+        if self._time_sorted:
+            order = None
+        else:
+            if self._time_order is None:
+                self._time_order = np.argsort(timestamps, kind='stable')
+            order = self._time_order
+            timestamps = timestamps[order]
+
+        lo = 0 if start is None else timestamps.searchsorted(
+            np.datetime64(start, 'ms'), side='left')
+        hi = len(timestamps) if end is None else timestamps.searchsorted(
+            np.datetime64(end, 'ms'), side='left')
+        rows = np.arange(lo, hi) if order is None else np.sort(order[lo:hi])
+        return rows
+
+    def select(self, symbol=None, start=None, end=None):
+        """Sembol ve/veya zaman aralığına uyan satır indeksleri"""
+        if symbol is None:
+            return self.time_rows(start, end)
+        rows = self.symbol_rows(symbol)
+        if start is None and end is None:
+            return rows
+        timestamps = self.column('timestamp')[rows]
+        mask = np.ones(len(rows), dtype=bool)
+        if start is not None:
+            mask &= timestamps >= np.datetime64(start, 'ms')
+        if end is not None:
+            mask &= timestamps < np.datetime64(end, 'ms')
+        return rows[mask]
+
+    def itertuples(self, rows=None):
+        """(timestamp, symbol, side, quantity, price) demetlerini hızlıca üret"""
+        columns = {name: self.column(name) for name in LEDGER_DTYPES}
+        if rows is not None:
+            columns = {name: values[rows] for name, values in columns.items()}
+        symbols = self._symbols
+        for timestamp, symbol_id, side, quantity, price in zip(
+                columns['timestamp'].tolist(), columns['symbol'].tolist(),
+                columns['side'].tolist(), columns['quantity'].tolist(),
+                columns['price'].tolist()):
+            yield timestamp, symbols[symbol_id], SIDES[side], quantity, price
+
+    def iterfills(self, rows=None):
+        """(symbol, side, net_quantity, price, fee) demetleri (metrikleri kurmak için)"""
+        columns = {name: self.column(name) for name in
+                   ('symbol', 'side', 'net_quantity', 'price', 'fee')}
+        if rows is not None:
+            columns = {name: values[rows] for name, values in columns.items()}
+        symbols = self._symbols
+        for symbol_id, side, quantity, price, fee in zip(
+                *(values.tolist() for values in columns.values())):
+            yield symbols[symbol_id], SIDES[side], quantity, price, fee
+
+    def to_frame(self, rows=None):
+        """Satırları (varsayılan: hepsi) DataFrame olarak döndür"""
+        columns = {name: self.column(name) for name in LEDGER_DTYPES}
+        if rows is not None:
+            columns = {name: values[rows] for name, values in columns.items()}
+        return pd.DataFrame({
+            'timestamp': columns['timestamp'],
+            'symbol': pd.Categorical.from_codes(
+                columns['symbol'], categories=self._symbols
+            ),
+            'side': pd.Categorical.from_codes(columns['side'], categories=SIDES),
+            'quantity': columns['quantity'],
+            'price': columns['price'],
+            'fee': columns['fee'],
+            'net_quantity': columns['net_quantity']
+        })
+
+    def to_records(self):
+        """Durum dosyası için metin zamanlı dict listesi"""
+        if not len(self):
+            return []  # np.char.replace boş dizide hata verir
+        timestamps = np.char.replace(
+            np.datetime_as_string(self.column('timestamp'), unit='s'), 'T', ' '
+        ).tolist()
+        return [
+            {'timestamp': timestamp, 'symbol': symbol, 'side': side,
+             'quantity': quantity, 'price': price, 'fee': fee,
+             'net_quantity': net_quantity}
+            for timestamp, (_, symbol, side, quantity, price), fee, net_quantity
+            in zip(timestamps, self.itertuples(),
+                   self.column('fee').tolist(),
+                   self.column('net_quantity').tolist())
+        ]
+
+    def to_csv(self, path, rows=None):
+        self.to_frame(rows).to_csv(path, index=False)
+
+    def to_parquet(self, path, rows=None):
+        """Parquet olarak yaz (pyarrow veya fastparquet gerekir)"""
+        self.to_frame(rows).to_parquet(path, index=False)
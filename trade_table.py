@@ -0,0 +1,198 @@
+# trade_table.py
+
+import numpy as np
+from PyQt6.QtCore import QAbstractProxyModel, QAbstractTableModel, QModelIndex, Qt
+
+
+class TradeTableModel(QAbstractTableModel):
+    """Bot'un TradeLedger'ını doğrudan gösteren sanal tablo modeli
+
+    Hücreler sadece görünüm istediğinde (görünen satırlar için) defterden
+    okunur. refresh yalnızca yeni işlemler için rowsInserted yayınlar.
+    """
+
+    HEADERS = ['Time', 'Symbol', 'Side', 'Quantity', 'Price']
+    COLUMNS = ['timestamp', 'symbol', 'side', 'quantity', 'price']
+
+    def __init__(self, ledger, parent=None):
+        super().__init__(parent)
+        self.ledger = ledger
+        self._rows = len(ledger)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self.COLUMNS[index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(self.ledger.cell(index.row(), name))
+        if (role == Qt.ItemDataRole.TextAlignmentRole
+                and name in ('quantity', 'price')):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation,
+                   role=Qt.ItemDataRole.DisplayRole):
+        if (role == Qt.ItemDataRole.DisplayRole
+                and orientation == Qt.Orientation.Horizontal):
+            return self.HEADERS[section]
+        return None
+
+    def set_ledger(self, ledger):
+        """Farklı bir defter göster (durum yeniden yüklendiğinde)"""
+        self.beginResetModel()
+        self.ledger = ledger
+        self._rows = len(ledger)
+        self.endResetModel()
+
+    def refresh(self):
+        """Deftere eklenen yeni işlemleri tabloya ekle"""
+        count = len(self.ledger)
+        if count > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, count - 1)
+            self._rows = count
+            self.endInsertRows()
+
+
+class TradeSortFilterProxyModel(QAbstractProxyModel):
+    """TradeTableModel için NumPy ile sıralayan/filtreleyen proxy
+
+    QSortFilterProxyModel her karşılaştırma ve filtre kontrolü için Python
+    tarafına çıkar; yüz binlerce satırda bu saniyeler sürer. Burada sıralama
+    defterin sütunları üzerinde argsort ile, sembol filtresi sembol
+    kodlarıyla yapılır. Yeni işlemler sıralı anahtarlar üzerinde
+    searchsorted ile yerine eklenir.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._order = np.empty(0, dtype=np.int64)  # artan sırada kaynak satırlar
+        self._keys = np.empty(0)                   # _order'ın sıralama anahtarları
+        self._inverse = None                       # kaynak satır -> _order sırası
+        self._sort_column = 0
+        self._descending = True
+        self._filter = ''
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.modelReset.connect(self._rebuild)
+        self._rebuild()
+
+    @property
+    def ledger(self):
+        return self.sourceModel().ledger
+
+    def _accepted(self, rows):
+        """Filtreye uyan kaynak satırları"""
+        if not self._filter:
+            return rows
+        codes = [
+            code for code, symbol in enumerate(self.ledger.symbols)
+            if self._filter in symbol.upper()
+        ]
+        return rows[np.isin(self.ledger.column('symbol')[rows], codes)]
+
+    def _sort_keys(self, rows):
+        name = TradeTableModel.COLUMNS[self._sort_column]
+        values = self.ledger.column(name)[rows]
+        if name == 'timestamp':
+            return values.astype(np.int64)
+        if name == 'symbol':
+            # Sembol kodlarını alfabetik sıralarına çevir
+            symbols = self.ledger.symbols
+            rank = np.empty(len(symbols), dtype=np.int64)
+            rank[np.argsort(symbols)] = np.arange(len(symbols))
+            return rank[values]
+        return values
+
+    def _rebuild(self):
+        self.beginResetModel()
+        rows = self._accepted(
+            np.arange(self.sourceModel().rowCount(), dtype=np.int64)
+        )
+        keys = self._sort_keys(rows)
+        order = np.argsort(keys, kind='stable')
+        self._order = rows[order]
+        self._keys = keys[order]
+        self._inverse = None
+        self.endResetModel()
+
+    def _on_rows_inserted(self, parent, first, last):
+        if self._sort_column == 1:
+            # Yeni sembol alfabetik sıraları kaydırabilir
+            self._rebuild()
+            return
+
+        rows = self._accepted(np.arange(first, last + 1, dtype=np.int64))
+        for row, key in zip(rows, self._sort_keys(rows)):
+            position = int(self._keys.searchsorted(key, side='right'))
+            view_row = (len(self._order) - position if self._descending
+                        else position)
+            self.beginInsertRows(QModelIndex(), view_row, view_row)
+            self._order = np.insert(self._order, position, row)
+            self._keys = np.insert(self._keys, position, key)
+            self._inverse = None
+            self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._descending = order == Qt.SortOrder.DescendingOrder
+        self._rebuild()
+
+    def setFilterFixedString(self, text):
+        """Sembol adında text geçen işlemleri göster (büyük/küçük harf duyarsız)"""
+        self._filter = text.strip().upper()
+        self._rebuild()
+
+    def _position(self, view_row):
+        return (len(self._order) - 1 - view_row if self._descending
+                else view_row)
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        source_row = int(self._order[self._position(proxy_index.row())])
+        return self.sourceModel().index(source_row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        if self._inverse is None:
+            self._inverse = np.full(self.sourceModel().rowCount(), -1,
+                                    dtype=np.int64)
+            self._inverse[self._order] = np.arange(len(self._order))
+        if source_index.row() >= len(self._inverse):
+            return QModelIndex()
+        position = int(self._inverse[source_index.row()])
+        if position < 0:
+            return QModelIndex()
+        return self.index(self._position(position), source_index.column())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if (parent.isValid() or not 0 <= row < len(self._order)
+                or not 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()  # QObject.parent()
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def headerData(self, section, orientation,
+                   role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        return None
@@ -2,6 +2,8 @@
 
 import pandas as pd
 import numpy as np
+from collections import deque
+from numpy.lib.stride_tricks import sliding_window_view
 from datetime import datetime
 
 def calculate_technical_indicators(df):
@@ -22,6 +24,164 @@ def calculate_technical_indicators(df):
     
     return df
 
+def _ewm_matrix(values, alpha):
+    """Satır bazında ewm(adjust=False), tüm semboller birlikte güncellenir"""
+    out = np.empty_like(values)
+    prev = np.full(values.shape[0], np.nan)
+    old_wt = 1. - alpha
+    with np.errstate(invalid='ignore'):
+        for t in range(values.shape[1]):
+            x = values[:, t]
+            step = (old_wt * prev + alpha * x) / (old_wt + alpha)
+            prev = np.where(np.isnan(prev), x, np.where(prev == x, prev, step))
+            out[:, t] = prev
+    return out
+
+
+def calculate_indicator_matrix(closes, rsi_period=14, fast_span=12,
+                               slow_span=26, signal_span=9):
+    """(sembol x mum) kapanış matrisinden RSI/MACD/Signal matrislerini hesapla
+
+    Satırlar sağa hizalıdır (son sütun en yeni mum); geçmişi kısa olan
+    semboller için baştaki boş hücreler NaN olmalıdır. Her satırın sonucu
+    calculate_technical_indicators'ın o satırın geçerli kısmına
+    uygulanmasıyla aynıdır.
+    """
+    closes = np.asarray(closes, dtype=float)
+    if closes.ndim == 1:
+        closes = closes[np.newaxis, :]
+    n_symbols, n_candles = closes.shape
+
+    # Her satırın ilk geçerli mumu
+    valid = ~np.isnan(closes)
+    first = np.where(valid.any(axis=1), valid.argmax(axis=1), n_candles)
+    position = np.arange(n_candles)[np.newaxis, :] - first[:, np.newaxis]
+
+    # RSI hesaplama (NaN delta'lar pandas'taki gibi 0 kabul edilir)
+    delta = np.diff(closes, axis=1, prepend=np.nan)
+    with np.errstate(invalid='ignore'):
+        gain = np.where(delta > 0, delta, 0.)
+        loss = np.where(delta < 0, -delta, 0.)
+
+    avg_gain = np.full((n_symbols, n_candles), np.nan)
+    avg_loss = np.full((n_symbols, n_candles), np.nan)
+    if n_candles >= rsi_period:
+        avg_gain[:, rsi_period - 1:] = sliding_window_view(
+            gain, rsi_period, axis=1).sum(axis=-1) / rsi_period
+        avg_loss[:, rsi_period - 1:] = sliding_window_view(
+            loss, rsi_period, axis=1).sum(axis=-1) / rsi_period
+    warmup = position < rsi_period - 1
+    avg_gain[warmup] = np.nan
+    avg_loss[warmup] = np.nan
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+
+    # MACD hesaplama
+    exp1 = _ewm_matrix(closes, 2 / (fast_span + 1))
+    exp2 = _ewm_matrix(closes, 2 / (slow_span + 1))
+    macd = exp1 - exp2
+    signal = _ewm_matrix(macd, 2 / (signal_span + 1))
+
+    return {'RSI': rsi, 'MACD': macd, 'Signal': signal}
+
+class IncrementalIndicators:
+    """RSI/MACD/Signal değerlerini mum başına O(1) güncelle
+
+    calculate_technical_indicators ile aynı formülleri kullanır. Kapanmış
+    mumların durumu saklanır; canlı mum her revizyonda bu durumdan yeniden
+    hesaplanır, yeni mum geldiğinde ise önceki canlı mum kalıcı hale gelir.
+    """
+
+    def __init__(self, rsi_period=14, fast_span=12, slow_span=26,
+                 signal_span=9):
+        self.rsi_period = rsi_period
+        self.fast_alpha = 2 / (fast_span + 1)
+        self.slow_alpha = 2 / (slow_span + 1)
+        self.signal_alpha = 2 / (signal_span + 1)
+        self.reset()
+
+    def reset(self):
+        """Tüm durumu sıfırla"""
+        # Kapanmış mumların durumu
+        self.count = 0
+        self.prev_close = None
+        self.gains = deque(maxlen=self.rsi_period - 1)
+        self.losses = deque(maxlen=self.rsi_period - 1)
+        self.ema_fast = None
+        self.ema_slow = None
+        self.ema_signal = None
+        # Canlı (son) mumun durumu
+        self.live_time = None
+        self.live = None
+
+    @staticmethod
+    def _ewm_step(prev, value, alpha):
+        # pandas ewm(adjust=False) ile birebir aynı adım
+        if prev is None:
+            return value
+        if prev == value:
+            return prev
+        old_wt = 1. - alpha
+        return (old_wt * prev + alpha * value) / (old_wt + alpha)
+
+    def _compute(self, close):
+        if self.prev_close is None:
+            # İlk mumda delta NaN, where() ile 0'a çevrilir
+            gain = loss = 0.
+        else:
+            delta = close - self.prev_close
+            gain = delta if delta > 0 else 0.
+            loss = -delta if delta < 0 else 0.
+
+        rsi = np.nan
+        if self.count + 1 >= self.rsi_period:
+            avg_gain = (sum(self.gains) + gain) / self.rsi_period
+            avg_loss = (sum(self.losses) + loss) / self.rsi_period
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rs = np.float64(avg_gain) / np.float64(avg_loss)
+            rsi = float(100 - (100 / (1 + rs)))
+
+        ema_fast = self._ewm_step(self.ema_fast, close, self.fast_alpha)
+        ema_slow = self._ewm_step(self.ema_slow, close, self.slow_alpha)
+        macd = ema_fast - ema_slow
+        signal = self._ewm_step(self.ema_signal, macd, self.signal_alpha)
+
+        return {
+            'close': close, 'gain': gain, 'loss': loss,
+            'ema_fast': ema_fast, 'ema_slow': ema_slow,
+            'RSI': rsi, 'MACD': macd, 'Signal': signal
+        }
+
+    def _commit(self):
+        live = self.live
+        self.count += 1
+        self.prev_close = live['close']
+        self.gains.append(live['gain'])
+        self.losses.append(live['loss'])
+        self.ema_fast = live['ema_fast']
+        self.ema_slow = live['ema_slow']
+        self.ema_signal = live['Signal']
+
+    def update(self, open_time, close):
+        """Mum ekle veya canlı mumu güncelle, (RSI, MACD, Signal) döndür"""
+        if self.live_time is not None and open_time < self.live_time:
+            raise ValueError("Candles must be fed in chronological order")
+        if self.live_time is not None and open_time > self.live_time:
+            self._commit()
+
+        self.live_time = open_time
+        self.live = self._compute(float(close))
+        return self.live['RSI'], self.live['MACD'], self.live['Signal']
+
+    @property
+    def values(self):
+        """Son mumun indikatör değerleri"""
+        if self.live is None:
+            return np.nan, np.nan, np.nan
+        return self.live['RSI'], self.live['MACD'], self.live['Signal']
+
 def calculate_profit(trades):
     """İşlem geçmişinden toplam karı hesapla"""
     total_profit = 0
@@ -51,6 +211,51 @@ def calculate_win_rate(trades):
     
     return (winning_trades / total_trades) * 100 if total_trades > 0 else 0
 
+def bucket_downsample(x, y, threshold):
+    """Zamana sabitlenmiş kovalarla seriyi en fazla ~threshold noktaya indir
+
+    Kova genişliği 2'nin kuvveti olarak seçilir ve kenarlar mutlak x
+    değerine (x // genişlik) göre belirlenir; kapanmış her kovadan en
+    küçük ve en büyük y'li noktalar (eşitlikte ilki) alınır, son (açık)
+    kovanın noktaları olduğu gibi kalır. Böylece son noktanın düzeltilmesi
+    sadece o noktayı, yeni nokta sadece sonu, pencerenin kayması sadece
+    başı değiştirir. Baştaki kova pencereye kısmen girdiği için atlanır.
+    Seçilen indeksleri sıralı döndürür.
+    """
+    n = len(x)
+    buckets = threshold // 2
+    if n <= threshold or buckets < 2:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    span = x[-1] - x[0]
+    if span <= 0:
+        return np.arange(n)
+    width = 2. ** np.ceil(np.log2(span / (buckets - 1)))
+    keys = np.floor(x / width)
+    starts = np.flatnonzero(np.diff(keys)) + 1  # İlk (kısmi) kova atlanır
+    if len(starts) < 2:
+        return np.arange(n)
+
+    # Kapanmış kovalar starts[0]..starts[-1], açık kova starts[-1]..n
+    first, last = starts[0], starts[-1]
+    closed = y[first:last]
+    starts = starts[:-1] - first
+    lengths = np.diff(np.append(starts, len(closed)))
+
+    def first_match(values):
+        # Her kovada değere eşit ilk noktanın indeksi (sıralama yok, O(n))
+        hits = np.flatnonzero(closed == np.repeat(values, lengths))
+        return hits[hits.searchsorted(starts)]
+
+    low = first_match(np.minimum.reduceat(closed, starts))
+    high = first_match(np.maximum.reduceat(closed, starts))
+    keep = np.concatenate((np.minimum(low, high), np.maximum(low, high)))
+    keep = keep.reshape(2, -1).T.ravel() + first
+    keep = keep[np.append(True, np.diff(keep) > 0)]  # min == max ise tek
+    return np.concatenate((keep, np.arange(last, n)))
+
 def format_number(number):
     """Sayıları okunaklı formata çevir"""
     return '{:.8f}'.format(number)